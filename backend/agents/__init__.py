@@ -1,25 +1,55 @@
 """Agents package"""
-from .seasonality_agent import create_seasonality_agent, create_seasonality_task
-from .flight_agent import create_flight_agent, create_flight_task
-from .hotel_agent import create_hotel_agent, create_hotel_task
-from .budget_agent import create_budget_agent, create_budget_task
-from .attractions_agent import create_attractions_agent, create_attractions_task
-from .itinerary_agent import create_itinerary_agent, create_itinerary_task
-from .tips_agent import create_tips_agent, create_tips_task
+from .seasonality_agent import create_seasonality_agent, create_seasonality_task, SeasonalityOutput
+from .flight_agent import create_flight_agent, create_flight_task, FlightSearchOutput
+from .hotel_agent import create_hotel_agent, create_hotel_task, HotelSearchOutput
+from .budget_agent import create_budget_agent, create_budget_task, BudgetEstimateOutput
+from .attractions_agent import create_attractions_agent, create_attractions_task, ATTRACTION_CATEGORIES, AttractionsOutput
+from .itinerary_agent import (
+    create_itinerary_agent, create_itinerary_task, create_itinerary_outline_task, create_itinerary_day_task,
+    complete_itinerary_outline, merge_itinerary, ItineraryOutline
+)
+from .tips_agent import create_tips_agent, create_tips_task, TravelTipsOutput
+from .lite_planner import create_lite_plan_prompt, LitePlanOutput, LITE_PLAN_SYSTEM_PROMPT
+
+# Output schema per DAG node; itinerary returns Markdown and has none
+AGENT_OUTPUT_SCHEMAS = {
+    "seasonality": SeasonalityOutput,
+    "flights": FlightSearchOutput,
+    "hotels": HotelSearchOutput,
+    "budget": BudgetEstimateOutput,
+    "attractions": AttractionsOutput,
+    "tips": TravelTipsOutput
+}
 
 __all__ = [
     "create_seasonality_agent",
     "create_seasonality_task",
+    "SeasonalityOutput",
     "create_flight_agent",
     "create_flight_task",
+    "FlightSearchOutput",
     "create_hotel_agent",
     "create_hotel_task",
+    "HotelSearchOutput",
     "create_budget_agent",
     "create_budget_task",
+    "BudgetEstimateOutput",
     "create_attractions_agent",
     "create_attractions_task",
+    "ATTRACTION_CATEGORIES",
+    "AttractionsOutput",
     "create_itinerary_agent",
     "create_itinerary_task",
+    "create_itinerary_outline_task",
+    "create_itinerary_day_task",
+    "complete_itinerary_outline",
+    "merge_itinerary",
+    "ItineraryOutline",
     "create_tips_agent",
-    "create_tips_task"
+    "create_tips_task",
+    "TravelTipsOutput",
+    "create_lite_plan_prompt",
+    "LitePlanOutput",
+    "LITE_PLAN_SYSTEM_PROMPT",
+    "AGENT_OUTPUT_SCHEMAS"
 ]
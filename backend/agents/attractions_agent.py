@@ -4,10 +4,22 @@ MCP Tool + LLM for discovering things to do
 """
 from crewai import Agent, Task
 from crewai.tools.base_tool import BaseTool
-from typing import List, Dict, Any, Type
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
 import asyncio
 from mcp_tools import search_places
+from models import Attraction
+from mcp_tools.projection import project_tool_result
+from utils.formatter import format_output_instructions
+
+# Place categories searched for every destination
+ATTRACTION_CATEGORIES = [
+    "tourist_attraction",
+    "museum",
+    "park",
+    "restaurant",
+    "shopping_mall"
+]
 
 class PlacesSearchInput(BaseModel):
     """Input for places search tool"""
@@ -19,7 +31,10 @@ class PlacesSearchTool(BaseTool):
     description: str = "Search for attractions and places of interest in a location"
     args_schema: Type[BaseModel] = PlacesSearchInput
     
-    def _run(self, location: str, category: str = "tourist_attraction") -> Dict:
+    def _run(self, location: str, category: str = "tourist_attraction") -> str:
+        return project_tool_result("places", self._search(location, category))
+
+    def _search(self, location: str, category: str) -> Dict:
         # Create new event loop for sync context
         try:
             loop = asyncio.get_event_loop()
@@ -36,8 +51,20 @@ class PlacesSearchTool(BaseTool):
 
 places_search_tool = PlacesSearchTool()
 
-def create_attractions_agent(llm) -> Agent:
-    """Create the Attractions & Activities Agent"""
+class AttractionsOutput(BaseModel):
+    """Output schema for the attractions task"""
+    model_config = ConfigDict(extra="allow")
+
+    destination: Optional[str] = None
+    categories: Dict[str, List[Attraction]] = Field(
+        default_factory=dict,
+        description="Attractions keyed by category: culture, landmarks, nature, food_districts, markets, day_trips"
+    )
+    top_picks: List[str] = Field(default_factory=list)
+    notes: Optional[str] = Field(None, description="General tips for sightseeing")
+
+def create_attractions_agent(llm, use_tools: bool = True) -> Agent:
+    """Create the Attractions & Activities Agent (without tools when results are pre-fetched)"""
     return Agent(
         role="Local Attractions Expert",
         goal="Search for and discover must-see attractions and activities in {destination} tailored to traveler interests",
@@ -46,14 +73,15 @@ def create_attractions_agent(llm) -> Agent:
         to see and do based on interests like culture, adventure, food, or relaxation.""",
         verbose=True,
         allow_delegation=False,
-        tools=[places_search_tool],
+        tools=[places_search_tool] if use_tools else [],
         llm=llm
     )
 
 def create_attractions_task(
     agent: Agent,
     destination: str,
-    interests: List[str] = None
+    interests: List[str] = None,
+    places_results: Optional[Dict[str, Any]] = None
 ):
     """Create task for attractions search and categorization"""
 
@@ -61,19 +89,17 @@ def create_attractions_task(
     if interests:
         interests_context = f"\nUser interests: {', '.join(interests)}"
 
-    categories = [
-        "tourist_attraction",
-        "museum",
-        "park",
-        "restaurant",
-        "shopping_mall"
-    ]
+    if places_results is not None:
+        search_instructions = f"""Place search results by category have already been retrieved (do not call any tools):
+{project_tool_result("places", places_results)}"""
+    else:
+        search_instructions = f"""Use the mcp_places_search tool multiple times for different categories:
+{chr(10).join([f"- Call with category: {cat}" for cat in ATTRACTION_CATEGORIES])}"""
 
     description = f"""Find and categorize top attractions in {destination}.
 {interests_context}
 
-Use the mcp_places_search tool multiple times for different categories:
-{chr(10).join([f"- Call with category: {cat}" for cat in categories])}
+{search_instructions}
 
 After collecting attraction data:
 1. Categorize attractions into groups:
@@ -96,30 +122,7 @@ After collecting attraction data:
    - Cultural significance
    - User interests: {interests or 'general tourism'}
 
-Output Format:
-{{
-    "destination": "{destination}",
-    "categories": {{
-        "culture": [
-            {{
-                "name": "attraction name",
-                "description": "enriched description",
-                "rating": float,
-                "location": "area/district",
-                "recommended_duration": "1-2 hours",
-                "best_time": "morning/afternoon/evening",
-                "coordinates": {{"lat": float, "lng": float}}
-            }}
-        ],
-        "landmarks": [...],
-        "nature": [...],
-        "food_districts": [...],
-        "markets": [...],
-        "day_trips": [...]
-    }},
-    "top_picks": ["attraction1", "attraction2", "attraction3"],
-    "notes": "general tips for sightseeing"
-}}"""
+{format_output_instructions(AttractionsOutput)}"""
 
     return Task(
         description=description,
@@ -4,10 +4,13 @@ LLM + MCP tools for comprehensive budget analysis
 """
 from crewai import Agent, Task
 from crewai.tools.base_tool import BaseTool
-from typing import Dict, Any, Type
-from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
 import asyncio
 from mcp_tools import lookup_budget
+from models import BudgetEstimate
+from mcp_tools.projection import project_tool_result
+from utils.formatter import format_output_instructions
 
 class BudgetLookupInput(BaseModel):
     """Input for budget lookup tool"""
@@ -18,7 +21,10 @@ class BudgetLookupTool(BaseTool):
     description: str = "Look up budget and cost of living data for a city"
     args_schema: Type[BaseModel] = BudgetLookupInput
     
-    def _run(self, city: str) -> Dict:
+    def _run(self, city: str) -> str:
+        return project_tool_result("budget", self._search(city))
+
+    def _search(self, city: str) -> Dict:
         # Create new event loop for sync context
         try:
             loop = asyncio.get_event_loop()
@@ -35,8 +41,24 @@ class BudgetLookupTool(BaseTool):
 
 budget_lookup_tool = BudgetLookupTool()
 
-def create_budget_agent(llm) -> Agent:
-    """Create the Budget Estimation Agent"""
+class BudgetTier(BudgetEstimate):
+    activities: Optional[float] = None
+    trip_total: Optional[float] = Field(None, description="Total trip cost including flights")
+
+class BudgetEstimateOutput(BaseModel):
+    """Output schema for the budget estimation task"""
+    model_config = ConfigDict(extra="allow")
+
+    destination: Optional[str] = None
+    duration_days: Optional[int] = None
+    budget_tiers: Dict[str, BudgetTier] = Field(
+        default_factory=dict,
+        description="Daily costs keyed by tier: tight, moderate, flexible"
+    )
+    notes: Optional[str] = Field(None, description="Budget tips and money-saving advice")
+
+def create_budget_agent(llm, use_tools: bool = True) -> Agent:
+    """Create the Budget Estimation Agent (without tools when results are pre-fetched)"""
     return Agent(
         role="Travel Budget Analyst",
         goal="Look up budget data and provide comprehensive budget estimates for traveling to {destination} across different spending tiers",
@@ -45,7 +67,7 @@ def create_budget_agent(llm) -> Agent:
         to provide accurate budget estimates for tight, moderate, and flexible spending levels.""",
         verbose=True,
         allow_delegation=False,
-        tools=[budget_lookup_tool],
+        tools=[budget_lookup_tool] if use_tools else [],
         llm=llm
     )
 
@@ -54,7 +76,8 @@ def create_budget_task(
     destination: str,
     flight_data: Dict[str, Any] = None,
     hotel_data: Dict[str, Any] = None,
-    duration_days: int = 7
+    duration_days: int = 7,
+    budget_results: Optional[Dict[str, Any]] = None
 ):
     """Create task for budget estimation"""
 
@@ -68,10 +91,16 @@ def create_budget_task(
         price_range = hotel_data.get("price_range", {})
         hotel_context = f"\nHotel costs per night: ${price_range.get('min_per_night', 0)} - ${price_range.get('max_per_night', 0)}"
 
+    if budget_results is not None:
+        lookup_instructions = f"""Local cost estimates have already been retrieved (do not call any tools):
+{project_tool_result("budget", budget_results)}"""
+    else:
+        lookup_instructions = f"""Use the mcp_budget_lookup tool to get local cost estimates:
+- city: {destination}"""
+
     description = f"""Estimate travel budget for {destination} for a {duration_days}-day trip.
 
-Use the mcp_budget_lookup tool to get local cost estimates:
-- city: {destination}
+{lookup_instructions}
 
 Context from other searches:
 {flight_context}
@@ -92,24 +121,7 @@ After receiving budget data:
 
 4. Calculate total trip cost including flights
 
-Output Format:
-{{
-    "destination": "{destination}",
-    "duration_days": {duration_days},
-    "budget_tiers": {{
-        "tight": {{
-            "daily_total": float,
-            "meals": float,
-            "transport": float,
-            "accommodation": float,
-            "activities": float,
-            "trip_total": float
-        }},
-        "moderate": {{...}},
-        "flexible": {{...}}
-    }},
-    "notes": "budget tips and money-saving advice"
-}}"""
+{format_output_instructions(BudgetEstimateOutput)}"""
 
     return Task(
         description=description,
@@ -4,10 +4,13 @@ MCP Tool-based agent for flight search
 """
 from crewai import Agent, Task
 from crewai.tools.base_tool import BaseTool
-from typing import Dict, Any, Optional, Type
-from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field
 import asyncio
-from mcp_tools import search_flights
+from mcp_tools import search_flights, search_flight_price_calendar
+from models import FlightOption, CheaperDates
+from mcp_tools.projection import project_tool_result
+from utils.formatter import format_output_instructions
 
 class FlightSearchInput(BaseModel):
     """Input for flight search tool"""
@@ -21,7 +24,10 @@ class FlightSearchTool(BaseTool):
     description: str = "Search for flights between two airports"
     args_schema: Type[BaseModel] = FlightSearchInput
     
-    def _run(self, origin: str, destination: str, departure_date: str, return_date: str) -> Dict:
+    def _run(self, origin: str, destination: str, departure_date: str, return_date: str) -> str:
+        return project_tool_result("flights", self._search(origin, destination, departure_date, return_date))
+
+    def _search(self, origin: str, destination: str, departure_date: str, return_date: str) -> Dict:
         # Create new event loop for sync context
         try:
             loop = asyncio.get_event_loop()
@@ -38,8 +44,54 @@ class FlightSearchTool(BaseTool):
 
 flight_search_tool = FlightSearchTool()
 
-def create_flight_agent(llm) -> Agent:
-    """Create the Flight Search Agent"""
+class FlightPriceCalendarInput(BaseModel):
+    """Input for flight price calendar tool"""
+    origin: str = Field(..., description="Origin airport code (3 letters)")
+    destination: str = Field(..., description="Destination airport code (3 letters)")
+    departure_date: str = Field(..., description="Requested departure date (YYYY-MM-DD)")
+    return_date: Optional[str] = Field(None, description="Requested return date (YYYY-MM-DD)")
+    flex_days: int = Field(3, description="Days to search either side of each date")
+
+class FlightPriceCalendarTool(BaseTool):
+    name: str = "Flight Price Calendar"
+    description: str = "Cheapest flight price for every departure/return date pair around the requested dates"
+    args_schema: Type[BaseModel] = FlightPriceCalendarInput
+
+    def _run(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str] = None,
+        flex_days: int = 3
+    ) -> str:
+        # Tools run synchronously on crew worker threads, which have no running loop
+        result = asyncio.run(search_flight_price_calendar(origin, destination, departure_date, return_date, flex_days))
+        return project_tool_result("flight_calendar", result)
+
+flight_price_calendar_tool = FlightPriceCalendarTool()
+
+class FlightPriceRange(BaseModel):
+    min: float
+    max: float
+
+class FlightSearchOutput(BaseModel):
+    """Output schema for the flight search task"""
+    model_config = ConfigDict(extra="allow")
+
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    flights: List[FlightOption] = Field(default_factory=list, description="3-5 representative flight options")
+    price_range: Optional[FlightPriceRange] = None
+    average_duration: Optional[str] = None
+    notes: Optional[str] = Field(None, description="Direct vs connecting flights and other observations")
+    cheaper_dates: List[CheaperDates] = Field(
+        default_factory=list,
+        description="Up to 3 date pairs from the price calendar cheaper than the requested dates"
+    )
+
+def create_flight_agent(llm, use_tools: bool = True) -> Agent:
+    """Create the Flight Search Agent (without tools when results are pre-fetched)"""
     return Agent(
         role="Flight Search Specialist",
         goal="Search for flights and analyze flight options to provide recommendations",
@@ -48,7 +100,7 @@ def create_flight_agent(llm) -> Agent:
         duration, number of stops, and value for money.""",
         verbose=True,
         allow_delegation=False,
-        tools=[flight_search_tool],
+        tools=[flight_search_tool, flight_price_calendar_tool] if use_tools else [],
         llm=llm
     )
 
@@ -57,41 +109,56 @@ def create_flight_task(
     origin: str,
     destination: str,
     departure_date: Optional[str] = None,
-    return_date: Optional[str] = None
+    return_date: Optional[str] = None,
+    flight_results: Optional[Dict[str, Any]] = None,
+    price_calendar: Optional[Dict[str, Any]] = None,
+    flex_days: int = 0
 ):
-    """Create task for flight search"""
+    """
+    Create task for flight search
 
-    description = f"""Search for flight options from {origin} to {destination}.
+    With `flex_days` the agent also looks for cheaper dates, in the
+    pre-fetched `price_calendar` or (with tools) by calling the price
+    calendar tool.
+    """
 
-Use the mcp_flight_search tool with these parameters:
+    if flight_results is not None:
+        search_instructions = f"""Flight search results have already been retrieved (do not call any tools):
+{project_tool_result("flights", flight_results)}"""
+    else:
+        search_instructions = f"""Use the mcp_flight_search tool with these parameters:
 - origin: {origin}
 - destination: {destination}
 - departure_date: {departure_date or "2025-06-01 (or suitable date)"}
-{f"- return_date: {return_date}" if return_date else ""}
+{f"- return_date: {return_date}" if return_date else ""}"""
+
+    if price_calendar is not None:
+        search_instructions += f"""
+
+Prices for nearby dates have also been retrieved:
+{project_tool_result("flight_calendar", price_calendar)}"""
+    elif flex_days and flight_results is None:
+        search_instructions += f"""
+
+Then use the Flight Price Calendar tool with the same airports and dates and flex_days: {flex_days}"""
+
+    calendar_step = ""
+    if price_calendar is not None or flex_days:
+        calendar_step = """
+5. From the price calendar, list up to 3 date pairs cheaper than the requested dates in cheaper_dates,
+   with their price and the saving versus the requested dates (leave it empty if none are cheaper)"""
+
+    description = f"""Search for flight options from {origin} to {destination}.
+
+{search_instructions}
 
 After receiving flight data:
 1. Identify 3-5 representative flight options
 2. Calculate price range (min-max)
 3. Summarize average duration
-4. Note if flights are direct or have connections
-
-Output Format:
-{{
-    "origin": "{origin}",
-    "destination": "{destination}",
-    "flights": [
-        {{
-            "price": float,
-            "currency": "SGD",
-            "duration": "duration string",
-            "segments": int,
-            "one_way": boolean
-        }}
-    ],
-    "price_range": {{"min": float, "max": float}},
-    "average_duration": "duration string",
-    "notes": "any relevant observations"
-}}"""
+4. Note if flights are direct or have connections{calendar_step}
+
+{format_output_instructions(FlightSearchOutput)}"""
 
     return Task(
         description=description,
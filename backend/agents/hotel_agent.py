@@ -4,10 +4,13 @@ MCP Tool-based agent for hotel search
 """
 from crewai import Agent, Task
 from crewai.tools.base_tool import BaseTool
-from typing import Optional, Dict, Type
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Type
+from pydantic import BaseModel, ConfigDict, Field
 import asyncio
 from mcp_tools import search_hotels
+from models import HotelOption
+from mcp_tools.projection import project_tool_result
+from utils.formatter import format_output_instructions
 
 class HotelSearchInput(BaseModel):
     """Input for hotel search tool"""
@@ -20,7 +23,10 @@ class HotelSearchTool(BaseTool):
     description: str = "Search for hotels in a city"
     args_schema: Type[BaseModel] = HotelSearchInput
     
-    def _run(self, location: str, check_in_date: str, check_out_date: str) -> Dict:
+    def _run(self, location: str, check_in_date: str, check_out_date: str) -> str:
+        return project_tool_result("hotels", self._search(location, check_in_date, check_out_date))
+
+    def _search(self, location: str, check_in_date: str, check_out_date: str) -> Dict:
         # Create new event loop for sync context
         try:
             loop = asyncio.get_event_loop()
@@ -37,8 +43,26 @@ class HotelSearchTool(BaseTool):
 
 hotel_search_tool = HotelSearchTool()
 
-def create_hotel_agent(llm) -> Agent:
-    """Create the Hotel Search Agent"""
+class HotelOutputOption(HotelOption):
+    # Models often return star ratings as numbers
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+class HotelPriceRange(BaseModel):
+    min_per_night: float
+    max_per_night: float
+
+class HotelSearchOutput(BaseModel):
+    """Output schema for the hotel search task"""
+    model_config = ConfigDict(extra="allow")
+
+    destination: Optional[str] = None
+    hotels: List[HotelOutputOption] = Field(default_factory=list, description="3-5 representative hotels across different areas")
+    price_range: Optional[HotelPriceRange] = None
+    recommended_areas: List[str] = Field(default_factory=list)
+    notes: Optional[str] = Field(None, description="Neighborhood descriptions and recommendations")
+
+def create_hotel_agent(llm, use_tools: bool = True) -> Agent:
+    """Create the Hotel Search Agent (without tools when results are pre-fetched)"""
     return Agent(
         role="Accommodation Search Specialist",
         goal="Search for hotels and find suitable accommodation options in {destination} across different neighborhoods and price ranges",
@@ -47,7 +71,7 @@ def create_hotel_agent(llm) -> Agent:
         and match the traveler's budget and preferences.""",
         verbose=True,
         allow_delegation=False,
-        tools=[hotel_search_tool],
+        tools=[hotel_search_tool] if use_tools else [],
         llm=llm
     )
 
@@ -56,16 +80,23 @@ def create_hotel_task(
     destination: str,
     check_in_date: Optional[str] = None,
     check_out_date: Optional[str] = None,
-    budget_level: str = "moderate"
+    budget_level: str = "moderate",
+    hotel_results: Optional[Dict[str, Any]] = None
 ):
     """Create task for hotel search"""
 
-    description = f"""Search for hotel options in {destination}.
-
-Use the mcp_hotel_search tool with these parameters:
+    if hotel_results is not None:
+        search_instructions = f"""Hotel search results have already been retrieved (do not call any tools):
+{project_tool_result("hotels", hotel_results)}"""
+    else:
+        search_instructions = f"""Use the mcp_hotel_search tool with these parameters:
 - location: {destination}
 - check_in_date: {check_in_date or "2025-06-01 (or suitable date)"}
-- check_out_date: {check_out_date or "2025-06-08 (or suitable date)"}
+- check_out_date: {check_out_date or "2025-06-08 (or suitable date)"}"""
+
+    description = f"""Search for hotel options in {destination}.
+
+{search_instructions}
 
 After receiving hotel data:
 1. Identify 3-5 representative hotel options across different areas
@@ -73,23 +104,7 @@ After receiving hotel data:
 3. Highlight price ranges per night
 4. Consider {budget_level} budget level
 
-Output Format:
-{{
-    "destination": "{destination}",
-    "hotels": [
-        {{
-            "name": "hotel name",
-            "rating": "rating",
-            "price_per_night": float,
-            "total_price": float,
-            "currency": "SGD",
-            "area": "neighborhood"
-        }}
-    ],
-    "price_range": {{"min_per_night": float, "max_per_night": float}},
-    "recommended_areas": ["area1", "area2"],
-    "notes": "neighborhood descriptions and recommendations"
-}}"""
+{format_output_instructions(HotelSearchOutput)}"""
 
     return Task(
         description=description,
@@ -1,9 +1,33 @@
 """
 Itinerary Planner Agent
-LLM-only agent for creating day-by-day itineraries
+LLM-only agent for creating day-by-day itineraries, either in one call
+or as a day-theme outline followed by one call per day
 """
+import re
 from crewai import Agent, Task
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from utils.formatter import format_output_instructions
+
+class ItineraryDayTheme(BaseModel):
+    """One day of the itinerary outline"""
+    model_config = ConfigDict(extra="allow")
+
+    day: int = Field(..., description="Day number, starting at 1")
+    theme: str = Field(..., description="Short theme for the day, e.g. 'Old Town & Markets'")
+    area: Optional[str] = Field(None, description="Neighbourhood or area the day is centred on")
+    highlights: List[str] = Field(default_factory=list, description="2-4 attractions or experiences for the day")
+
+class ItineraryOutline(BaseModel):
+    """Output schema for the itinerary outline task"""
+    model_config = ConfigDict(extra="allow")
+
+    overview: Optional[str] = Field(None, description="2-3 sentences on the itinerary's focus and highlights")
+    days: List[ItineraryDayTheme] = Field(default_factory=list, description="One entry per day, in order")
+    practical_notes: List[str] = Field(
+        default_factory=list,
+        description="Getting around, must-try foods and money-saving tips, one per item"
+    )
 
 def create_itinerary_agent(llm) -> Agent:
     """Create the Itinerary Planner Agent"""
@@ -113,3 +137,202 @@ Brief intro about the itinerary's focus and highlights
         agent=agent,
         expected_output=f"Detailed markdown itinerary with day-by-day breakdown including morning, afternoon, and evening activities for {duration_days} days"
     )
+
+
+def _attraction_names(attractions_data: Dict[str, Any] = None) -> List[str]:
+    """Attraction names across all categories, interleaved so each category is represented early"""
+    categories = list((attractions_data or {}).get("categories", {}).values())
+    names = []
+    for rank in range(max((len(items) for items in categories), default=0)):
+        for items in categories:
+            if rank < len(items) and items[rank].get("name") and items[rank]["name"] not in names:
+                names.append(items[rank]["name"])
+    return names
+
+def _day_role(day: int, duration_days: int) -> str:
+    if day == 1:
+        return "Arrival day - lighter schedule, nearby attractions, orientation"
+    if day == duration_days:
+        return "Departure day - morning activities, travel to airport"
+    return "Full day with morning, afternoon, and evening activities"
+
+def create_itinerary_outline_task(
+    agent: Agent,
+    destination: str,
+    duration_days: int,
+    attractions_data: Dict[str, Any] = None,
+    weather_data: Dict[str, Any] = None,
+    hotel_data: Dict[str, Any] = None,
+    budget_level: str = "moderate",
+    interests: List[str] = None,
+    trip_type: str = "solo"
+):
+    """Create task for the day-theme outline that the per-day tasks expand"""
+
+    attractions = _attraction_names(attractions_data)
+    hotel_areas = sorted({hotel["area"] for hotel in (hotel_data or {}).get("hotels", []) if hotel.get("area")})
+
+    description = f"""Outline a {duration_days}-day itinerary for {destination}. Do not write the full
+itinerary: give each day a theme, the area it is centred on and its 2-4 highlights.
+Each day will later be written up separately from this outline.
+
+Trip Details:
+- Duration: {duration_days} days
+- Budget level: {budget_level}
+- Trip type: {trip_type}
+- Interests: {', '.join(interests) if interests else 'general tourism'}
+{f"- Hotel areas: {', '.join(hotel_areas)}" if hotel_areas else ""}
+{f"- Weather: {weather_data.get('weather_summary', '')}" if weather_data else ""}
+
+Available attractions (prefer these, each on at most one day):
+{chr(10).join(f"- {name}" for name in attractions) if attractions else "- none retrieved; use your own knowledge"}
+
+Guidelines:
+1. Day 1 is the arrival day and day {duration_days} the departure day: keep them light
+2. Group attractions by geographic area to minimize travel time
+3. Mix activity types across days and never repeat a highlight
+
+{format_output_instructions(ItineraryOutline)}"""
+
+    return Task(
+        description=description,
+        agent=agent,
+        expected_output=f"JSON outline with a theme, area and highlights for each of the {duration_days} days"
+    )
+
+def complete_itinerary_outline(
+    outline: Dict[str, Any],
+    destination: str,
+    duration_days: int,
+    attractions_data: Dict[str, Any] = None
+) -> List[Dict[str, Any]]:
+    """
+    Exactly one outline entry per day, in order
+
+    Days the outline missed (or all days, if it failed to parse) get a
+    generic theme and the next unused attractions.
+    """
+    by_day = {day["day"]: day for day in outline.get("days", []) if 1 <= day.get("day", 0) <= duration_days}
+    used = {highlight for day in by_day.values() for highlight in day.get("highlights", [])}
+    spare = [name for name in _attraction_names(attractions_data) if name not in used]
+
+    days = []
+    for number in range(1, duration_days + 1):
+        day = by_day.get(number)
+        if day is None:
+            if number == 1:
+                theme = "Arrival & Orientation"
+            elif number == duration_days:
+                theme = "Last Sights & Departure"
+            else:
+                theme = f"Exploring {destination}"
+            day = {"day": number, "theme": theme, "area": None, "highlights": spare[:3]}
+            spare = spare[3:]
+        days.append(day)
+    return days
+
+def create_itinerary_day_task(
+    agent: Agent,
+    destination: str,
+    duration_days: int,
+    day: Dict[str, Any],
+    outline_days: List[Dict[str, Any]],
+    weather_data: Dict[str, Any] = None,
+    budget_level: str = "moderate",
+    interests: List[str] = None,
+    trip_type: str = "solo"
+):
+    """Create task for writing a single day of an outlined itinerary"""
+
+    number = day["day"]
+    other_days = [f"- Day {other['day']}: {other['theme']}" for other in outline_days if other["day"] != number]
+
+    description = f"""Write Day {number} of a {duration_days}-day itinerary for {destination}.
+
+Day Plan:
+- Theme: {day['theme']}
+- Area: {day.get('area') or 'choose a compact area that fits the theme'}
+- Highlights: {', '.join(day.get('highlights') or []) or 'your choice, matching the theme'}
+- Day type: {_day_role(number, duration_days)}
+
+Trip Details:
+- Budget level: {budget_level}
+- Trip type: {trip_type}
+- Interests: {', '.join(interests) if interests else 'general tourism'}
+{f"- Weather: {weather_data.get('weather_summary', '')}" if weather_data else ""}
+
+Other days (already covered, do not repeat their highlights):
+{chr(10).join(other_days) if other_days else "- none"}
+
+Include:
+- **Morning** (9:00 AM - 12:00 PM): 1-2 activities
+- **Afternoon** (2:00 PM - 5:00 PM): 1-2 activities
+- **Evening** (6:00 PM - 9:00 PM): Dinner and evening activity
+- Estimated time at each location, travel time between them and meal suggestions
+
+Output Format (Markdown), this day only:
+
+## Day {number}: {day['theme']}
+**Morning**
+- 9:00 AM: [Attraction name] - [description] (~duration)
+
+**Afternoon**
+- 2:00 PM: [Attraction name] - [description] (~duration)
+- Travel tip: [transportation advice]
+
+**Evening**
+- 6:00 PM: Dinner at [area/restaurant suggestion]
+- 8:00 PM: [Evening activity]
+
+**Day {number} Tips:** [practical advice]"""
+
+    return Task(
+        description=description,
+        agent=agent,
+        expected_output=f"Markdown section for day {number} with morning, afternoon, and evening activities"
+    )
+
+def _day_body(section: str) -> str:
+    """A generated day section without code fences or its own heading, sub-headings demoted below days"""
+    text = section.strip()
+    text = re.sub(r"^```[a-zA-Z]*\n|\n?```$", "", text).strip()
+    lines = text.splitlines()
+    if lines and re.match(r"^#+\s*Day\s+\d+", lines[0], re.IGNORECASE):
+        lines = lines[1:]
+    return "\n".join(re.sub(r"^#{1,2}\s", "### ", line) for line in lines).strip()
+
+def merge_itinerary(
+    destination: str,
+    duration_days: int,
+    outline: Dict[str, Any],
+    outline_days: List[Dict[str, Any]],
+    day_sections: Dict[int, Optional[str]]
+) -> str:
+    """
+    Assemble the final Markdown itinerary from the outline and per-day sections
+
+    Days are always emitted in order under a '## Day N: theme' heading
+    taken from the outline; a day whose section is missing or empty is
+    written out from its outline highlights instead.
+    """
+    lines = [f"# {duration_days}-Day {destination} Itinerary", ""]
+    if outline.get("overview"):
+        lines.extend(["## Overview", outline["overview"].strip(), ""])
+
+    for day in outline_days:
+        lines.append(f"## Day {day['day']}: {day['theme']}")
+        body = _day_body(day_sections.get(day["day"]) or "")
+        if body:
+            lines.append(body)
+        else:
+            if day.get("area"):
+                lines.append(f"**Area:** {day['area']}")
+            lines.extend(f"- {highlight}" for highlight in day.get("highlights") or [])
+            if not day.get("highlights"):
+                lines.append(f"- Free time to explore {destination} at your own pace")
+        lines.append("")
+
+    if outline.get("practical_notes"):
+        lines.append("## Practical Notes")
+        lines.extend(f"- {note}" for note in outline["practical_notes"])
+    return "\n".join(lines).rstrip()
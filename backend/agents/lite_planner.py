@@ -0,0 +1,58 @@
+"""
+Lite Plan Prompt
+Single consolidated LLM call for the fast preview plan
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from utils.formatter import format_output_instructions
+from .seasonality_agent import SeasonalityOutput
+from .tips_agent import TravelTipsOutput
+
+class LitePlanOutput(BaseModel):
+    """Output schema for the consolidated lite plan call"""
+    model_config = ConfigDict(extra="allow")
+
+    seasonality: Optional[SeasonalityOutput] = None
+    tips: Optional[TravelTipsOutput] = None
+    itinerary: Optional[str] = Field(
+        None,
+        description="Compact Markdown itinerary: '## Day N: theme' followed by 3-4 short bullets per day"
+    )
+
+LITE_PLAN_SYSTEM_PROMPT = """You are an expert travel planner producing a quick preview plan.
+Be concise and practical. Reply with a single JSON object only."""
+
+def create_lite_plan_prompt(
+    destination: str,
+    duration_days: int,
+    travel_month: Optional[str] = None,
+    budget_level: str = "moderate",
+    interests: List[str] = None,
+    trip_type: str = "solo",
+    attractions: Dict[str, List[Dict[str, Any]]] = None,
+    hotel_areas: List[str] = None
+) -> str:
+    """Create the prompt for the consolidated seasonality + tips + itinerary call"""
+
+    places = []
+    for category, items in (attractions or {}).items():
+        places.extend(f"- {item['name']} ({category}, {item.get('vicinity') or 'n/a'})" for item in items)
+
+    return f"""Create a quick preview plan for a {duration_days}-day trip to {destination}.
+
+Trip Details:
+- Travel month: {travel_month or 'flexible'}
+- Budget level: {budget_level}
+- Trip type: {trip_type}
+- Interests: {', '.join(interests) if interests else 'general tourism'}
+{f"- Hotel areas: {', '.join(hotel_areas)}" if hotel_areas else ""}
+
+Known attractions (prefer these in the itinerary):
+{chr(10).join(places) if places else '- none retrieved; use your own knowledge'}
+
+Provide:
+1. **seasonality**: best months to visit, a short weather summary and an assessment of the travel month
+2. **tips**: the most important etiquette, safety, transport, communication and money tips (2-3 each)
+3. **itinerary**: a compact day-by-day plan for all {duration_days} days, grouping nearby attractions
+
+{format_output_instructions(LitePlanOutput)}"""
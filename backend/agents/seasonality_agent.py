@@ -3,7 +3,21 @@ Seasonality & Timing Agent
 LLM-only agent for determining best travel times
 """
 from crewai import Agent
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from utils.formatter import format_output_instructions
+
+class SeasonalityOutput(BaseModel):
+    """Output schema for the seasonality task"""
+    model_config = ConfigDict(extra="allow")
+
+    best_months: List[str] = Field(default_factory=list, description="The 2-3 best months to visit")
+    weather_summary: Optional[str] = Field(None, description="Typical weather conditions throughout the year")
+    seasonal_highlights: List[str] = Field(default_factory=list, description="Major festivals, events or seasonal attractions")
+    months_to_avoid: List[str] = Field(default_factory=list)
+    peak_season: Optional[str] = Field(None, description="Peak tourist months")
+    off_peak_season: Optional[str] = Field(None, description="Off-peak tourist months")
+    travel_month_assessment: Optional[str] = Field(None, description="Assessment of the traveler's month, if provided")
 
 def create_seasonality_agent(llm) -> Agent:
     """Create the Seasonality & Timing Agent"""
@@ -33,16 +47,7 @@ def create_seasonality_task(agent: Agent, destination: str, travel_month: str =
 
 {f'The traveler is interested in visiting in {travel_month}. Comment on this timing.' if travel_month else ''}
 
-Output Format:
-{{
-    "best_months": ["month1", "month2", "month3"],
-    "weather_summary": "detailed weather description",
-    "seasonal_highlights": ["highlight1", "highlight2"],
-    "months_to_avoid": ["month1", "month2"],
-    "peak_season": "months",
-    "off_peak_season": "months",
-    "travel_month_assessment": "assessment if specific month provided"
-}}"""
+{format_output_instructions(SeasonalityOutput)}"""
 
     return Task(
         description=description,
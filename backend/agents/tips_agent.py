@@ -3,6 +3,36 @@ Culture, Safety & Transport Tips Agent
 LLM-only agent for practical travel advice
 """
 from crewai import Agent, Task
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from utils.formatter import format_output_instructions
+
+class TravelTipsOutput(BaseModel):
+    """Output schema for the tips task"""
+    model_config = ConfigDict(extra="allow")
+
+    destination: Optional[str] = None
+    culture_etiquette: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="greetings, dress_code, dining and a tips list"
+    )
+    safety: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="safety_level, areas_to_avoid, common_scams, emergency_numbers and a tips list"
+    )
+    transportation: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="airport_transfer (options, recommended, cost, duration), public_transport and apps"
+    )
+    communication: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="english_level, essential phrases and sim_card"
+    )
+    money: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="currency, exchange_tips, card_acceptance and bargaining"
+    )
+    general_tips: List[str] = Field(default_factory=list)
 
 def create_tips_agent(llm) -> Agent:
     """Create the Culture, Safety & Transport Tips Agent"""
@@ -71,50 +101,7 @@ Cover the following categories:
    - What to pack specific to destination
    - Local apps to download
 
-Output Format:
-{{
-    "destination": "{destination}",
-    "culture_etiquette": {{
-        "greetings": "...",
-        "dress_code": "...",
-        "dining": "...",
-        "tips": ["tip1", "tip2"]
-    }},
-    "safety": {{
-        "safety_level": "low/medium/high risk",
-        "areas_to_avoid": ["area1"],
-        "common_scams": ["scam1", "scam2"],
-        "emergency_numbers": {{"police": "...", "ambulance": "..."}},
-        "tips": ["tip1", "tip2"]
-    }},
-    "transportation": {{
-        "airport_transfer": {{
-            "options": ["metro", "taxi", "bus"],
-            "recommended": "...",
-            "cost": "...",
-            "duration": "..."
-        }},
-        "public_transport": {{
-            "description": "...",
-            "card_name": "...",
-            "cost_per_day": "...",
-            "tips": ["tip1"]
-        }},
-        "apps": ["app1", "app2"]
-    }},
-    "communication": {{
-        "english_level": "low/medium/high",
-        "phrases": {{"hello": "...", "thank_you": "..."}},
-        "sim_card": "..."
-    }},
-    "money": {{
-        "currency": "...",
-        "exchange_tips": "...",
-        "card_acceptance": "...",
-        "bargaining": "..."
-    }},
-    "general_tips": ["tip1", "tip2", "tip3"]
-}}"""
+{format_output_instructions(TravelTipsOutput)}"""
 
     return Task(
         description=description,
@@ -0,0 +1,96 @@
+"""
+Completion cache replay benchmark
+Replays the prompts stored in the LLM completion cache: offline from the
+cache itself (lookup latency, key integrity), or live against a model to
+compare latency and output size with the recorded completions
+
+Usage (from backend/):
+    python -m benchmarks.completion_replay [--limit N]
+    python -m benchmarks.completion_replay --live openai/gpt-4o-mini [--limit N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.completion_cache import CompletionCache, completion_key, get_completion_cache
+from utils.llm import get_llm_client
+
+OPENROUTER_PREFIX = "openrouter/"
+
+def response_text(response: Any) -> str:
+    """Completion text of a stored response (OpenRouter JSON or a plain agent output)"""
+    if isinstance(response, dict):
+        return response["choices"][0]["message"]["content"] or ""
+    return str(response)
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def replay_offline(cache: CompletionCache, entries: List[Dict[str, Any]]):
+    """Serve every stored prompt from the cache in replay mode"""
+    cache.mode = "replay"
+    lookups, mismatched = [], 0
+    for entry in entries:
+        mismatched += completion_key(entry["request"]) != entry["key"]
+        start = time.perf_counter()
+        cache.get(entry["key"])
+        lookups.append((time.perf_counter() - start) * 1000)
+
+    print(f"Replayed {len(entries)} completions offline")
+    print(f"  key mismatches: {mismatched}")
+    print(f"  lookup p50 {percentile(lookups, 50):.2f} ms, p95 {percentile(lookups, 95):.2f} ms")
+
+async def replay_live(model: str, entries: List[Dict[str, Any]]):
+    """Re-send every stored prompt to `model`, bypassing the cache"""
+    client = get_llm_client()
+    latencies, ratios = [], []
+    for entry in entries:
+        request = entry["request"]
+        start = time.perf_counter()
+        response = await client.chat_completion(
+            messages=request["messages"],
+            temperature=request.get("temperature") if request.get("temperature") is not None else 0.7,
+            max_tokens=request.get("max_tokens", 4000),
+            response_format=request.get("response_format"),
+            model=model[len(OPENROUTER_PREFIX):] if model.startswith(OPENROUTER_PREFIX) else model,
+            use_cache=False
+        )
+        latencies.append(time.perf_counter() - start)
+        recorded = len(response_text(entry["response"])) or 1
+        ratios.append(len(response_text(response)) / recorded)
+        print(f"  {entry['key'][:12]} ({entry['model']}): {latencies[-1]:.1f}s")
+
+    print(f"Replayed {len(entries)} prompts against {model}")
+    print(f"  latency p50 {percentile(latencies, 50):.1f}s, p95 {percentile(latencies, 95):.1f}s")
+    print(f"  output length vs recorded: {statistics.mean(ratios):.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most N stored prompts")
+    parser.add_argument("--live", metavar="MODEL", help="Re-send the prompts to this OpenRouter model")
+    args = parser.parse_args()
+
+    cache = get_completion_cache()
+    entries = list(cache.entries(args.limit))
+    if not entries:
+        print(f"No completions stored in {cache.path}")
+        return
+
+    models = Counter(entry["model"] for entry in entries)
+    print(f"{len(entries)} stored completions: {json.dumps(dict(models))}")
+    if args.live:
+        asyncio.run(replay_live(args.live, entries))
+    else:
+        replay_offline(cache, entries)
+
+if __name__ == "__main__":
+    main()
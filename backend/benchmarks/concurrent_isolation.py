@@ -0,0 +1,171 @@
+"""
+Concurrent planning isolation stress test
+Runs many execute_planning calls for different destinations at once with
+the agents and MCP tools stubbed (random latencies, no network, no LLM)
+and checks that no destination's data leaks into another request's plan,
+its streamed sections, or the inputs of its agents
+
+Usage (from backend/):
+    python -m benchmarks.concurrent_isolation [requests] [rounds]
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestrator.crew as crew
+import orchestrator.orchestrator_agent as orchestrator_agent
+
+# Destination name, airport code, city code - every code must be unique across the list
+DESTINATIONS = [
+    ("Tokyo", "NRT", "TYO"),
+    ("Paris", "CDG", "PAR"),
+    ("Lisbon", "LIS", "LIS"),
+    ("London", "LHR", "LON"),
+    ("Bangkok", "BKK", "BKK"),
+    ("Sydney", "SYD", "SYD"),
+    ("Rome", "FCO", "ROM"),
+    ("Seoul", "ICN", "SEL")
+]
+MIXED = "MIXED"
+
+def markers_in(text: str) -> List[str]:
+    """Destinations whose name or codes appear in `text`"""
+    found = []
+    for name, airport, city in DESTINATIONS:
+        if re.search(rf"\b({re.escape(name)}|{airport}|{city})\b", text):
+            found.append(name)
+    return found
+
+def marker_of(text: str) -> str:
+    found = markers_in(text)
+    return found[0] if len(found) == 1 else MIXED
+
+def fake_agent_output(name: str, marker: str) -> str:
+    """Schema-valid output for one agent, carrying `marker` in the fields the plan keeps"""
+    if name == "itinerary":
+        return f"# {marker}\n\nDay 1: {marker}"
+    if name == "itinerary_day":
+        return f"A day in {marker}"
+    return json.dumps({
+        "seasonality": {"best_months": ["May"], "weather_summary": marker},
+        "flights": {"flights": [{"price": 500, "currency": "SGD", "duration": marker, "segments": 1, "one_way": False}]},
+        "hotels": {"hotels": [{"name": marker, "rating": "4", "price_per_night": 100, "total_price": 600,
+                               "currency": "SGD", "area": marker}]},
+        "budget": {"budget_tiers": {marker: {"daily_total": 1, "meals": 1, "transport": 1, "accommodation": 1}}},
+        "attractions": {"categories": {"culture": [{"name": marker, "rating": 4.5,
+                                                     "coordinates": {"lat": 0.0, "lng": 0.0}}]}},
+        "tips": {"destination": marker},
+        "itinerary_outline": {"overview": marker, "days": []}
+    }[name])
+
+def stub_agent(agent: Any, task: Any, name: str) -> str:
+    """Stands in for crew.run_agent_task: labels the output with the destination its task was given"""
+    time.sleep(random.uniform(0.01, 0.15))
+    return fake_agent_output(name, marker_of(task.description))
+
+def stub_tool(label: str):
+    async def tool(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        await asyncio.sleep(random.uniform(0.0, 0.05))
+        text = " ".join(str(arg) for arg in args)
+        return {"success": True, "source": label, "destination": text, "results": [], "flights": [], "hotels": []}
+    return tool
+
+def section_markers(response: Dict[str, Any]) -> Dict[str, str]:
+    """Marker carried by each section of a finished plan"""
+    return {
+        "seasonality": response.get("weather_summary") or "",
+        "flights": json.dumps(response.get("flight_options") or []),
+        "hotels": json.dumps(response.get("hotel_options") or []),
+        "budget": json.dumps(response.get("budget_estimate") or {}),
+        "attractions": json.dumps(response.get("attractions") or {}),
+        "itinerary": response.get("itinerary") or "",
+        "tips": json.dumps(response.get("tips") or {})
+    }
+
+def check(destination: str, response: Dict[str, Any], streamed: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """Isolation failures for one request"""
+    failures = []
+    if response.get("destination") != destination:
+        failures.append(f"destination is {response.get('destination')!r}")
+    for section, text in section_markers(response).items():
+        found = markers_in(text)
+        if found != [destination]:
+            failures.append(f"{section} carries {found or 'nothing'}")
+    for section, fields in streamed:
+        found = markers_in(json.dumps(fields))
+        if found and found != [destination]:
+            failures.append(f"streamed {section} carries {found}")
+    return failures
+
+async def run_round(orchestrator: Any, requests: int) -> Tuple[int, List[str], float]:
+    plans = []
+    for index in range(requests):
+        name = DESTINATIONS[index % len(DESTINATIONS)][0]
+        plans.append({
+            "destination": name,
+            "origin": "Singapore",
+            "departure_date": "2026-06-01",
+            "return_date": "2026-06-05",
+            "duration_days": 4 + index % 3,
+            "budget_level": "moderate",
+            "trip_type": "couple",
+            "interests": ["culture"]
+        })
+
+    async def one(request_data: Dict[str, Any]):
+        streamed: List[Tuple[str, Dict[str, Any]]] = []
+        response = await orchestrator.execute_planning(
+            request_data,
+            on_section=lambda section, fields: streamed.append((section, fields)),
+            read_cache=False,
+            write_cache=False
+        )
+        return check(request_data["destination"], response, streamed)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(request_data) for request_data in plans], return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    failures = []
+    for request_data, result in zip(plans, results):
+        if isinstance(result, BaseException):
+            failures.append(f"{request_data['destination']}: {type(result).__name__}: {result}")
+        else:
+            failures.extend(f"{request_data['destination']}: {failure}" for failure in result)
+    return len(plans), failures, elapsed
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["PLANNING_MAX_CONCURRENT"] = str(requests)
+    os.environ["AGENT_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "agent_cache.json")
+
+    crew.run_agent_task = stub_agent
+    for tool in ["search_flights", "search_flight_price_calendar", "search_hotels", "search_places", "lookup_budget"]:
+        setattr(orchestrator_agent, tool, stub_tool(tool))
+
+    orchestrator = orchestrator_agent.TravelPlanningOrchestrator("benchmark")
+    print(f"Concurrent isolation, {requests} requests x {rounds} rounds")
+    failed = 0
+    for round_number in range(1, rounds + 1):
+        count, failures, elapsed = asyncio.run(run_round(orchestrator, requests))
+        failed += len(failures)
+        print(f"round {round_number}: {count} plans in {elapsed:.2f}s, {len(failures)} isolation failures")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+
+    print("PASS" if failed == 0 else f"FAIL ({failed} failures)")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Crew construction micro-benchmark
+Compares building all seven agents + tasks per request against leasing
+agents from the AgentPool and building only the tasks
+
+Usage (from backend/):
+    python -m benchmarks.crew_construction [iterations]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import (
+    create_seasonality_task, create_flight_task, create_hotel_task,
+    create_budget_task, create_attractions_task, create_itinerary_task,
+    create_tips_task
+)
+from orchestrator.agent_pool import AgentPool
+
+LLM = "openrouter/openai/gpt-4-turbo-preview"
+
+def build_tasks(agents):
+    """Build the seven request-specific tasks for one plan"""
+    return [
+        create_seasonality_task(agents["seasonality"], "Tokyo", "June"),
+        create_flight_task(agents["flights"], "SIN", "NRT", "2026-06-01", "2026-06-08"),
+        create_hotel_task(agents["hotels"], "TYO", "2026-06-01", "2026-06-08"),
+        create_budget_task(agents["budget"], "Tokyo", {}, {}, 7),
+        create_attractions_task(agents["attractions"], "Tokyo", ["culture", "food"]),
+        create_itinerary_task(agents["itinerary"], "Tokyo", 7, {}, {}, {}, "moderate", ["culture"], "couple"),
+        create_tips_task(agents["tips"], "Tokyo", "couple")
+    ]
+
+def construct_fresh(pool: AgentPool):
+    """Previous behaviour: new agents for every request"""
+    agents = {name: pool._build(name, LLM, True) for name in
+              ["seasonality", "flights", "hotels", "budget", "attractions", "itinerary", "tips"]}
+    build_tasks(agents)
+
+def construct_pooled(pool: AgentPool):
+    """Current behaviour: lease agents, build only tasks"""
+    names = ["seasonality", "flights", "hotels", "budget", "attractions", "itinerary", "tips"]
+    agents = {name: pool.acquire(name, LLM, True) for name in names}
+    build_tasks(agents)
+    for name, agent in agents.items():
+        pool.release(name, LLM, True, agent)
+
+def measure(label: str, fn, pool: AgentPool, iterations: int):
+    fn(pool)  # warm-up (imports, pool fill)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(pool)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    fn(pool)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    print(f"{label:<8} {elapsed * 1000:8.2f} ms/plan   peak {peak / 1024:8.1f} KiB   live blocks {blocks}")
+
+def main():
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"Crew construction, {iterations} iterations")
+    measure("fresh", construct_fresh, AgentPool(), iterations)
+    measure("pooled", construct_pooled, AgentPool(), iterations)
+
+if __name__ == "__main__":
+    main()
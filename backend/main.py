@@ -2,16 +2,26 @@
 FastAPI Travel Planner Backend
 Main application entry point
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+import asyncio
+from contextlib import asynccontextmanager
+import functools
+import json
 import os
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional
 import logging
 
-from models import TravelPlanRequest, TravelPlanResponse
-from orchestrator import TravelPlanningOrchestrator
-from utils import load_environment
+from models import TravelPlanRequest, TravelPlanUpdate, PlanBatchRequest, TravelPlanResponse, PlanJobResponse, PlanMode, PLAN_SECTION_MODELS
+from orchestrator import (
+    TravelPlanningOrchestrator, PlanningCapacityError, PlanNotFoundError,
+    get_planning_pool, get_job_store, get_plan_cache, get_plan_similarity, get_plan_singleflight,
+    get_agent_cache, get_agent_pool, get_output_parse_stats, get_agent_usage, get_plan_store, get_batch_stats
+)
+from mcp_tools import get_tool_projector, get_flight_price_calendar, get_amadeus_token_cache
+from utils import load_environment, get_llm_hedger, get_completion_cache, get_http_clients
 
 # Load environment variables
 load_environment()
@@ -20,11 +30,22 @@ load_environment()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the pooled HTTP clients for the app's lifetime"""
+    http_clients = get_http_clients()
+    await http_clients.open()
+    try:
+        yield
+    finally:
+        await http_clients.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Travel Planner API",
     description="AI-powered travel planning with CrewAI and MCP tools",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -49,6 +70,42 @@ def get_orchestrator() -> TravelPlanningOrchestrator:
         _orchestrator = TravelPlanningOrchestrator(openrouter_api_key)
     return _orchestrator
 
+def build_request_data(request: TravelPlanRequest) -> Dict[str, Any]:
+    """Convert a TravelPlanRequest into the orchestrator's request dict"""
+    return {
+        "destination": request.destination,
+        "origin": request.origin or "SIN",
+        "departure_date": request.departure_date or "2026-06-01",
+        "return_date": request.return_date,
+        "budget_level": request.budget_level,
+        "interests": request.interests or [],
+        "trip_type": request.trip_type,
+        "duration_days": request.duration_days or 7
+    }
+
+def cache_options(cache_control: Optional[str]) -> Dict[str, bool]:
+    """
+    Map a Cache-Control request header to plan cache flags
+
+    `no-cache` skips the cache lookup but stores the fresh plan;
+    `no-store` neither reads nor writes the cache.
+    """
+    directives = {d.strip().lower() for d in (cache_control or "").split(",")}
+    if "no-store" in directives:
+        return {"read_cache": False, "write_cache": False}
+    if "no-cache" in directives:
+        return {"read_cache": False, "write_cache": True}
+    return {"read_cache": True, "write_cache": True}
+
+def capacity_exception(e: PlanningCapacityError) -> HTTPException:
+    """Map a full planning pool to a fast 503 with Retry-After"""
+    logger.warning(f"Planning rejected: {str(e)}")
+    return HTTPException(
+        status_code=503,
+        detail=f"Planner is busy, please retry later: {str(e)}",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -57,7 +114,13 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "plan": "/plan - POST - Create travel plan",
-            "health": "/health - GET - Health check"
+            "health": "/health - GET - Health check",
+            "plan_update": "/plan/{plan_id} - PATCH - Change a plan's request, rerunning only affected agents",
+            "plan_batch": "/plan/batch - POST - Plan many requests, streamed back as NDJSON",
+            "plan_stream": "/plan/stream - POST - Stream each agent's result as Server-Sent Events",
+            "plan_jobs": "/plan/jobs - POST - Submit a background planning job",
+            "plan_job": "/plan/jobs/{job_id} - GET - Poll (or long-poll with ?wait=) a planning job",
+            "metrics": "/metrics - GET - Planning queue and runtime metrics"
         }
     }
 
@@ -69,8 +132,39 @@ async def health_check():
         "service": "travel-planner-api"
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Planning queue depth, wait times and other runtime metrics"""
+    return {
+        "planning_pool": get_planning_pool().stats(),
+        "plan_jobs": get_job_store().stats(),
+        "plan_cache": get_plan_cache().stats(),
+        "plan_similarity": get_plan_similarity().stats(),
+        "plan_store": get_plan_store().stats(),
+        "plan_batches": get_batch_stats().stats(),
+        "plan_singleflight": get_plan_singleflight().stats(),
+        "agent_cache": get_agent_cache().stats(),
+        "agent_pool": get_agent_pool().stats(),
+        "agent_outputs": get_output_parse_stats().stats(),
+        "agent_usage": get_agent_usage().stats(),
+        "tool_projection": get_tool_projector().stats(),
+        "flight_calendar": get_flight_price_calendar().stats(),
+        "amadeus_auth": get_amadeus_token_cache().stats(),
+        "llm_hedging": get_llm_hedger().stats(),
+        "llm_cache": get_completion_cache().stats(),
+        "http_clients": get_http_clients().stats()
+    }
+
 @app.post("/plan", response_model=TravelPlanResponse)
-async def create_travel_plan(request: TravelPlanRequest) -> Dict[str, Any]:
+async def create_travel_plan(
+    request: TravelPlanRequest,
+    response: Response,
+    cache_control: Optional[str] = Header(None),
+    mode: PlanMode = Query(PlanMode.FULL, description="full: multi-agent plan; lite: single-call preview"),
+    deadline: Optional[float] = Query(
+        None, gt=0, le=600, description="Seconds to answer within; unfinished sections are served degraded"
+    )
+) -> Dict[str, Any]:
     """
     Create a comprehensive travel plan
 
@@ -83,6 +177,17 @@ async def create_travel_plan(request: TravelPlanRequest) -> Dict[str, Any]:
     6. Generate itinerary (Itinerary Agent)
     7. Provide tips (Tips Agent)
 
+    Identical requests are served from the plan cache; send
+    `Cache-Control: no-cache` to force a fresh plan.
+
+    With `mode=lite` the agents are skipped: MCP tools run concurrently and
+    a single LLM call writes seasonality, tips and a compact itinerary.
+    Call again with `mode=full` to upgrade to the multi-agent plan.
+
+    With `deadline` (default PLAN_DEADLINE_SECONDS), sections still
+    running when time is up are filled from cache or tool fallback data
+    and listed in `degraded_sections` instead of failing the request.
+
     Returns:
         Complete travel plan with all information
     """
@@ -90,25 +195,27 @@ async def create_travel_plan(request: TravelPlanRequest) -> Dict[str, Any]:
         logger.info(f"Received planning request for {request.destination}")
 
         # Convert request to dict
-        request_data = {
-            "destination": request.destination,
-            "origin": request.origin or "SIN",
-            "departure_date": request.departure_date or "2026-06-01",
-            "return_date": request.return_date,
-            "budget_level": request.budget_level,
-            "interests": request.interests or [],
-            "trip_type": request.trip_type,
-            "duration_days": request.duration_days or 7
-        }
+        request_data = build_request_data(request)
 
         # Get orchestrator and execute planning
         orchestrator = get_orchestrator()
-        result = await orchestrator.execute_planning(request_data)
+        result = await orchestrator.execute_planning(
+            request_data,
+            mode=mode.value,
+            deadline=deadline or orchestrator.default_deadline,
+            **cache_options(cache_control)
+        )
+        response.headers["X-Plan-Cache"] = result.get("cache_status", "miss").upper()
+        if result.get("degraded_sections"):
+            logger.warning(f"Plan for {request.destination} degraded: {result['degraded_sections']}")
 
         logger.info(f"Planning completed for {request.destination} in {result.get('execution_time', 0):.1f}s")
 
         return result
 
+    except PlanningCapacityError as e:
+        raise capacity_exception(e)
+
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -120,6 +227,196 @@ async def create_travel_plan(request: TravelPlanRequest) -> Dict[str, Any]:
             detail=f"Failed to create travel plan: {str(e)}"
         )
 
+@app.patch("/plan/{plan_id}", response_model=TravelPlanResponse)
+async def update_travel_plan(plan_id: str, update: TravelPlanUpdate) -> Dict[str, Any]:
+    """
+    Change a stored plan's request and recompute only what it affects
+
+    Each agent's inputs are compared with the stored request: e.g. new
+    interests rerun attractions and itinerary, a new duration reruns
+    flights, hotels, budget and itinerary, while seasonality and tips are
+    reused. `recomputed_sections` lists the agents that were rerun.
+
+    Returns:
+        The updated travel plan, under a new plan_id (the original plan
+        is left unchanged)
+    """
+    changes = update.model_dump(exclude_none=True)
+    try:
+        orchestrator = get_orchestrator()
+        result = await orchestrator.replan(plan_id, changes)
+        logger.info(
+            f"Re-planned {plan_id} in {result.get('execution_time', 0):.1f}s, "
+            f"recomputed: {', '.join(result['recomputed_sections']) or 'nothing'}"
+        )
+        return result
+
+    except PlanNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except PlanningCapacityError as e:
+        raise capacity_exception(e)
+
+    except ValueError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Re-planning error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update travel plan: {str(e)}"
+        )
+
+def format_sse(event: str, data: str) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {data}\n\n"
+
+@app.post("/plan/stream")
+async def stream_travel_plan(
+    request: TravelPlanRequest,
+    cache_control: Optional[str] = Header(None)
+) -> StreamingResponse:
+    """
+    Stream a travel plan as Server-Sent Events
+
+    Emits one typed event per agent as soon as it finishes
+    (seasonality, flights, hotels, budget, attractions, itinerary, tips),
+    followed by a `complete` event carrying the full TravelPlanResponse,
+    or an `error` event if planning fails.
+    """
+    try:
+        orchestrator = get_orchestrator()
+        get_planning_pool().ensure_capacity()
+    except PlanningCapacityError as e:
+        raise capacity_exception(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    request_data = build_request_data(request)
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_section(name: str, fields: Dict[str, Any]):
+        try:
+            payload = PLAN_SECTION_MODELS[name].model_validate(fields).model_dump_json()
+            events.put_nowait(format_sse(name, payload))
+        except ValidationError as e:
+            logger.warning(f"Streamed section '{name}' failed validation: {str(e)}")
+            events.put_nowait(format_sse("section_error", json.dumps({"section": name, "detail": str(e)})))
+
+    async def run_planning():
+        try:
+            result = await orchestrator.execute_planning(
+                request_data, on_section=on_section, **cache_options(cache_control)
+            )
+            payload = TravelPlanResponse.model_validate(result).model_dump_json()
+            events.put_nowait(format_sse("complete", payload))
+        except Exception as e:
+            logger.error(f"Streaming planning error: {str(e)}", exc_info=True)
+            events.put_nowait(format_sse("error", json.dumps({"detail": f"Failed to create travel plan: {str(e)}"})))
+        finally:
+            events.put_nowait(None)
+
+    async def event_stream() -> AsyncIterator[str]:
+        task = asyncio.create_task(run_planning())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # Client went away - stop waiting on the plan
+            if not task.done():
+                task.cancel()
+
+    logger.info(f"Streaming planning request for {request.destination}")
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/plan/batch")
+async def batch_travel_plans(
+    batch: PlanBatchRequest,
+    cache_control: Optional[str] = Header(None),
+    mode: PlanMode = Query(PlanMode.FULL, description="full: multi-agent plans; lite: single-call previews")
+) -> StreamingResponse:
+    """
+    Plan a batch of requests, streaming results as NDJSON
+
+    Plans run PLAN_BATCH_CONCURRENCY at a time and share airport/city code
+    resolution and MCP tool calls, so requests with the same route or
+    destination only search once. Each line is
+    `{"index", "status": "completed", "result"}` or
+    `{"index", "status": "failed", "error"}`, in completion order; the
+    last line is `{"batch": {...}}` with counts and tool dedup stats.
+    """
+    max_requests = int(os.getenv("PLAN_BATCH_MAX_REQUESTS", "500"))
+    if len(batch.requests) > max_requests:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(batch.requests)} exceeds {max_requests} requests")
+    try:
+        orchestrator = get_orchestrator()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    requests = [build_request_data(request) for request in batch.requests]
+
+    async def ndjson_stream() -> AsyncIterator[str]:
+        async for item in orchestrator.execute_batch(requests, mode=mode.value, **cache_options(cache_control)):
+            if item.get("status") == "completed":
+                try:
+                    item["result"] = TravelPlanResponse.model_validate(item["result"]).model_dump(mode="json")
+                except ValidationError as e:
+                    logger.warning(f"Batch result {item['index']} failed validation: {str(e)}")
+                    item = {"index": item["index"], "status": "failed", "error": str(e)}
+            yield json.dumps(item) + "\n"
+
+    logger.info(f"Batch planning request with {len(requests)} plans")
+    return StreamingResponse(
+        ndjson_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/plan/jobs", response_model=PlanJobResponse, status_code=202)
+async def submit_plan_job(
+    request: TravelPlanRequest,
+    cache_control: Optional[str] = Header(None)
+) -> Dict[str, Any]:
+    """
+    Submit a travel plan as a background job
+
+    Returns immediately with a job id; poll GET /plan/jobs/{job_id}
+    for status and the finished TravelPlanResponse.
+    """
+    try:
+        orchestrator = get_orchestrator()
+        get_planning_pool().ensure_capacity()
+        runner = functools.partial(orchestrator.execute_planning, **cache_options(cache_control))
+        job = get_job_store().submit(build_request_data(request), runner)
+        logger.info(f"Queued planning job {job.job_id} for {request.destination}")
+        return job.to_dict()
+
+    except PlanningCapacityError as e:
+        raise capacity_exception(e)
+
+    except ValueError as e:
+        logger.error(f"Job submission error: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/plan/jobs/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to long-poll for completion")
+) -> Dict[str, Any]:
+    """Get planning job status, optionally waiting up to `wait` seconds for it to finish"""
+    job = await get_job_store().wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Planning job {job_id} not found or expired")
+    return job.to_dict()
+
 @app.get("/destinations/popular")
 async def get_popular_destinations():
     """Get list of popular destinations"""
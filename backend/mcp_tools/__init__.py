@@ -1,12 +1,21 @@
 """MCP Travel Tools Package"""
+from .amadeus_auth import get_amadeus_token, get_amadeus_token_cache
 from .flight_tool import search_flights
+from .flight_calendar import search_flight_price_calendar, get_flight_price_calendar
 from .hotel_tool import search_hotels
 from .places_tool import search_places
 from .budget_tool import lookup_budget
+from .projection import project_tool_result, get_tool_projector
 
 __all__ = [
+    "get_amadeus_token",
+    "get_amadeus_token_cache",
     "search_flights",
+    "search_flight_price_calendar",
+    "get_flight_price_calendar",
     "search_hotels",
     "search_places",
     "lookup_budget",
+    "project_tool_result",
+    "get_tool_projector",
 ]
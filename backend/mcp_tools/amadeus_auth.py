@@ -0,0 +1,144 @@
+"""
+Amadeus OAuth Token Cache
+Shares one client-credentials token between the flight and hotel tools,
+refreshing it shortly before it expires or when Amadeus rejects it
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from utils.http_client import http_client, http_timeout
+
+AMADEUS_TOKEN_URL = "https://test.api.amadeus.com/v1/security/oauth2/token"
+
+
+class AmadeusTokenCache:
+    """
+    Cached Amadeus access token.
+
+    The token is reused until `refresh_margin` seconds before its
+    `expires_in`. Callers that find it missing or expiring share one
+    refresh: one per event loop, since a pending request can't be awaited
+    from another loop, and each refresh updates the token for all of them.
+    A forced refresh (after a 401) is skipped if another caller has already
+    replaced the rejected token.
+    """
+
+    def __init__(self, refresh_margin: float = 60.0):
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refreshing: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.refreshes = 0
+        self.forced_refreshes = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    async def _fetch(self) -> str:
+        api_key = os.getenv("AMADEUS_API_KEY")
+        api_secret = os.getenv("AMADEUS_API_SECRET")
+
+        if not api_key or not api_secret:
+            raise ValueError("Amadeus API credentials not configured")
+
+        async with http_client("amadeus") as client:
+            response = await client.post(
+                AMADEUS_TOKEN_URL,
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": api_key,
+                    "client_secret": api_secret
+                },
+                timeout=http_timeout(5.0)
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        with self._lock:
+            self._token = data["access_token"]
+            self._expires_at = time.time() + float(data.get("expires_in", 1799)) - self.refresh_margin
+            self.refreshes += 1
+            return self._token
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task):
+        with self._lock:
+            if self._refreshing.get(loop) is task:
+                del self._refreshing[loop]
+            if not task.cancelled() and task.exception() is not None:
+                self.failures += 1
+
+    async def get_token(self, force_refresh: bool = False, rejected_token: Optional[str] = None) -> str:
+        """
+        Current access token, refreshed if missing or about to expire
+
+        Args:
+            force_refresh: Fetch a new token even if the cached one is valid
+            rejected_token: With force_refresh, the token that was rejected;
+                if the cache already holds a different one it is returned
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            valid = self._token is not None and time.time() < self._expires_at
+            if valid and (not force_refresh or (rejected_token and self._token != rejected_token)):
+                self.hits += 1
+                return self._token
+            if force_refresh:
+                self.forced_refreshes += 1
+            task = self._refreshing.get(loop)
+            if task is None:
+                task = self._refreshing[loop] = loop.create_task(self._fetch())
+                task.add_done_callback(lambda done: self._forget(loop, done))
+            else:
+                self.coalesced += 1
+        # Shielded so one caller being cancelled doesn't cancel the refresh for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "has_token": self._token is not None,
+                "expires_in": max(0, round(self._expires_at - time.time())) if self._token else 0,
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "forced_refreshes": self.forced_refreshes,
+                "coalesced": self.coalesced,
+                "failures": self.failures
+            }
+
+
+# Singleton instance
+_token_cache: Optional[AmadeusTokenCache] = None
+
+def get_amadeus_token_cache() -> AmadeusTokenCache:
+    """Get or create the process-wide Amadeus token cache"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = AmadeusTokenCache(
+            refresh_margin=float(os.getenv("AMADEUS_TOKEN_REFRESH_MARGIN", "60"))
+        )
+    return _token_cache
+
+async def get_amadeus_token() -> str:
+    """Get Amadeus API access token (cached until shortly before it expires)"""
+    return await get_amadeus_token_cache().get_token()
+
+async def amadeus_get(client: httpx.AsyncClient, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    GET an Amadeus endpoint with the cached token
+
+    A 401 forces a token refresh and the request is retried once.
+    """
+    cache = get_amadeus_token_cache()
+    token = await cache.get_token()
+    response = await client.get(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    if response.status_code == 401:
+        print("🔑 Amadeus token rejected - refreshing")
+        token = await cache.get_token(force_refresh=True, rejected_token=token)
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    return response
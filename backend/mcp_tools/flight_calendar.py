@@ -0,0 +1,214 @@
+"""
+Flexible-Date Flight Price Calendar
+Searches a window of departure/return dates around the requested ones
+concurrently, under a rate limit, and returns a grid of minimum prices
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.deadline import get_deadline
+from .flight_tool import search_flights
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart, process-wide.
+
+    Thread-safe rather than tied to one event loop, since agent tools run
+    their searches on event loops of their own.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    async def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class FlightPriceCalendar:
+    """
+    Minimum flight prices per (route, departure date, return date) cell.
+
+    Each cell is one search_flights call. Cells are cached for
+    `ttl_seconds`; cells whose search fell back to mock data are not
+    cached and show as unknown. At most `max_concurrent` searches of one
+    calendar run at once, and all searches share the rate limiter.
+    """
+
+    def __init__(self, max_concurrent: int = 4, rate_per_second: float = 4.0, ttl_seconds: int = 3600):
+        self.max_concurrent = max_concurrent
+        self.ttl_seconds = ttl_seconds
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self._cells: Dict[Tuple[str, str, str, Optional[str]], Tuple[float, float, str]] = {}
+        self._lock = threading.Lock()
+        self.calendars = 0
+        self.cache_hits = 0
+        self.searches = 0
+        self.failed = 0
+
+    def _cached(self, key: Tuple[str, str, str, Optional[str]]) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            entry = self._cells.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl_seconds:
+                self._cells.pop(key, None)
+                return None
+            self.cache_hits += 1
+            return entry[1], entry[2]
+
+    async def _cell(
+        self,
+        slots: asyncio.Semaphore,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str]
+    ) -> Optional[Tuple[float, str]]:
+        """Cheapest (price, currency) for one date pair, or None if unknown"""
+        key = (origin, destination, departure_date, return_date)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        async with slots:
+            deadline = get_deadline()
+            if deadline is not None and deadline.expired:
+                return None
+            await self.rate_limiter.wait()
+            result = await search_flights(origin, destination, departure_date, return_date)
+
+        prices = [flight["price"] for flight in result.get("flights", []) if flight.get("price")]
+        with self._lock:
+            self.searches += 1
+            if not result.get("success") or not prices:
+                self.failed += 1
+                return None
+            cell = (min(prices), result["flights"][0].get("currency", "SGD"))
+            self._cells[key] = (time.time(), *cell)
+        return cell
+
+    async def search(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str] = None,
+        flex_days: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Search every departure/return pair within ±flex_days of the requested dates
+
+        Pairs that would return on or before departure are skipped.
+
+        Returns:
+            Grid of minimum prices (rows: departure dates, columns: return
+            dates; null where unknown) with the cheapest and requested cells
+        """
+        origin = origin.upper().strip()
+        destination = destination.upper().strip()
+        dep = datetime.strptime(departure_date, "%Y-%m-%d")
+        offsets = range(-flex_days, flex_days + 1)
+        departure_dates = [(dep + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in offsets]
+        if return_date:
+            ret = datetime.strptime(return_date, "%Y-%m-%d")
+            return_dates: List[Optional[str]] = [(ret + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in offsets]
+        else:
+            return_dates = [None]
+
+        pairs = [
+            (dep_date, ret_date)
+            for dep_date in departure_dates
+            for ret_date in return_dates
+            if ret_date is None or ret_date > dep_date
+        ]
+        print(f"📅 Price calendar {origin}→{destination}: {len(pairs)} date pairs (±{flex_days} days)")
+        with self._lock:
+            self.calendars += 1
+
+        slots = asyncio.Semaphore(self.max_concurrent)
+        cells = await asyncio.gather(*[
+            self._cell(slots, origin, destination, dep_date, ret_date) for dep_date, ret_date in pairs
+        ])
+        prices = dict(zip(pairs, cells))
+
+        priced = [(pair, cell) for pair, cell in prices.items() if cell is not None]
+        cheapest = min(priced, key=lambda item: item[1][0]) if priced else None
+        requested = prices.get((departure_date, return_date))
+        return {
+            "success": bool(priced),
+            "origin": origin,
+            "destination": destination,
+            "flex_days": flex_days,
+            "currency": cheapest[1][1] if cheapest else "SGD",
+            "departure_dates": departure_dates,
+            "return_dates": return_dates if return_date else None,
+            "grid": [
+                [prices[(dep_date, ret_date)][0] if prices.get((dep_date, ret_date)) else None for ret_date in return_dates]
+                for dep_date in departure_dates
+            ],
+            "requested": {"departure_date": departure_date, "return_date": return_date,
+                          "price": requested[0] if requested else None},
+            "cheapest": {"departure_date": cheapest[0][0], "return_date": cheapest[0][1],
+                         "price": cheapest[1][0]} if cheapest else None,
+            "cells_priced": len(priced),
+            "cells_total": len(pairs)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.cache_hits + self.searches
+            return {
+                "calendars": self.calendars,
+                "cached_cells": len(self._cells),
+                "cache_hits": self.cache_hits,
+                "searches": self.searches,
+                "failed_searches": self.failed,
+                "cache_hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# Singleton instance
+_price_calendar: Optional[FlightPriceCalendar] = None
+
+def get_flight_price_calendar() -> FlightPriceCalendar:
+    """Get or create the process-wide flight price calendar"""
+    global _price_calendar
+    if _price_calendar is None:
+        _price_calendar = FlightPriceCalendar(
+            max_concurrent=int(os.getenv("FLIGHT_CALENDAR_MAX_CONCURRENT", "4")),
+            rate_per_second=float(os.getenv("FLIGHT_CALENDAR_RATE_PER_SECOND", "4")),
+            ttl_seconds=int(os.getenv("FLIGHT_CALENDAR_CACHE_TTL_SECONDS", "3600"))
+        )
+    return _price_calendar
+
+async def search_flight_price_calendar(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: Optional[str] = None,
+    flex_days: int = 3
+) -> Dict[str, Any]:
+    """
+    Cheapest flight price for each departure/return date pair within ±flex_days
+
+    Args:
+        origin: Origin airport code (e.g., 'SIN')
+        destination: Destination airport code (e.g., 'NRT')
+        departure_date: Requested departure date (YYYY-MM-DD)
+        return_date: Optional requested return date (YYYY-MM-DD)
+        flex_days: Days to search either side of each date
+
+    Returns:
+        Compact min-price grid with the requested and cheapest date pairs
+    """
+    return await get_flight_price_calendar().search(origin, destination, departure_date, return_date, flex_days)
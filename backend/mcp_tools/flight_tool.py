@@ -1,30 +1,10 @@
 """
 Amadeus Flight Search Tool
 """
-import os
-import httpx
 from typing import Dict, List, Optional
 from datetime import datetime
-
-async def get_amadeus_token() -> str:
-    """Get Amadeus API access token"""
-    api_key = os.getenv("AMADEUS_API_KEY")
-    api_secret = os.getenv("AMADEUS_API_SECRET")
-
-    if not api_key or not api_secret:
-        raise ValueError("Amadeus API credentials not configured")
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://test.api.amadeus.com/v1/security/oauth2/token",
-            data={
-                "grant_type": "client_credentials",
-                "client_id": api_key,
-                "client_secret": api_secret
-            }
-        )
-        response.raise_for_status()
-        return response.json()["access_token"]
+from utils.http_client import http_client, http_timeout
+from .amadeus_auth import amadeus_get
 
 async def search_flights(
     origin: str,
@@ -55,8 +35,6 @@ async def search_flights(
         if len(destination) != 3 or not destination.isalpha():
             raise ValueError(f"Invalid destination airport code: '{destination}'. Must be a 3-letter IATA code (e.g., 'CDG', 'NRT'). Use city airport codes, not country names.")
         
-        token = await get_amadeus_token()
-
         params = {
             "originLocationCode": origin.upper(),
             "destinationLocationCode": destination.upper(),
@@ -69,12 +47,12 @@ async def search_flights(
         if return_date:
             params["returnDate"] = return_date
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        async with http_client("amadeus") as client:
+            response = await amadeus_get(
+                client,
                 "https://test.api.amadeus.com/v2/shopping/flight-offers",
-                headers={"Authorization": f"Bearer {token}"},
                 params=params,
-                timeout=30.0
+                timeout=http_timeout(30.0)
             )
             response.raise_for_status()
             data = response.json()
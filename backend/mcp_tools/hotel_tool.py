@@ -1,42 +1,27 @@
 """
 Amadeus Hotel Search Tool
 """
+import asyncio
 import os
-import httpx
+import random
 from typing import Dict, List, Optional
+import httpx
+from utils.deadline import get_deadline
+from utils.http_client import http_client, http_timeout
+from .amadeus_auth import amadeus_get
 
-async def get_amadeus_token() -> str:
-    """Get Amadeus API access token"""
-    api_key = os.getenv("AMADEUS_API_KEY")
-    api_secret = os.getenv("AMADEUS_API_SECRET")
-
-    if not api_key or not api_secret:
-        raise ValueError("Amadeus API credentials not configured")
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://test.api.amadeus.com/v1/security/oauth2/token",
-            data={
-                "grant_type": "client_credentials",
-                "client_id": api_key,
-                "client_secret": api_secret
-            }
-        )
-        response.raise_for_status()
-        return response.json()["access_token"]
-
-async def get_city_code(location: str, token: str) -> Optional[str]:
+async def get_city_code(location: str) -> Optional[str]:
     """Get IATA city code for a location"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        async with http_client("amadeus") as client:
+            response = await amadeus_get(
+                client,
                 "https://test.api.amadeus.com/v1/reference-data/locations",
-                headers={"Authorization": f"Bearer {token}"},
                 params={
                     "keyword": location,
                     "subType": "CITY"
                 },
-                timeout=15.0
+                timeout=http_timeout(15.0)
             )
             response.raise_for_status()
             data = response.json()
@@ -47,6 +32,115 @@ async def get_city_code(location: str, token: str) -> Optional[str]:
     except:
         return None
 
+HOTEL_OFFERS_URL = "https://test.api.amadeus.com/v3/shopping/hotel-offers"
+
+# Hotels normalized into the result; offer fetching stops once this many have offers
+HOTEL_OFFERS_WANTED = 5
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a 429: Retry-After if given, else jittered exponential backoff"""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    return 0.5 * 2 ** attempt * random.uniform(0.5, 1.5)
+
+async def _fetch_offer_batch(
+    client: httpx.AsyncClient,
+    slots: asyncio.Semaphore,
+    hotel_ids: List[str],
+    check_in_date: str,
+    check_out_date: str,
+    max_retries: int
+) -> List[Dict]:
+    """Offers for a batch of hotel IDs, retrying rate-limited calls"""
+    label = hotel_ids[0] if len(hotel_ids) == 1 else f"{hotel_ids[0]} +{len(hotel_ids) - 1}"
+    try:
+        for attempt in range(max_retries + 1):
+            async with slots:
+                response = await amadeus_get(
+                    client,
+                    HOTEL_OFFERS_URL,
+                    params={
+                        "hotelIds": ",".join(hotel_ids),
+                        "checkInDate": check_in_date,
+                        "checkOutDate": check_out_date,
+                        "adults": 1,
+                        "currency": "SGD",
+                        "bestRateOnly": True
+                    },
+                    timeout=http_timeout(15.0)
+                )
+            if response.status_code != 429 or attempt == max_retries:
+                break
+            # Back off outside the semaphore so other batches keep going
+            delay = _retry_delay(response, attempt)
+            deadline = get_deadline()
+            if deadline is not None and deadline.remaining() < delay:
+                break
+            print(f"  ⚠️ Hotels {label}: Rate limit - retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        if response.status_code == 200:
+            data = response.json().get("data", [])
+            print(f"  {'✅' if data else '⚠️'} Hotels {label}: {len(data)} with offers")
+            return data
+        if response.status_code == 400 and len(hotel_ids) > 1:
+            # An invalid or unbookable ID can fail the whole batch; retry the IDs one by one
+            print(f"  ⚠️ Hotels {label}: Batch rejected - retrying individually")
+            results = await asyncio.gather(*[
+                _fetch_offer_batch(client, slots, [hotel_id], check_in_date, check_out_date, max_retries)
+                for hotel_id in hotel_ids
+            ])
+            return [hotel for result in results for hotel in result]
+
+        error_data = response.json() if response.text else {}
+        error_msg = error_data.get("errors", [{}])[0].get("detail", "Unknown error") if error_data.get("errors") else response.text[:100]
+        print(f"  ❌ Hotels {label}: {response.status_code} - {error_msg}")
+    except Exception as e:
+        print(f"  ❌ Hotels {label}: {str(e)[:80]}")
+    return []
+
+async def fetch_hotel_offers(
+    client: httpx.AsyncClient,
+    hotel_ids: List[str],
+    check_in_date: str,
+    check_out_date: str
+) -> List[Dict]:
+    """
+    Fetch offers for many hotels concurrently
+
+    IDs are sent HOTEL_OFFERS_BATCH_SIZE per request, with at most
+    HOTEL_OFFERS_MAX_CONCURRENT requests in flight. 429s are retried up
+    to HOTEL_OFFERS_MAX_RETRIES times with jittered backoff. Once
+    HOTEL_OFFERS_WANTED hotels have offers the remaining requests are
+    cancelled.
+
+    Returns:
+        Hotels with offers, in the order of `hotel_ids`
+    """
+    batch_size = max(1, int(os.getenv("HOTEL_OFFERS_BATCH_SIZE", "5")))
+    slots = asyncio.Semaphore(int(os.getenv("HOTEL_OFFERS_MAX_CONCURRENT", "3")))
+    max_retries = int(os.getenv("HOTEL_OFFERS_MAX_RETRIES", "2"))
+
+    batches = [hotel_ids[i:i + batch_size] for i in range(0, len(hotel_ids), batch_size)]
+    tasks = [
+        asyncio.ensure_future(_fetch_offer_batch(client, slots, batch, check_in_date, check_out_date, max_retries))
+        for batch in batches
+    ]
+    hotels = []
+    try:
+        for finished in asyncio.as_completed(tasks):
+            hotels.extend(await finished)
+            if len(hotels) >= HOTEL_OFFERS_WANTED:
+                print(f"  ⚡ {len(hotels)} hotels with offers - skipping remaining requests")
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    order = {hotel_id: i for i, hotel_id in enumerate(hotel_ids)}
+    return sorted(hotels, key=lambda hotel: order.get(hotel.get("hotel", {}).get("hotelId"), len(order)))
+
 async def search_hotels(
     location: str,
     check_in_date: str,
@@ -64,32 +158,30 @@ async def search_hotels(
         Simplified hotel area data with price ranges
     """
     try:
-        token = await get_amadeus_token()
-        
         # If already a 3-letter code, use it directly
         if len(location) == 3 and location.isalpha():
             city_code = location.upper()
             print(f"🏨 Using city code directly: {city_code}")
         else:
             # Try to resolve via Amadeus API
-            city_code = await get_city_code(location, token)
+            city_code = await get_city_code(location)
             if not city_code:
                 raise ValueError(f"Could not find city code for {location}")
             print(f"🏨 Resolved '{location}' to city code: {city_code}")
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("amadeus") as client:
             # Step 1: Get hotel IDs for the city
             print(f"🔍 Searching for hotels in city: {city_code}")
-            hotels_response = await client.get(
+            hotels_response = await amadeus_get(
+                client,
                 "https://test.api.amadeus.com/v1/reference-data/locations/hotels/by-city",
-                headers={"Authorization": f"Bearer {token}"},
                 params={
                     "cityCode": city_code,
                     "radius": 1,
                     "radiusUnit": "KM",
                     "hotelSource": "ALL"
                 },
-                timeout=30.0
+                timeout=http_timeout(30.0)
             )
             hotels_response.raise_for_status()
             hotels_data = hotels_response.json()
@@ -99,45 +191,11 @@ async def search_hotels(
             if not hotel_ids:
                 raise ValueError(f"No hotels found in {city_code}")
             
-            print(f"✅ Found {len(hotel_ids)} hotels, fetching offers (one at a time)...")
-            
-            # Step 2: Get offers for each hotel individually
-            # API only accepts one hotelId at a time
-            all_hotel_data = []
-            for i, hotel_id in enumerate(hotel_ids, 1):
-                try:
-                    response = await client.get(
-                        "https://test.api.amadeus.com/v3/shopping/hotel-offers",
-                        headers={"Authorization": f"Bearer {token}"},
-                        params={
-                            "hotelIds": hotel_id,
-                            "checkInDate": check_in_date,
-                            "checkOutDate": check_out_date,
-                            "adults": 1,
-                            "currency": "SGD",
-                            "bestRateOnly": True
-                        },
-                        timeout=15.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("data"):
-                            all_hotel_data.extend(data["data"])
-                            print(f"  ✅ Hotel {i}/{len(hotel_ids)}: Found offers")
-                        else:
-                            print(f"  ⚠️ Hotel {i}/{len(hotel_ids)}: No offers available")
-                    elif response.status_code == 429:
-                        print(f"  ⚠️ Hotel {i}/{len(hotel_ids)}: Rate limit - stopping search")
-                        break  # Stop on rate limit
-                    else:
-                        error_data = response.json() if response.text else {}
-                        error_msg = error_data.get("errors", [{}])[0].get("detail", "Unknown error") if error_data.get("errors") else response.text[:100]
-                        print(f"  ❌ Hotel {i}/{len(hotel_ids)}: {response.status_code} - {error_msg}")
-                except Exception as e:
-                    print(f"  ❌ Hotel {i}/{len(hotel_ids)}: {str(e)[:80]}")
-                    continue
-            
+            print(f"✅ Found {len(hotel_ids)} hotels, fetching offers...")
+
+            # Step 2: Get offers, several hotels per request and several requests at a time
+            all_hotel_data = await fetch_hotel_offers(client, hotel_ids, check_in_date, check_out_date)
+
             print(f"📊 Total hotels with offers: {len(all_hotel_data)}")
 
         # Normalize response
@@ -2,8 +2,8 @@
 Google Places API Search Tool
 """
 import os
-import httpx
 from typing import Dict, List, Optional
+from utils.http_client import http_client, http_timeout
 
 async def search_places(
     destination: str,
@@ -27,41 +27,40 @@ async def search_places(
         if not api_key:
             raise ValueError("Google Places API key not configured")
 
-        # First, geocode the destination
-        async with httpx.AsyncClient() as client:
+        # Geocode the destination, then search around it on the same pooled connection
+        async with http_client("google_maps") as client:
             geocode_response = await client.get(
                 "https://maps.googleapis.com/maps/api/geocode/json",
                 params={
                     "address": destination,
                     "key": api_key
                 },
-                timeout=15.0
+                timeout=http_timeout(15.0)
             )
             geocode_response.raise_for_status()
             geocode_data = geocode_response.json()
 
-        if not geocode_data.get("results"):
-            raise ValueError(f"Could not geocode destination: {destination}")
+            if not geocode_data.get("results"):
+                raise ValueError(f"Could not geocode destination: {destination}")
 
-        location = geocode_data["results"][0]["geometry"]["location"]
+            location = geocode_data["results"][0]["geometry"]["location"]
 
-        # Search for places
-        search_params = {
-            "location": f"{location['lat']},{location['lng']}",
-            "radius": 5000,  # 5km radius
-            "key": api_key
-        }
+            # Search for places
+            search_params = {
+                "location": f"{location['lat']},{location['lng']}",
+                "radius": 5000,  # 5km radius
+                "key": api_key
+            }
 
-        if category:
-            search_params["type"] = category
-        if keyword:
-            search_params["keyword"] = keyword
+            if category:
+                search_params["type"] = category
+            if keyword:
+                search_params["keyword"] = keyword
 
-        async with httpx.AsyncClient() as client:
             places_response = await client.get(
                 "https://maps.googleapis.com/maps/api/place/nearbysearch/json",
                 params=search_params,
-                timeout=15.0
+                timeout=http_timeout(15.0)
             )
             places_response.raise_for_status()
             places_data = places_response.json()
@@ -0,0 +1,243 @@
+"""
+Tool Output Projection
+Compacts MCP tool results before they are fed into an LLM prompt:
+keeps the top-K records, drops fields no agent uses and renders
+compact pipe-separated tables
+"""
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with crewai/litellm
+    tiktoken = None
+
+
+class ToolProjection:
+    """How to compact one tool's result"""
+
+    def __init__(
+        self,
+        records_key: str,
+        columns: List[str],
+        rank: Optional[Callable[[Dict[str, Any]], float]] = None,
+        summary_keys: Optional[List[str]] = None,
+        top_k: Optional[int] = None
+    ):
+        self.records_key = records_key
+        self.columns = columns
+        self.rank = rank
+        self.summary_keys = summary_keys or []
+        self.top_k = top_k
+
+
+def _place_rank(place: Dict[str, Any]) -> float:
+    # Rating weighted by review volume so a 5.0 with 3 reviews doesn't win
+    return (place.get("rating") or 0) * math.log10((place.get("user_ratings_total") or 0) + 10)
+
+# Projection per tool, keyed by the prefetch result name
+TOOL_PROJECTIONS: Dict[str, ToolProjection] = {
+    "flights": ToolProjection(
+        records_key="flights",
+        columns=["price", "currency", "duration", "segments", "one_way"],
+        rank=lambda flight: -(flight.get("price") or 0),
+        summary_keys=["origin", "destination", "departure_date", "return_date", "price_range", "note", "error"]
+    ),
+    "hotels": ToolProjection(
+        records_key="hotels",
+        columns=["name", "rating", "price_per_night", "total_price", "currency", "area"],
+        summary_keys=["city_code", "check_in_date", "check_out_date", "price_range", "note", "error"]
+    ),
+    "places": ToolProjection(
+        records_key="attractions",
+        columns=["name", "rating", "vicinity", "coordinates.lat", "coordinates.lng"],
+        rank=_place_rank,
+        summary_keys=["category", "total_found", "note", "error"]
+    ),
+    "budget": ToolProjection(
+        records_key="budget_tiers",
+        columns=["tier", "daily_total", "meals", "transport", "accommodation", "activities", "airport_transfer"],
+        summary_keys=["location", "currency", "note", "error"]
+    )
+}
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken's cl100k_base, or a chars/4 estimate if unavailable"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base") if tiktoken else None
+        except Exception:
+            # Encoding files are downloaded on first use; fall back when offline
+            _encoding = None
+    return _encoding
+
+
+def _cell(record: Dict[str, Any], column: str) -> str:
+    value: Any = record
+    for part in column.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value).replace("|", "/").replace("\n", " ")
+
+def _table(records: List[Dict[str, Any]], columns: List[str]) -> str:
+    lines = [" | ".join(columns)]
+    lines.extend(" | ".join(_cell(record, column) for column in columns) for record in records)
+    return "\n".join(lines)
+
+def _summary(result: Dict[str, Any], keys: List[str]) -> str:
+    parts = []
+    for key in keys:
+        value = result.get(key)
+        if value in (None, "", {}):
+            continue
+        if isinstance(value, dict):
+            value = ", ".join(f"{k}={_cell(value, k)}" for k in value)
+        parts.append(f"{key}: {value}")
+    return "; ".join(parts)
+
+def _calendar_grid(result: Dict[str, Any]) -> str:
+    """Render a flight price calendar as a departure x return table of minimum prices"""
+    def day(date: Optional[str]) -> str:
+        return date[5:] if date else "one-way"
+
+    def price(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:g}"
+
+    summary = _summary(result, ["origin", "destination", "currency", "requested", "cheapest", "error"])
+    lines = [f"price calendar (min price per date pair, - = unknown) - {summary}"]
+    lines.append(" | ".join(["dep/ret"] + [day(date) for date in result.get("return_dates") or [None]]))
+    lines.extend(
+        " | ".join([day(date)] + [price(value) for value in row])
+        for date, row in zip(result.get("departure_dates", []), result.get("grid", []))
+    )
+    return "\n".join(lines)
+
+
+class ToolProjectionStats:
+    """Per-tool token counts before and after projection"""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, tokens_before: int, tokens_after: int):
+        with self._lock:
+            totals = self._totals.setdefault(tool, {"calls": 0, "tokens_before": 0, "tokens_after": 0})
+            totals["calls"] += 1
+            totals["tokens_before"] += tokens_before
+            totals["tokens_after"] += tokens_after
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tool: {
+                    **totals,
+                    "reduction": round(1 - totals["tokens_after"] / totals["tokens_before"], 3)
+                    if totals["tokens_before"] else 0.0
+                }
+                for tool, totals in self._totals.items()
+            }
+
+
+class ToolOutputProjector:
+    """
+    Turns raw MCP tool results into compact prompt text.
+
+    Records are ranked, cut to `top_k` and rendered as one table per
+    result with a one-line summary of the scalar fields agents use. When
+    disabled, results are passed through as indented JSON as before.
+    """
+
+    def __init__(self, enabled: bool = True, top_k: int = 8):
+        self.enabled = enabled
+        self.top_k = top_k
+        self._token_stats = ToolProjectionStats()
+
+    def project_result(self, tool: str, result: Dict[str, Any]) -> str:
+        """Compact a single tool result (one search call)"""
+        spec = TOOL_PROJECTIONS[tool]
+        records = result.get(spec.records_key) or []
+        if isinstance(records, dict):
+            # Budget tiers are keyed by tier name
+            records = [{"tier": name, **values} for name, values in records.items()]
+        total = len(records)
+        if spec.rank is not None:
+            records = sorted(records, key=spec.rank, reverse=True)
+        records = records[:spec.top_k or self.top_k]
+
+        header = f"{spec.records_key} ({len(records)} of {total})"
+        summary = _summary(result, spec.summary_keys)
+        if summary:
+            header = f"{header} - {summary}"
+        return f"{header}\n{_table(records, spec.columns)}"
+
+    def project(self, tool: str, result: Any) -> str:
+        """
+        Render a tool result for a prompt, logging token counts before and after
+
+        `result` is one tool result, or for "places" a dict of results keyed
+        by category as produced by the orchestrator's prefetch.
+        """
+        raw = json.dumps(result, indent=2, default=str)
+        if not self.enabled or (tool not in TOOL_PROJECTIONS and tool != "flight_calendar") or not isinstance(result, dict):
+            return raw
+
+        if tool == "flight_calendar":
+            text = _calendar_grid(result)
+        elif tool == "places" and TOOL_PROJECTIONS[tool].records_key not in result:
+            text = "\n\n".join(
+                f"[{category}] {self.project_result(tool, category_result)}"
+                for category, category_result in result.items()
+            )
+        else:
+            text = self.project_result(tool, result)
+
+        before, after = count_tokens(raw), count_tokens(text)
+        self._token_stats.record(tool, before, after)
+        print(f"   📉 {tool} tool output: {before} → {after} tokens")
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "top_k": self.top_k,
+            "tools": self._token_stats.stats()
+        }
+
+
+# Singleton instance
+_projector: Optional[ToolOutputProjector] = None
+
+def get_tool_projector() -> ToolOutputProjector:
+    """Get or create the process-wide tool output projector"""
+    global _projector
+    if _projector is None:
+        _projector = ToolOutputProjector(
+            enabled=os.getenv("TOOL_PROJECTION_ENABLED", "true").lower() == "true",
+            top_k=int(os.getenv("TOOL_PROJECTION_TOP_K", "8"))
+        )
+    return _projector
+
+def project_tool_result(tool: str, result: Any) -> str:
+    """Compact a tool result for an LLM prompt with the shared projector"""
+    return get_tool_projector().project(tool, result)
@@ -18,6 +18,18 @@ class TripType(str, Enum):
     FAMILY = "family"
     FRIENDS = "friends"
 
+class PlanMode(str, Enum):
+    """Planning depth"""
+    FULL = "full"
+    LITE = "lite"
+
+class PlanJobStatus(str, Enum):
+    """Planning job lifecycle states"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class TravelPlanRequest(BaseModel):
     """Request model for /plan endpoint"""
     destination: str = Field(..., description="Destination city or country")
@@ -42,6 +54,29 @@ class TravelPlanRequest(BaseModel):
             }
         }
 
+class TravelPlanUpdate(BaseModel):
+    """Request model for PATCH /plan/{plan_id}: only the fields being changed"""
+    destination: Optional[str] = Field(None, description="Destination city or country")
+    origin: Optional[str] = Field(None, description="Origin city/airport code")
+    departure_date: Optional[str] = Field(None, description="Specific departure date (YYYY-MM-DD)")
+    return_date: Optional[str] = Field(None, description="Specific return date (YYYY-MM-DD)")
+    budget_level: Optional[BudgetLevel] = Field(None, description="Budget level")
+    interests: Optional[List[str]] = Field(None, description="User interests")
+    trip_type: Optional[TripType] = Field(None, description="Type of trip")
+    duration_days: Optional[int] = Field(None, description="Trip duration in days")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "interests": ["food", "nightlife"],
+                "duration_days": 5
+            }
+        }
+
+class PlanBatchRequest(BaseModel):
+    """Request model for /plan/batch endpoint"""
+    requests: List[TravelPlanRequest] = Field(..., min_length=1, description="Plan requests, answered in completion order")
+
 class FlightOption(BaseModel):
     """Flight option model"""
     price: float
@@ -50,6 +85,13 @@ class FlightOption(BaseModel):
     segments: int
     one_way: bool
 
+class CheaperDates(BaseModel):
+    """Date pair from the flight price calendar cheaper than the requested dates"""
+    departure_date: str
+    return_date: Optional[str] = None
+    price: float
+    savings: Optional[float] = None
+
 class HotelOption(BaseModel):
     """Hotel option model"""
     name: str
@@ -79,6 +121,47 @@ class BudgetEstimate(BaseModel):
     accommodation: float
     airport_transfer: Optional[float] = None
 
+class SeasonalitySection(BaseModel):
+    """Streamed seasonality section"""
+    best_dates: str
+    weather_summary: str
+
+class FlightsSection(BaseModel):
+    """Streamed flights section"""
+    flight_options: List[FlightOption]
+    cheaper_dates: Optional[List[CheaperDates]] = None
+
+class HotelsSection(BaseModel):
+    """Streamed hotels section"""
+    hotel_options: List[HotelOption]
+
+class BudgetSection(BaseModel):
+    """Streamed budget section"""
+    budget_estimate: Dict[str, BudgetEstimate]
+
+class AttractionsSection(BaseModel):
+    """Streamed attractions section"""
+    attractions: Dict[str, List[Attraction]]
+
+class ItinerarySection(BaseModel):
+    """Streamed itinerary section"""
+    itinerary: str
+
+class TipsSection(BaseModel):
+    """Streamed tips section"""
+    tips: Dict[str, Any]
+
+# SSE event name -> payload model for /plan/stream
+PLAN_SECTION_MODELS = {
+    "seasonality": SeasonalitySection,
+    "flights": FlightsSection,
+    "hotels": HotelsSection,
+    "budget": BudgetSection,
+    "attractions": AttractionsSection,
+    "itinerary": ItinerarySection,
+    "tips": TipsSection
+}
+
 class TravelPlanResponse(BaseModel):
     """Response model for /plan endpoint"""
     destination: str
@@ -86,12 +169,33 @@ class TravelPlanResponse(BaseModel):
     best_dates: str
     weather_summary: str
     flight_options: List[FlightOption]
+    cheaper_dates: Optional[List[CheaperDates]] = Field(
+        None,
+        description="Cheaper nearby departure/return dates from the flight price calendar (FLIGHT_CALENDAR_FLEX_DAYS)"
+    )
     hotel_options: List[HotelOption]
     budget_estimate: Dict[str, BudgetEstimate]
     attractions: Dict[str, List[Attraction]]
     itinerary: str
     tips: Dict[str, Any]
     execution_time: Optional[float] = None
+    agent_timings: Optional[Dict[str, Any]] = Field(None, description="Per-agent timings and critical path")
+    cache_status: Optional[str] = Field(None, description="Plan cache outcome: hit, stale, similar, miss, bypass or coalesced")
+    similarity: Optional[float] = Field(
+        None,
+        description="Estimated similarity to the cached request whose plan was served (cache_status similar)"
+    )
+    mode: Optional[PlanMode] = Field(None, description="full (multi-agent crew) or lite (single-call preview)")
+    degraded_sections: Optional[Dict[str, str]] = Field(
+        None,
+        description="Sections not finished before the deadline and the source used instead: "
+                    "plan_cache, agent_cache, tool_results, tool_fallback, outline or default"
+    )
+    plan_id: Optional[str] = Field(None, description="Id for PATCH /plan/{plan_id} (full plans only)")
+    recomputed_sections: Optional[List[str]] = Field(
+        None,
+        description="Sections rerun by PATCH /plan/{plan_id}; all others were reused from the stored plan"
+    )
 
     class Config:
         json_schema_extra = {
@@ -146,3 +250,13 @@ class TravelPlanResponse(BaseModel):
                 }
             }
         }
+
+class PlanJobResponse(BaseModel):
+    """Response model for /plan/jobs endpoints"""
+    job_id: str
+    status: PlanJobStatus
+    destination: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
+    result: Optional[TravelPlanResponse] = None
+    error: Optional[str] = None
@@ -1,11 +1,56 @@
 """Orchestrator package"""
 from .orchestrator_agent import TravelPlanningOrchestrator
 from .crew import create_travel_planning_crew
-from .llm_config import get_llm_for_crewai, get_simple_llm
+from .context import PlanningContext
+from .dag import DagNode, PlanningDag
+from .plan_cache import PlanCache, get_plan_cache, canonicalize_request, request_cache_key
+from .plan_similarity import PlanSimilarityIndex, get_plan_similarity
+from .plan_store import PlanStore, PlanNotFoundError, get_plan_store
+from .batch import BatchToolMemo, PlanBatchStats, get_batch_stats
+from .singleflight import SingleFlight, get_plan_singleflight
+from .agent_cache import AgentOutputCache, get_agent_cache
+from .agent_pool import AgentPool, get_agent_pool
+from .structured_output import OutputParseStats, get_output_parse_stats, parse_agent_output
+from .jobs import PlanJobStore, get_job_store
+from .worker_pool import PlanningWorkerPool, PlanningCapacityError, get_planning_pool
+from .agent_usage import AgentUsageStats, get_agent_usage
+from .llm_config import get_llm_for_crewai, get_simple_llm, get_agent_model_routing
 
 __all__ = [
     "TravelPlanningOrchestrator",
     "create_travel_planning_crew",
+    "PlanningContext",
+    "DagNode",
+    "PlanningDag",
+    "PlanningWorkerPool",
+    "PlanningCapacityError",
+    "get_planning_pool",
+    "PlanCache",
+    "get_plan_cache",
+    "canonicalize_request",
+    "request_cache_key",
+    "PlanSimilarityIndex",
+    "get_plan_similarity",
+    "PlanStore",
+    "PlanNotFoundError",
+    "get_plan_store",
+    "BatchToolMemo",
+    "PlanBatchStats",
+    "get_batch_stats",
+    "SingleFlight",
+    "get_plan_singleflight",
+    "AgentOutputCache",
+    "get_agent_cache",
+    "AgentPool",
+    "get_agent_pool",
+    "OutputParseStats",
+    "get_output_parse_stats",
+    "parse_agent_output",
+    "PlanJobStore",
+    "get_job_store",
+    "AgentUsageStats",
+    "get_agent_usage",
     "get_llm_for_crewai",
-    "get_simple_llm"
+    "get_simple_llm",
+    "get_agent_model_routing"
 ]
@@ -0,0 +1,117 @@
+"""
+Persistent per-agent output cache
+SQLite store of raw agent outputs for agents whose result depends only on
+a few request fields (e.g. seasonality, tips), versioned by prompt hash
+"""
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.env import get_optional_env
+
+
+def prompt_hash(*sources: Any) -> str:
+    """Hash the source of the modules/functions that build an agent's prompt"""
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(inspect.getsource(source).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class AgentOutputCache:
+    """
+    On-disk cache of agent outputs keyed by (agent, inputs, prompt version).
+
+    Entries older than `ttl_seconds` are ignored and overwritten. Changing
+    an agent's prompt changes its prompt hash, so old entries stop matching.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 2592000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS agent_outputs (
+                    agent TEXT NOT NULL,
+                    input_key TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (agent, input_key, prompt_hash)
+                )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call keeps this safe across executor threads
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    @staticmethod
+    def _input_key(inputs: Dict[str, Any]) -> str:
+        canonical = json.dumps(inputs, sort_keys=True)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, agent: str, inputs: Dict[str, Any], version: str, allow_expired: bool = False) -> Optional[str]:
+        """Return the cached raw output, or None if missing (or expired, unless allow_expired)"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT output, created_at FROM agent_outputs "
+                    "WHERE agent = ? AND input_key = ? AND prompt_hash = ?",
+                    (agent, self._input_key(inputs), version)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️  Agent cache read failed: {str(e)}")
+            row = None
+
+        if row is None or (not allow_expired and time.time() - row[1] > self.ttl_seconds):
+            self.misses[agent] = self.misses.get(agent, 0) + 1
+            return None
+
+        self.hits[agent] = self.hits.get(agent, 0) + 1
+        return row[0]
+
+    def set(self, agent: str, inputs: Dict[str, Any], version: str, output: str):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO agent_outputs "
+                    "(agent, input_key, prompt_hash, output, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (agent, self._input_key(inputs), version, output, time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️  Agent cache write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses)
+        }
+
+
+# Singleton instance
+_agent_cache: Optional[AgentOutputCache] = None
+
+def get_agent_cache() -> AgentOutputCache:
+    """Get or create the process-wide agent output cache"""
+    global _agent_cache
+    if _agent_cache is None:
+        default_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            ".cache", "agent_outputs.sqlite3"
+        )
+        _agent_cache = AgentOutputCache(
+            path=get_optional_env("AGENT_CACHE_PATH", default_path),
+            ttl_seconds=int(get_optional_env("AGENT_CACHE_TTL_SECONDS", "2592000"))
+        )
+    return _agent_cache
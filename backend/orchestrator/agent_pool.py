@@ -0,0 +1,138 @@
+"""
+Reusable pool of pre-built CrewAI agents
+Agents carry identical roles, backstories and tools across requests, so
+per-request crews lease them from here instead of rebuilding all seven
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from crewai import Agent
+from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+
+from .agent_usage import MeteredLLM
+
+from agents import (
+    create_seasonality_agent,
+    create_flight_agent,
+    create_hotel_agent,
+    create_budget_agent,
+    create_attractions_agent,
+    create_itinerary_agent,
+    create_tips_agent
+)
+
+# Agent factories by DAG node name
+AGENT_FACTORIES: Dict[str, Callable[..., Agent]] = {
+    "seasonality": create_seasonality_agent,
+    "flights": create_flight_agent,
+    "hotels": create_hotel_agent,
+    "budget": create_budget_agent,
+    "attractions": create_attractions_agent,
+    "itinerary": create_itinerary_agent,
+    "tips": create_tips_agent
+}
+
+# Agents whose factory accepts use_tools
+TOOL_AGENTS = {"flights", "hotels", "budget", "attractions"}
+
+
+class AgentPool:
+    """
+    Thread-safe pool of idle agents keyed by (name, model, use_tools).
+
+    An agent is leased by exactly one running task at a time, since CrewAI
+    agents hold per-execution state (executor, tool results, token usage).
+    That state is reset when the agent is returned.
+    """
+
+    def __init__(self, max_idle_per_key: int = 8):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Tuple[str, str, bool], List[Agent]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(name: str, llm: Any, use_tools: bool) -> Tuple[str, str, bool]:
+        return (name, str(llm), use_tools)
+
+    def _build(self, name: str, llm: Any, use_tools: bool) -> Agent:
+        factory = AGENT_FACTORIES[name]
+        if isinstance(llm, str):
+            # Each agent gets its own LLM so token usage is counted per agent
+            llm = MeteredLLM(model=llm)
+        if name in TOOL_AGENTS:
+            return factory(llm, use_tools=use_tools)
+        return factory(llm)
+
+    @staticmethod
+    def _reset(agent: Agent):
+        """Clear per-execution state so the next lease starts clean"""
+        agent.tools_results = []
+        agent.agent_executor = None
+        agent.crew = None
+        agent._times_executed = 0
+        agent._token_process = TokenProcess()
+        if isinstance(agent.llm, MeteredLLM):
+            agent.llm.reset_usage()
+
+    def acquire(self, name: str, llm: Any, use_tools: bool = True) -> Agent:
+        key = self._key(name, llm, use_tools)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop()
+            self.created += 1
+        return self._build(name, llm, use_tools)
+
+    def release(self, name: str, llm: Any, use_tools: bool, agent: Agent):
+        self._reset(agent)
+        key = self._key(name, llm, use_tools)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append(agent)
+
+    @contextmanager
+    def lease(self, name: str, llm: Any, use_tools: bool = True):
+        """Borrow an agent for the duration of one task"""
+        agent = self.acquire(name, llm, use_tools)
+        try:
+            yield agent
+        finally:
+            self.release(name, llm, use_tools, agent)
+
+    def warm(self, llm: Any, use_tools: bool = True, agent_models: Optional[Dict[str, Any]] = None):
+        """
+        Pre-build one idle agent per node so the first request pays nothing
+
+        `use_tools` only applies to TOOL_AGENTS; the others are warmed under
+        the default key the crew leases them with.
+        """
+        for name in AGENT_FACTORIES:
+            model = (agent_models or {}).get(name, llm)
+            key_tools = use_tools if name in TOOL_AGENTS else True
+            self.release(name, model, key_tools, self.acquire(name, model, key_tools))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = sum(len(agents) for agents in self._idle.values())
+        return {
+            "idle": idle,
+            "created": self.created,
+            "reused": self.reused,
+            "max_idle_per_key": self.max_idle_per_key
+        }
+
+
+# Singleton instance
+_agent_pool: Optional[AgentPool] = None
+
+def get_agent_pool() -> AgentPool:
+    """Get or create the process-wide agent pool"""
+    global _agent_pool
+    if _agent_pool is None:
+        _agent_pool = AgentPool()
+    return _agent_pool
@@ -0,0 +1,193 @@
+"""
+Per-agent latency and cost report
+Aggregates each agent run's model, wall time and token usage so the
+model routing table can be tuned
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+import litellm
+from crewai import LLM
+
+from utils.deadline import get_deadline
+from utils.hedging import get_llm_hedger
+from utils.completion_cache import NON_KEY_PARAMS, completion_key, get_completion_cache
+
+# Per-call timeout for agent LLM calls when the model has none configured
+DEFAULT_LLM_TIMEOUT = 120.0
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """USD cost of a run from LiteLLM's price table, or None for unknown models"""
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+class MeteredLLM(LLM):
+    """
+    CrewAI LLM that counts the tokens of its own calls.
+
+    CrewAI reports usage through a process-global LiteLLM callback, which
+    misattributes tokens when agents run concurrently. Pooled agents each
+    own a MeteredLLM and are leased exclusively, so these counters are
+    exact per agent run. Calls made under a request deadline have their
+    timeout capped to the time left, and calls are hedged to a backup
+    model when LLM hedging is enabled. Identical calls are served from the
+    completion cache without counting any tokens.
+    """
+
+    def __init__(self, model: str, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.base_timeout = self.timeout
+        self.reset_usage()
+
+    def reset_usage(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.requests = 0
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        cache = get_completion_cache()
+        # Keyed on everything sent to the provider, so agents with different stop words or output formats don't share
+        request = {
+            name: value for name, value in self._completion_params(messages, self.model).items()
+            if name not in NON_KEY_PARAMS
+        }
+        key = completion_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        deadline = get_deadline()
+        if deadline is None:
+            self.timeout = self.base_timeout
+        else:
+            self.timeout = deadline.timeout(self.base_timeout or DEFAULT_LLM_TIMEOUT)
+        if get_llm_hedger().enabled:
+            if callbacks:
+                self.set_callbacks(callbacks)
+            output = self._hedged_call(messages)
+        else:
+            output = super().call(messages, callbacks)
+        self.requests += 1
+        try:
+            self.prompt_tokens += litellm.token_counter(model=self.model, messages=messages)
+            self.completion_tokens += litellm.token_counter(model=self.model, text=output or "")
+        except Exception as e:
+            print(f"⚠️  Token count failed for {self.model}: {str(e)}")
+        if output:
+            cache.set(key, self.model, request, output)
+        return output
+
+    def _completion_params(self, messages: List[Dict[str, str]], model: str) -> Dict[str, Any]:
+        """The LiteLLM arguments CrewAI's LLM.call would send, for `model`"""
+        params = {
+            "model": model,
+            "messages": messages,
+            "timeout": self.timeout,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "n": self.n,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "presence_penalty": self.presence_penalty,
+            "frequency_penalty": self.frequency_penalty,
+            "logit_bias": self.logit_bias,
+            "response_format": self.response_format,
+            "seed": self.seed,
+            "logprobs": self.logprobs,
+            "top_logprobs": self.top_logprobs,
+            "api_base": self.base_url,
+            "api_version": self.api_version,
+            "api_key": self.api_key,
+            "stream": False,
+            **self.kwargs
+        }
+        return {key: value for key, value in params.items() if value is not None}
+
+    def _hedged_call(self, messages: List[Dict[str, str]]) -> str:
+        # Async completions so the losing request can actually be cancelled;
+        # agents run in executor threads, so they go through the hedger's shared loop
+        async def complete(model: str) -> str:
+            response = await litellm.acompletion(**self._completion_params(messages, model))
+            return response["choices"][0]["message"]["content"]
+
+        return get_llm_hedger().run_sync(self.model, complete)
+
+
+class AgentUsageStats:
+    """Running totals of latency, tokens and cost per (agent, model)"""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        agent: str,
+        model: str,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        requests: int = 0
+    ) -> Optional[float]:
+        """Record one agent run and return its estimated cost"""
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            totals = self._totals.setdefault(agent, {}).setdefault(model, {
+                "runs": 0,
+                "llm_requests": 0,
+                "latency_total": 0.0,
+                "latency_max": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "unpriced_runs": 0
+            })
+            totals["runs"] += 1
+            totals["llm_requests"] += requests
+            totals["latency_total"] += latency
+            totals["latency_max"] = max(totals["latency_max"], latency)
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            if cost is None:
+                totals["unpriced_runs"] += 1
+            else:
+                totals["cost_usd"] += cost
+        return cost
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            report = {}
+            for agent, models in self._totals.items():
+                report[agent] = {
+                    model: {
+                        "runs": totals["runs"],
+                        "llm_requests": totals["llm_requests"],
+                        "avg_latency": round(totals["latency_total"] / totals["runs"], 2),
+                        "max_latency": round(totals["latency_max"], 2),
+                        "prompt_tokens": totals["prompt_tokens"],
+                        "completion_tokens": totals["completion_tokens"],
+                        "cost_usd": round(totals["cost_usd"], 5),
+                        "avg_cost_usd": round(totals["cost_usd"] / totals["runs"], 5),
+                        "unpriced_runs": totals["unpriced_runs"]
+                    }
+                    for model, totals in models.items()
+                }
+            return report
+
+
+# Singleton instance
+_agent_usage: Optional[AgentUsageStats] = None
+
+def get_agent_usage() -> AgentUsageStats:
+    """Get or create the process-wide agent usage report"""
+    global _agent_usage
+    if _agent_usage is None:
+        _agent_usage = AgentUsageStats()
+    return _agent_usage
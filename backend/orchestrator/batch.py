@@ -0,0 +1,157 @@
+"""
+Batch planning support
+Deduplicates code resolution and MCP tool calls shared by the requests of
+one batch, and keeps running totals for GET /metrics
+"""
+import asyncio
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+
+class BatchToolMemo:
+    """
+    Results of code resolutions and tool calls for the lifetime of a batch.
+
+    The first request to make a call runs it; requests that make the same
+    call while it is in flight await it, and later ones reuse its result.
+    Failed tool calls - exceptions and results with success False (the
+    tools' fallback data) - are forgotten so the next request retries them.
+    Every caller gets its own copy of the result.
+    """
+
+    def __init__(self):
+        self._tools: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._codes: Dict[Tuple[str, str], Tuple[Optional[str], Optional[ValueError]]] = {}
+        self._lock = threading.Lock()
+        self.requested: Dict[str, int] = {}
+        self.executed: Dict[str, int] = {}
+
+    def _count(self, name: str, executed: bool):
+        with self._lock:
+            self.requested[name] = self.requested.get(name, 0) + 1
+            if executed:
+                self.executed[name] = self.executed.get(name, 0) + 1
+
+    async def call(self, name: str, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await `fn(*args, **kwargs)`, sharing one execution per distinct call (compared case-insensitively)"""
+        key = (name, json.dumps([args, kwargs], sort_keys=True, default=str).lower())
+        task = self._tools.get(key)
+        self._count(name, task is None)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tools[key] = task
+
+            def forget_failure(done: asyncio.Task):
+                failed = done.cancelled() or done.exception() is not None
+                if failed or (isinstance(done.result(), dict) and done.result().get("success") is False):
+                    self._tools.pop(key, None)
+
+            task.add_done_callback(forget_failure)
+        # Shielded so one request being cancelled doesn't cancel the call for the others
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def resolve(self, fn: Callable[[str], str], value: str) -> str:
+        """Call a code resolver once per distinct value (ignoring case); its ValueError is remembered too"""
+        key = (fn.__name__, value.lower().strip())
+        with self._lock:
+            cached = self._codes.get(key)
+        self._count(fn.__name__, cached is None)
+        if cached is None:
+            try:
+                cached = (fn(value), None)
+            except ValueError as e:
+                cached = (None, e)
+            with self._lock:
+                self._codes[key] = cached
+        code, error = cached
+        if error is not None:
+            raise error
+        return code
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "requested": requested,
+                    "executed": self.executed.get(name, 0),
+                    "deduplicated": requested - self.executed.get(name, 0)
+                }
+                for name, requested in self.requested.items()
+            }
+
+
+_current_memo: ContextVar[Optional[BatchToolMemo]] = ContextVar("batch_tool_memo", default=None)
+
+@contextmanager
+def batch_tool_scope(memo: BatchToolMemo) -> Iterator[BatchToolMemo]:
+    """Share `memo` with every plan started (as a task) inside the block"""
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
+async def call_tool(name: str, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """Call an MCP tool, deduplicated across the current batch if there is one"""
+    memo = _current_memo.get()
+    if memo is None:
+        return await fn(*args, **kwargs)
+    return await memo.call(name, fn, *args, **kwargs)
+
+def resolve_code(fn: Callable[[str], str], value: str) -> str:
+    """Resolve an airport/city code, deduplicated across the current batch if there is one"""
+    memo = _current_memo.get()
+    if memo is None:
+        return fn(value)
+    return memo.resolve(fn, value)
+
+
+class PlanBatchStats:
+    """Running totals over all batches: requests, outcomes and tool calls saved"""
+
+    def __init__(self):
+        self.batches = 0
+        self.requests = 0
+        self.completed = 0
+        self.failed = 0
+        self.tool_calls_requested = 0
+        self.tool_calls_executed = 0
+        self._lock = threading.Lock()
+
+    def record(self, completed: int, failed: int, memo: BatchToolMemo):
+        tools = memo.stats()
+        with self._lock:
+            self.batches += 1
+            self.requests += completed + failed
+            self.completed += completed
+            self.failed += failed
+            self.tool_calls_requested += sum(tool["requested"] for tool in tools.values())
+            self.tool_calls_executed += sum(tool["executed"] for tool in tools.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requested = self.tool_calls_requested
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "completed": self.completed,
+                "failed": self.failed,
+                "tool_calls_requested": requested,
+                "tool_calls_executed": self.tool_calls_executed,
+                "tool_dedup_rate": round(1 - self.tool_calls_executed / requested, 3) if requested else 0.0
+            }
+
+
+# Singleton instance
+_batch_stats: Optional[PlanBatchStats] = None
+
+def get_batch_stats() -> PlanBatchStats:
+    """Get or create the process-wide batch planning stats"""
+    global _batch_stats
+    if _batch_stats is None:
+        _batch_stats = PlanBatchStats()
+    return _batch_stats
@@ -0,0 +1,69 @@
+"""
+Per-request planning context
+Carries one plan's inputs, intermediate outputs and timings so the
+orchestrator itself holds no per-request mutable state
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+
+class PlanningContext:
+    """
+    Everything a single planning run reads and produces.
+
+    A fresh context is created for every execution, so concurrent plans
+    never share inputs, agent outputs or timings.
+    """
+
+    def __init__(self, request_data: Dict[str, Any]):
+        # Copy so resolved codes added during planning never leak to the caller
+        self.request_data = dict(request_data)
+        self.started_at = datetime.now()
+
+        self.destination: str = self.request_data["destination"]
+        self.origin: str = self.request_data.get("origin", "SIN")
+        self.departure_date: str = self.request_data.get("departure_date", "2026-06-01")
+        self.duration_days: int = self.request_data.get("duration_days", 7)
+
+        # Infer travel month from departure date
+        dep_date = datetime.strptime(self.departure_date, "%Y-%m-%d")
+        self.travel_month = dep_date.strftime("%B")
+
+        # Calculate return date if not provided
+        self.return_date_calculated = not self.request_data.get("return_date")
+        self.return_date: str = self.request_data.get("return_date") or (
+            dep_date + timedelta(days=self.duration_days)
+        ).strftime("%Y-%m-%d")
+
+        # Filled in as planning progresses
+        self.tool_results: Optional[Dict[str, Any]] = None
+        self.prefetch_time: Optional[float] = None
+        self.outputs: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.critical_path: List[str] = []
+
+        # Sections not produced before the deadline: fields used instead and their source
+        self.unfinished: List[str] = []
+        self.fallback_sections: Dict[str, Dict[str, Any]] = {}
+        self.degraded: Dict[str, str] = {}
+
+    def set_resolved_codes(self, origin_code: str, dest_airport_code: str, dest_city_code: str):
+        """Record resolved IATA codes for agents and tools to use"""
+        self.request_data["origin_code"] = origin_code
+        self.request_data["dest_airport_code"] = dest_airport_code
+        self.request_data["dest_city_code"] = dest_city_code
+
+    @property
+    def origin_code(self) -> str:
+        return self.request_data.get("origin_code", self.origin)
+
+    @property
+    def dest_airport_code(self) -> str:
+        return self.request_data.get("dest_airport_code", self.destination)
+
+    @property
+    def dest_city_code(self) -> str:
+        return self.request_data.get("dest_city_code", self.destination)
+
+    def elapsed(self) -> float:
+        return (datetime.now() - self.started_at).total_seconds()
@@ -1,101 +1,452 @@
 """
 Crew configuration and management
-Single Crew workflow for all travel planning agents
+Dependency-graph workflow for all travel planning agents
 """
-from crewai import Crew, Process
-from typing import Dict, Any
+from crewai import Agent, Crew, Process, Task
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Any, Iterable, List, Optional
 from datetime import datetime, timedelta
+import contextvars
+import time
 
 from agents import (
-    create_seasonality_agent, create_seasonality_task,
-    create_flight_agent, create_flight_task,
-    create_hotel_agent, create_hotel_task,
-    create_budget_agent, create_budget_task,
-    create_attractions_agent, create_attractions_task,
-    create_itinerary_agent, create_itinerary_task,
-    create_tips_agent, create_tips_task
+    create_seasonality_agent, create_seasonality_task, SeasonalityOutput,
+    create_flight_task,
+    create_hotel_task,
+    create_budget_task,
+    create_attractions_task,
+    create_itinerary_task, create_itinerary_outline_task, create_itinerary_day_task,
+    complete_itinerary_outline, merge_itinerary, ItineraryOutline,
+    create_tips_agent, create_tips_task, TravelTipsOutput
 )
+from .dag import DagNode, PlanningDag
+from .agent_cache import get_agent_cache, prompt_hash
+from .agent_pool import get_agent_pool
+from .agent_usage import MeteredLLM, get_agent_usage
+from .worker_pool import get_planning_pool
+from .structured_output import parse_agent_output, record_agent_output, get_output_parse_stats
+from utils.deadline import DeadlineExceeded
+
+# Prompt versions for agents whose outputs are cached on disk
+AGENT_PROMPT_VERSIONS = {
+    "seasonality": prompt_hash(create_seasonality_agent, create_seasonality_task, SeasonalityOutput),
+    "tips": prompt_hash(create_tips_agent, create_tips_task, TravelTipsOutput)
+}
+
+# Shorter trips are written in a single itinerary call
+PARALLEL_ITINERARY_MIN_DAYS = 3
+
+# Upstream agents whose outputs each agent's task is built from
+AGENT_DEPENDENCIES = {
+    "seasonality": [],
+    "flights": [],
+    "hotels": [],
+    "budget": ["flights", "hotels"],
+    "attractions": [],
+    "itinerary": ["seasonality", "hotels", "attractions"],
+    "tips": []
+}
+
+def agent_inputs(request_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Request values that go into each agent's task prompt
+
+    The return date is the effective one (derived from departure date and
+    duration when not given), so a new duration invalidates flights and
+    hotels as well as budget and itinerary.
+    """
+    departure_date = request_data.get("departure_date") or "2025-06-01"
+    dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
+    duration_days = request_data.get("duration_days") or 7
+    return_date = request_data.get("return_date") or (dep_date + timedelta(days=duration_days)).strftime("%Y-%m-%d")
+    destination = request_data["destination"]
+    interests = list(request_data.get("interests") or [])
+    trip_type = getattr(request_data.get("trip_type", "solo"), "value", request_data.get("trip_type", "solo"))
+    budget_level = getattr(request_data.get("budget_level", "moderate"), "value", request_data.get("budget_level", "moderate"))
+
+    return {
+        "seasonality": {"destination": destination, "travel_month": dep_date.strftime("%B")},
+        "flights": {
+            "origin": request_data.get("origin") or "SIN", "destination": destination,
+            "departure_date": departure_date, "return_date": return_date
+        },
+        "hotels": {"destination": destination, "departure_date": departure_date, "return_date": return_date},
+        "budget": {"destination": destination, "duration_days": duration_days},
+        "attractions": {"destination": destination, "interests": interests},
+        "itinerary": {
+            "destination": destination, "duration_days": duration_days, "budget_level": budget_level,
+            "interests": interests, "trip_type": trip_type
+        },
+        "tips": {"destination": destination, "trip_type": trip_type}
+    }
+
+def invalidated_agents(
+    previous: Dict[str, Any],
+    current: Dict[str, Any],
+    missing: Iterable[str] = ()
+) -> List[str]:
+    """
+    Agents to rerun when a request changes from `previous` to `current`
+
+    An agent is invalidated when any of its own inputs changed, when its
+    previous output is `missing`, or when an agent it depends on is
+    invalidated. Returned in AGENT_DEPENDENCIES order.
+    """
+    before, after = agent_inputs(previous), agent_inputs(current)
+    stale = {name for name in AGENT_DEPENDENCIES if before[name] != after[name]}
+    stale.update(missing)
+    # Dependencies are listed before their dependents, so one pass propagates
+    for name, depends_on in AGENT_DEPENDENCIES.items():
+        if stale.intersection(depends_on):
+            stale.add(name)
+    return [name for name in AGENT_DEPENDENCIES if name in stale]
+
+def agent_cache_inputs(request_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Agent cache inputs for the destination-only agents (seasonality, tips)"""
+    destination = " ".join(request_data["destination"].lower().split())
+    dep_date = datetime.strptime(request_data.get("departure_date", "2025-06-01"), "%Y-%m-%d")
+    trip_type = request_data.get("trip_type", "solo")
+    return {
+        "seasonality": {"destination": destination, "travel_month": dep_date.strftime("%B")},
+        "tips": {"destination": destination, "trip_type": getattr(trip_type, "value", trip_type)}
+    }
+
+def cached_agent_output(name: str, request_data: Dict[str, Any], allow_expired: bool = False) -> Optional[str]:
+    """Look up a destination-only agent's cached output for a request"""
+    return get_agent_cache().get(
+        name, agent_cache_inputs(request_data)[name], AGENT_PROMPT_VERSIONS[name], allow_expired
+    )
+
+def run_agent_task(agent: Agent, task: Task, name: str) -> str:
+    """Run a single task with its agent, record its latency/cost and return the raw output text"""
+    crew = Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=True
+    )
+    llm = agent.llm
+    before = (llm.prompt_tokens, llm.completion_tokens, llm.requests) if isinstance(llm, MeteredLLM) else (0, 0, 0)
+    start = time.perf_counter()
+    output = str(crew.kickoff())
+    latency = time.perf_counter() - start
+
+    if isinstance(llm, MeteredLLM):
+        prompt_tokens = llm.prompt_tokens - before[0]
+        completion_tokens = llm.completion_tokens - before[1]
+        requests = llm.requests - before[2]
+    else:
+        # CrewAI's own counters; approximate when agents run concurrently
+        usage = crew.usage_metrics
+        prompt_tokens = usage.prompt_tokens if usage else 0
+        completion_tokens = usage.completion_tokens if usage else 0
+        requests = usage.successful_requests if usage else 0
+
+    model = getattr(llm, "model", str(llm))
+    cost = get_agent_usage().record(name, model, latency, prompt_tokens, completion_tokens, requests)
+    print(f"   💰 {name} on {model}: {latency:.1f}s, {prompt_tokens + completion_tokens} tokens, "
+          f"${cost if cost is not None else 0:.4f}")
+    return output
+
+def run_itinerary_by_day(
+    llm,
+    destination: str,
+    duration_days: int,
+    attractions_data: Dict[str, Any],
+    weather_data: Dict[str, Any],
+    hotel_data: Dict[str, Any],
+    budget_level: str,
+    interests: List[str],
+    trip_type: str,
+    concurrency: int
+) -> str:
+    """
+    Write the itinerary as a day-theme outline plus one task per day
+
+    The outline call is short, and the days are written concurrently (up
+    to `concurrency` at once, each by its own leased itinerary agent, on
+    the planning pool's shared itinerary executor), so no single
+    completion has to hold the whole trip. With `concurrency` at least the
+    trip length (the default sizes it to the executor) every day is
+    written in one wave and latency stays roughly flat as trips get
+    longer; a smaller value trades latency for fewer concurrent LLM calls. The Markdown is assembled by
+    merge_itinerary; a day that fails is written out from its outline.
+    """
+    agent_pool = get_agent_pool()
+    with agent_pool.lease("itinerary", llm) as agent:
+        output = run_agent_task(
+            agent,
+            create_itinerary_outline_task(
+                agent, destination, duration_days, attractions_data, weather_data, hotel_data,
+                budget_level, interests, trip_type
+            ),
+            "itinerary_outline"
+        )
+    outline, status = parse_agent_output("itinerary_outline", output, schema=ItineraryOutline)
+    get_output_parse_stats().record("itinerary_outline", status)
+    days = complete_itinerary_outline(outline, destination, duration_days, attractions_data)
+    print(f"   🗓️  Itinerary outline {status}; writing {duration_days} days, {min(concurrency, duration_days)} at a time")
+
+    def write_day(day: Dict[str, Any]) -> str:
+        with agent_pool.lease("itinerary", llm) as day_agent:
+            return run_agent_task(
+                day_agent,
+                create_itinerary_day_task(
+                    day_agent, destination, duration_days, day, days, weather_data,
+                    budget_level, interests, trip_type
+                ),
+                "itinerary_day"
+            )
+
+    # Days run on the planning pool's shared itinerary executor, at most `concurrency` of this plan's at a time
+    pool = get_planning_pool()
+    sections: Dict[int, Optional[str]] = {}
+    pending = list(days)
+    running: Dict[Future, int] = {}
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                day = pending.pop(0)
+                # Copy the context so each day's thread sees the request deadline
+                running[pool.submit_itinerary_day(contextvars.copy_context().run, write_day, day)] = day["day"]
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                day_number = running.pop(future)
+                try:
+                    sections[day_number] = future.result()
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    print(f"⚠️  Itinerary day {day_number} failed, using its outline: {str(e)}")
+    finally:
+        for future in running:
+            future.cancel()
+
+    return merge_itinerary(destination, duration_days, outline, days, sections)
+
+def tracked(name: str, run: Callable[[Dict[str, Any]], str]) -> Callable[[Dict[str, Any]], str]:
+    """Wrap a node's run function to record its output's parse outcome"""
+    def run_and_record(upstream: Dict[str, Any]) -> str:
+        output = run(upstream)
+        record_agent_output(name, output)
+        return output
+
+    return run_and_record
+
+def cached_agent_node(
+    name: str,
+    inputs: Dict[str, Any],
+    run: Callable[[Dict[str, Any]], str]
+) -> DagNode:
+    """
+    Build a DAG node that serves the agent's output from the on-disk cache
+
+    On a hit the agent is skipped entirely; on a miss it runs and its
+    output is stored if anything in it validates against the output schema.
+    """
+    cache = get_agent_cache()
+    version = AGENT_PROMPT_VERSIONS[name]
+    cached = cache.get(name, inputs, version)
+    if cached is not None:
+        print(f"⚡ Using cached {name} output for {inputs}")
+        return DagNode(name, lambda upstream: cached)
+
+    def run_and_store(upstream: Dict[str, Any]) -> str:
+        output = run(upstream)
+        if record_agent_output(name, output) != "failed":
+            cache.set(name, inputs, version, output)
+        return output
+
+    return DagNode(name, run_and_store)
 
 def create_travel_planning_crew(
     llm,
-    request_data: Dict[str, Any]
-) -> Crew:
+    request_data: Dict[str, Any],
+    tool_results: Optional[Dict[str, Any]] = None,
+    agent_models: Optional[Dict[str, str]] = None,
+    reuse_outputs: Optional[Dict[str, str]] = None,
+    itinerary_day_concurrency: int = 0,
+    flight_flex_days: int = 0
+) -> PlanningDag:
     """
-    Create a single CrewAI crew with all travel planning agents and tasks
-    
-    Agents have access to MCP tools and will call them as needed.
+    Create the travel planning workflow as a dependency graph of agent tasks
+
+    Seasonality, flights, hotels, attractions and tips have no data
+    dependency on each other and run concurrently. Budget starts once
+    flights and hotels are done; itinerary once seasonality, hotels and
+    attractions are done, so both receive real upstream data.
+
+    Seasonality and tips depend only on destination plus travel month or
+    trip type, so their outputs are reused from the on-disk agent cache.
+    Agents themselves are leased from the shared AgentPool; only the
+    request-specific tasks are built per request. Each agent runs on the
+    model routed to it in agent_models (see get_agent_model_routing).
+
+    Agents have access to MCP tools and will call them as needed, unless
+    tool_results are supplied: then the pre-fetched results are embedded in
+    the task prompts and agents are built without tools, so each makes a
+    single summarization call.
 
     Args:
         llm: Language model instance
         request_data: User request with destination, preferences, etc.
+        tool_results: Optional pre-fetched MCP tool results
+            ("flights", "hotels", "places", "budget")
+        agent_models: Optional agent name -> model routing; agents not
+            listed use llm
+        reuse_outputs: Optional raw outputs from a previous plan, keyed by
+            agent name; those agents are not run and their stored output
+            is passed to dependents as-is
+        itinerary_day_concurrency: Write trips of PARALLEL_ITINERARY_MIN_DAYS
+            or more as an outline plus this many concurrent per-day tasks
+            (see run_itinerary_by_day); 0 writes the itinerary in one task
+        flight_flex_days: Have the flight agent suggest cheaper dates within
+            this many days of the requested ones, from the pre-fetched
+            "flight_calendar" result or its price calendar tool; 0 = off
 
     Returns:
-        Configured Crew instance with all tasks
+        PlanningDag whose node outputs are the raw agent outputs
     """
-    
+
     # Extract request data
     destination = request_data["destination"]
     origin = request_data.get("origin", "SIN")
     departure_date = request_data.get("departure_date", "2025-06-01")
     duration_days = request_data.get("duration_days", 7)
-    
+
     # Get resolved codes from orchestrator (already validated)
     origin_code = request_data.get("origin_code", origin)
     dest_airport_code = request_data.get("dest_airport_code", destination)
     dest_city_code = request_data.get("dest_city_code", destination)
-    
+
     # Infer travel month from departure date
     dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
     travel_month = dep_date.strftime("%B")
-    
+
     # Calculate return date if not provided
     return_date = request_data.get("return_date")
     if not return_date:
         ret_date = dep_date + timedelta(days=duration_days)
         return_date = ret_date.strftime("%Y-%m-%d")
-    
+
     budget_level = request_data.get("budget_level", "moderate")
     interests = request_data.get("interests", [])
     trip_type = request_data.get("trip_type", "solo")
 
-    # Create all agents (they have tools= parameter to call MCP functions)
-    seasonality_agent = create_seasonality_agent(llm)
-    flight_agent = create_flight_agent(llm)
-    hotel_agent = create_hotel_agent(llm)
-    budget_agent = create_budget_agent(llm)
-    attractions_agent = create_attractions_agent(llm)
-    itinerary_agent = create_itinerary_agent(llm)
-    tips_agent = create_tips_agent(llm)
-
-    # Create all tasks - agents will call their tools during execution
-    tasks = [
-        create_seasonality_task(seasonality_agent, destination, travel_month),
-        create_flight_task(flight_agent, origin_code, dest_airport_code, departure_date, return_date),
-        create_hotel_task(hotel_agent, dest_city_code, departure_date, return_date),
-        create_budget_task(budget_agent, destination, {}, {}, duration_days),
-        create_attractions_task(attractions_agent, destination, interests),
-        create_itinerary_task(
-            itinerary_agent, destination, duration_days, {}, {}, {}, 
-            budget_level, interests, trip_type
-        ),
-        create_tips_task(tips_agent, destination, trip_type)
-    ]
-
-    # Create crew with all 7 agents working sequentially
-    crew = Crew(
-        agents=[
-            seasonality_agent,
-            flight_agent,
-            hotel_agent,
-            budget_agent,
-            attractions_agent,
-            itinerary_agent,
-            tips_agent
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        full_output=True
-    )
+    # Cache keys for destination-only agents
+    cache_inputs = agent_cache_inputs(request_data)
+
+    # Agents are leased from the shared pool (they have tools= parameter to call MCP functions)
+    agent_pool = get_agent_pool()
+    prefetched = tool_results or {}
+    use_tools = tool_results is None
+    agent_models = agent_models or {}
+
+    # Independent tasks - agents will call their tools during execution
+    def run_seasonality(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("seasonality", agent_models.get("seasonality", llm)) as agent:
+            return run_agent_task(
+                agent,
+                create_seasonality_task(agent, destination, travel_month),
+                "seasonality"
+            )
+
+    def run_flights(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("flights", agent_models.get("flights", llm), use_tools) as agent:
+            return run_agent_task(
+                agent,
+                create_flight_task(
+                    agent, origin_code, dest_airport_code, departure_date, return_date,
+                    flight_results=prefetched.get("flights"),
+                    price_calendar=prefetched.get("flight_calendar"),
+                    flex_days=flight_flex_days
+                ),
+                "flights"
+            )
+
+    def run_hotels(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("hotels", agent_models.get("hotels", llm), use_tools) as agent:
+            return run_agent_task(
+                agent,
+                create_hotel_task(
+                    agent, dest_city_code, departure_date, return_date,
+                    hotel_results=prefetched.get("hotels")
+                ),
+                "hotels"
+            )
+
+    def run_attractions(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("attractions", agent_models.get("attractions", llm), use_tools) as agent:
+            return run_agent_task(
+                agent,
+                create_attractions_task(
+                    agent, destination, interests,
+                    places_results=prefetched.get("places")
+                ),
+                "attractions"
+            )
+
+    def run_tips(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("tips", agent_models.get("tips", llm)) as agent:
+            return run_agent_task(
+                agent,
+                create_tips_task(agent, destination, trip_type),
+                "tips"
+            )
+
+    # Dependent tasks - built once upstream outputs are available
+    def run_budget(upstream: Dict[str, Any]) -> str:
+        with agent_pool.lease("budget", agent_models.get("budget", llm), use_tools) as agent:
+            return run_agent_task(
+                agent,
+                create_budget_task(
+                    agent, destination,
+                    parse_agent_output("flights", upstream["flights"])[0],
+                    parse_agent_output("hotels", upstream["hotels"])[0],
+                    duration_days,
+                    budget_results=prefetched.get("budget")
+                ),
+                "budget"
+            )
+
+    def run_itinerary(upstream: Dict[str, Any]) -> str:
+        itinerary_llm = agent_models.get("itinerary", llm)
+        attractions_data = parse_agent_output("attractions", upstream["attractions"])[0]
+        weather_data = parse_agent_output("seasonality", upstream["seasonality"])[0]
+        hotel_data = parse_agent_output("hotels", upstream["hotels"])[0]
+        if itinerary_day_concurrency > 0 and duration_days >= PARALLEL_ITINERARY_MIN_DAYS:
+            return run_itinerary_by_day(
+                itinerary_llm, destination, duration_days, attractions_data, weather_data, hotel_data,
+                budget_level, interests, trip_type, itinerary_day_concurrency
+            )
+
+        with agent_pool.lease("itinerary", itinerary_llm) as agent:
+            return run_agent_task(
+                agent,
+                create_itinerary_task(
+                    agent, destination, duration_days,
+                    attractions_data, weather_data, hotel_data,
+                    budget_level, interests, trip_type
+                ),
+                "itinerary"
+            )
+
+    reuse_outputs = reuse_outputs or {}
+
+    def node(name: str, run: Callable[[Dict[str, Any]], str]) -> DagNode:
+        if name in reuse_outputs:
+            output = reuse_outputs[name]
+            return DagNode(name, lambda upstream: output, depends_on=AGENT_DEPENDENCIES[name])
+        if name in AGENT_PROMPT_VERSIONS:
+            return cached_agent_node(name, cache_inputs[name], run)
+        return DagNode(name, tracked(name, run), depends_on=AGENT_DEPENDENCIES[name])
 
-    return crew
+    return PlanningDag([
+        node("seasonality", run_seasonality),
+        node("flights", run_flights),
+        node("hotels", run_hotels),
+        node("budget", run_budget),
+        node("attractions", run_attractions),
+        node("itinerary", run_itinerary),
+        node("tips", run_tips)
+    ])
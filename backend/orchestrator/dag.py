@@ -0,0 +1,219 @@
+"""
+Dependency-graph (DAG) executor for the planning crew
+Runs independent agent tasks concurrently and starts dependent tasks
+as soon as all of their upstream outputs are available
+"""
+import asyncio
+import contextvars
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import litellm
+
+from utils.deadline import Deadline, DeadlineExceeded
+
+# Calls made for a node cap their timeouts to the time left, so near the
+# deadline these fire instead of DeadlineExceeded
+TIMEOUT_ERRORS = (DeadlineExceeded, TimeoutError, asyncio.TimeoutError, httpx.TimeoutException, litellm.Timeout)
+
+# Slack for timers that fire a moment before the deadline's own clock says it passed
+DEADLINE_GRACE_SECONDS = 0.1
+
+
+class DagNode:
+    """
+    A single unit of work in the planning graph
+
+    Args:
+        name: Unique node name (e.g. "flights")
+        run: Blocking callable receiving a dict of upstream outputs keyed by node name
+        depends_on: Names of nodes whose outputs this node needs
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Any],
+        depends_on: Optional[List[str]] = None
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = list(depends_on or [])
+
+
+class PlanningDag:
+    """
+    Executes DagNodes in dependency order with maximum concurrency.
+
+    Each node's blocking callable is run in an executor thread, so the
+    event loop stays free while agents and their tools are working.
+    """
+
+    def __init__(self, nodes: List[DagNode]):
+        self.nodes: Dict[str, DagNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate DAG node: {node.name}")
+            self.nodes[node.name] = node
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Return node names in dependency order, raising on unknown deps or cycles"""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"DAG node '{node.name}' depends on unknown node '{dep}'")
+
+        order: List[str] = []
+        visiting = set()
+        visited = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected in DAG at node '{name}'")
+            visiting.add(name)
+            for dep in self.nodes[name].depends_on:
+                visit(dep)
+            visiting.remove(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    async def execute(
+        self,
+        executor: Optional[Executor] = None,
+        on_node_complete: Optional[Callable[[str, Any], None]] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        Run all nodes, each as soon as its dependencies have finished
+
+        With a deadline, nodes still running when it passes (or that hit it
+        themselves, or whose dependencies did) are reported as unfinished
+        instead of failing the run. A node counts as having hit it if it
+        raises once the deadline has passed, or raises a timeout within
+        DEADLINE_GRACE_SECONDS of it. Their executor threads cannot be
+        interrupted, but their results are discarded.
+
+        Args:
+            executor: Executor for the blocking node callables (default loop executor)
+            on_node_complete: Optional callback invoked with (name, output) per node
+            deadline: Optional deadline after which unfinished nodes are abandoned
+
+        Returns:
+            Dict with "outputs" and "timings" keyed by node name (finished
+            nodes only), the "unfinished" node names, the "critical_path"
+            and total "wall_time"
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        timings: Dict[str, Dict[str, float]] = {}
+        futures: Dict[str, asyncio.Future] = {}
+        unfinished = set()
+
+        def hit_deadline(error: Exception) -> bool:
+            if isinstance(error, DeadlineExceeded):
+                return True
+            if deadline is None:
+                return False
+            return deadline.expired or (
+                isinstance(error, TIMEOUT_ERRORS) and deadline.remaining() <= DEADLINE_GRACE_SECONDS
+            )
+
+        async def run_node(node: DagNode) -> Any:
+            upstream = {}
+            for dep in node.depends_on:
+                upstream[dep] = await futures[dep]
+            if unfinished.intersection(node.depends_on):
+                unfinished.add(node.name)
+                return None
+
+            node_start = time.perf_counter()
+            # Copy the context so the node's thread sees the request deadline
+            context = contextvars.copy_context()
+            try:
+                output = await loop.run_in_executor(executor, context.run, node.run, upstream)
+            except Exception as e:
+                if not hit_deadline(e):
+                    raise
+                print(f"   ⏰ {node.name} hit the deadline ({type(e).__name__})")
+                unfinished.add(node.name)
+                return None
+            node_end = time.perf_counter()
+
+            timings[node.name] = {
+                "start": round(node_start - started, 3),
+                "end": round(node_end - started, 3),
+                "duration": round(node_end - node_start, 3)
+            }
+            print(f"   ⏱️  {node.name} finished in {timings[node.name]['duration']:.1f}s "
+                  f"(t={timings[node.name]['end']:.1f}s)")
+
+            if on_node_complete is not None:
+                on_node_complete(node.name, output)
+            return output
+
+        for name in self.order:
+            futures[name] = asyncio.ensure_future(run_node(self.nodes[name]))
+
+        try:
+            done, pending = await asyncio.wait(
+                futures.values(),
+                timeout=deadline.remaining() if deadline is not None else None,
+                return_when=asyncio.FIRST_EXCEPTION
+            )
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+
+        for name, future in futures.items():
+            if not future.done():
+                print(f"   ⏰ {name} unfinished at the deadline")
+                future.cancel()
+                unfinished.add(name)
+
+        return {
+            "outputs": {
+                name: future.result()
+                for name, future in futures.items()
+                if name not in unfinished
+            },
+            "unfinished": [name for name in self.order if name in unfinished],
+            "timings": timings,
+            "critical_path": self.critical_path(timings),
+            "wall_time": round(time.perf_counter() - started, 3)
+        }
+
+    def critical_path(self, timings: Dict[str, Dict[str, float]]) -> List[str]:
+        """
+        Reconstruct the chain of nodes that determined total wall time
+
+        Starts from the node that finished last and walks back through the
+        dependency that finished latest at each step.
+        """
+        if not timings:
+            return []
+
+        current = max(timings, key=lambda name: timings[name]["end"])
+        path = [current]
+        while True:
+            deps = [dep for dep in self.nodes[current].depends_on if dep in timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: timings[name]["end"])
+            path.append(current)
+
+        path.reverse()
+        return path
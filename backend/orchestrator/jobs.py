@@ -0,0 +1,148 @@
+"""
+Asynchronous planning jobs
+Bounded in-memory job store with TTL eviction of finished results
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.env import get_optional_env
+
+
+class PlanJob:
+    """A single submitted planning job and its eventual result"""
+
+    def __init__(self, request_data: Dict[str, Any]):
+        self.job_id = uuid.uuid4().hex
+        self.request_data = request_data
+        self.status = "pending"
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "destination": self.request_data.get("destination"),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class PlanJobStore:
+    """
+    Keeps planning jobs addressable by id.
+
+    Finished jobs expire `ttl_seconds` after completion. When the store
+    holds `max_jobs` entries, the oldest finished jobs are evicted first;
+    running jobs are never evicted.
+    """
+
+    def __init__(self, max_jobs: int = 1000, ttl_seconds: int = 3600):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, PlanJob]" = OrderedDict()
+
+    def _evict(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        if len(self._jobs) >= self.max_jobs:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+                del self._jobs[job_id]
+                if len(self._jobs) < self.max_jobs:
+                    break
+
+    def submit(
+        self,
+        request_data: Dict[str, Any],
+        runner: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> PlanJob:
+        """
+        Register a job and start running it in the background
+
+        Args:
+            request_data: Planning request payload
+            runner: Coroutine function producing the final plan dict
+
+        Returns:
+            The newly created PlanJob
+        """
+        self._evict()
+        if len(self._jobs) >= self.max_jobs:
+            raise ValueError("Too many planning jobs in progress")
+
+        job = PlanJob(request_data)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, runner))
+        return job
+
+    async def _run(self, job: PlanJob, runner: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        job.status = "running"
+        try:
+            job.result = await runner(job.request_data)
+            job.status = "completed"
+        except Exception as e:
+            print(f"❌ Planning job {job.job_id} failed: {type(e).__name__}: {str(e)}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            job.done.set()
+
+    def get(self, job_id: str) -> Optional[PlanJob]:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[PlanJob]:
+        """Long-poll: return the job once finished or after `timeout` seconds"""
+        job = self.get(job_id)
+        if job is None or job.finished or timeout <= 0:
+            return job
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "stored": len(self._jobs),
+            "max_jobs": self.max_jobs,
+            "ttl_seconds": self.ttl_seconds,
+            "by_status": counts
+        }
+
+
+# Singleton instance
+_job_store: Optional[PlanJobStore] = None
+
+def get_job_store() -> PlanJobStore:
+    """Get or create the process-wide job store"""
+    global _job_store
+    if _job_store is None:
+        _job_store = PlanJobStore(
+            max_jobs=int(get_optional_env("PLAN_JOBS_MAX", "1000")),
+            ttl_seconds=int(get_optional_env("PLAN_JOBS_TTL_SECONDS", "3600"))
+        )
+    return _job_store
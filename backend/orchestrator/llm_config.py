@@ -1,7 +1,23 @@
 """
 LLM configuration for OpenRouter with CrewAI compatibility
 """
+import json
 import os
+from typing import Dict
+
+# Small, fast model for retrieval-style and summarization agents
+FAST_MODEL = "openrouter/openai/gpt-4o-mini"
+
+# Default model per agent; None means the orchestrator's default (large) model
+DEFAULT_AGENT_MODELS = {
+    "seasonality": FAST_MODEL,
+    "flights": FAST_MODEL,
+    "hotels": FAST_MODEL,
+    "budget": FAST_MODEL,
+    "attractions": FAST_MODEL,
+    "itinerary": None,
+    "tips": FAST_MODEL
+}
 
 def get_llm_for_crewai(api_key: str = None, use_claude: bool = False):
     """
@@ -32,6 +48,42 @@ def get_llm_for_crewai(api_key: str = None, use_claude: bool = False):
     else:
         return "openrouter/openai/gpt-4-turbo-preview"
 
+def get_agent_model_routing(default_model: str) -> Dict[str, str]:
+    """
+    Resolve the model each agent runs on
+
+    Starts from DEFAULT_AGENT_MODELS, then applies the JSON file named by
+    AGENT_MODEL_ROUTING_FILE ({"agent": "model", ...}) and finally
+    per-agent env overrides such as AGENT_MODEL_ITINERARY. A value of
+    null/"default" selects `default_model`.
+
+    Args:
+        default_model: Model string used by agents without a routed model
+
+    Returns:
+        Agent name -> LiteLLM model string
+    """
+    routing = dict(DEFAULT_AGENT_MODELS)
+
+    routing_file = os.getenv("AGENT_MODEL_ROUTING_FILE")
+    if routing_file:
+        with open(routing_file) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(routing)
+        if unknown:
+            raise ValueError(f"Unknown agents in {routing_file}: {', '.join(sorted(unknown))}")
+        routing.update(overrides)
+
+    for name in routing:
+        override = os.getenv(f"AGENT_MODEL_{name.upper()}")
+        if override:
+            routing[name] = override
+
+    return {
+        name: default_model if model in (None, "", "default") else model
+        for name, model in routing.items()
+    }
+
 def get_simple_llm(api_key: str = None):
     """
     Get a simpler LLM configuration that bypasses CrewAI's provider detection
@@ -2,29 +2,72 @@
 Master Travel Planning Orchestrator
 Coordinates MCP tools and single Crew workflow
 """
+import copy
 import json
 import asyncio
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import httpx
+from typing import AsyncIterator, Dict, Any, Callable, List, Optional, Set, Tuple
+from datetime import datetime
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from .llm_config import get_llm_for_crewai
-from .crew import create_travel_planning_crew
+from .llm_config import FAST_MODEL, get_llm_for_crewai, get_agent_model_routing
+from .crew import create_travel_planning_crew, cached_agent_output, invalidated_agents
+from .context import PlanningContext
+from .worker_pool import get_planning_pool, PlanningCapacityError
+from .plan_cache import get_plan_cache, request_cache_key, canonicalize_request
+from .plan_similarity import get_plan_similarity
+from .plan_store import get_plan_store, PlanNotFoundError
+from .batch import BatchToolMemo, batch_tool_scope, call_tool, resolve_code, get_batch_stats
+from .singleflight import get_plan_singleflight
+from .agent_pool import get_agent_pool
+from .structured_output import parse_agent_output, get_output_parse_stats
 
 # Import MCP tools
-from mcp_tools import search_flights, search_hotels, search_places, lookup_budget
+from mcp_tools import search_flights, search_flight_price_calendar, search_hotels, search_places, lookup_budget
+from agents import ATTRACTION_CATEGORIES, create_lite_plan_prompt, LitePlanOutput, LITE_PLAN_SYSTEM_PROMPT
+from utils.env import get_optional_env
+from utils.deadline import Deadline, DeadlineExceeded, deadline_scope, get_deadline
+from utils.completion_cache import completion_cache_bypass
+from utils.formatter import categorize_attractions
+from utils.llm import get_llm_client
 
 # Import airport and city code resolvers
 from utils.airport_codes import resolve_airport_code, resolve_city_code
 
+# Agent outputs, in the order they appear in the final response
+PLAN_SECTIONS = ["seasonality", "flights", "hotels", "budget", "attractions", "itinerary", "tips"]
+
+# TravelPlanResponse fields produced by each section
+SECTION_FIELDS = {
+    "seasonality": ["best_dates", "weather_summary"],
+    "flights": ["flight_options", "cheaper_dates"],
+    "hotels": ["hotel_options"],
+    "budget": ["budget_estimate"],
+    "attractions": ["attractions"],
+    "itinerary": ["itinerary"],
+    "tips": ["tips"]
+}
+
+# Options kept per section/category in lite plans
+LITE_TOP_K = 5
+
+# Sections that can fall back to the MCP tool results, and the tool each comes from
+TOOL_SECTIONS = {"flights": "flights", "hotels": "hotels", "budget": "budget", "attractions": "places"}
+
+# Attractions per day in the fallback itinerary outline
+OUTLINE_PLACES_PER_DAY = 3
+
 class TravelPlanningOrchestrator:
     """
     Master orchestrator that manages single Crew workflow.
     Agents have MCP tools and will call them directly during execution.
+
+    Safe to share across concurrent requests: each run keeps its inputs,
+    agent outputs and timings in its own PlanningContext.
     """
 
     def __init__(self, openrouter_api_key: str):
@@ -33,142 +76,763 @@ class TravelPlanningOrchestrator:
         print(f"✅ Using OpenRouter model: {self.llm}")
         print("   Environment configured for OpenRouter routing")
 
-        # Storage for results
-        self.results = {}
+        # Per-agent model routing (small models for simple agents)
+        self.agent_models = get_agent_model_routing(self.llm)
+        for name, model in self.agent_models.items():
+            print(f"   {name}: {model}")
+
+        # Dedicated executor + admission control for blocking crew work
+        self.pool = get_planning_pool()
+
+        # Whole-plan cache and in-progress background refreshes
+        self.plan_cache = get_plan_cache()
+        self._refreshing = {}
+
+        # Near-duplicate requests are served from the most similar cached plan
+        self.plan_similarity = get_plan_similarity()
+
+        # Full plans with their raw agent outputs, for incremental re-planning
+        self.plan_store = get_plan_store()
+
+        # Identical concurrent requests share one execution
+        self.singleflight = get_plan_singleflight()
+
+        # Call all MCP tools up front instead of letting agents loop over them
+        self.prefetch_tools = get_optional_env("TOOL_PREFETCH_ENABLED", "true").lower() == "true"
+
+        # Model and output budget for the single-call lite plan
+        # OpenRouterClient takes OpenRouter model ids, without LiteLLM's "openrouter/" prefix
+        self.lite_model = get_optional_env("LITE_PLAN_MODEL", FAST_MODEL).removeprefix("openrouter/")
+        self.lite_max_tokens = int(get_optional_env("LITE_PLAN_MAX_TOKENS", "2500"))
+
+        # Flight agent also searches departure/return dates this many days either side (0 = off)
+        self.flight_calendar_flex_days = int(get_optional_env("FLIGHT_CALENDAR_FLEX_DAYS", "0"))
+
+        # Plans of one POST /plan/batch run at most this many at a time
+        self.batch_concurrency = int(get_optional_env("PLAN_BATCH_CONCURRENCY", str(self.pool.max_concurrent)))
+
+        # Itineraries are outlined, then written this many days at a time (0 = one call). "auto"
+        # writes every day at once, up to the size of the pool's shared itinerary executor
+        day_concurrency = get_optional_env("ITINERARY_DAY_CONCURRENCY", "auto").lower()
+        self.itinerary_day_concurrency = (
+            self.pool.itinerary_workers if day_concurrency == "auto" else int(day_concurrency)
+        )
+
+        # End-to-end deadline for /plan when the request doesn't set one (0 = none)
+        self.default_deadline = float(get_optional_env("PLAN_DEADLINE_SECONDS", "0")) or None
 
-    async def execute_planning(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Pre-build one agent per role so requests only construct tasks
+        get_agent_pool().warm(self.llm, use_tools=not self.prefetch_tools, agent_models=self.agent_models)
+
+    async def execute_planning(
+        self,
+        request_data: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        read_cache: bool = True,
+        write_cache: bool = True,
+        mode: str = "full",
+        deadline: Optional[float] = None,
+        queue_when_full: bool = False
+    ) -> Dict[str, Any]:
         """
         Execute the complete travel planning workflow
 
+        Serves from the plan cache when possible; stale entries are returned
+        immediately and refreshed in the background. Without an exact match,
+        a cached plan for a near-duplicate request (same destination, origin,
+        trip length, budget and trip type, similar dates and interests) is
+        reused: served as-is if no agent's inputs differ, otherwise with just
+        the invalidated agents rerun.
+        Concurrent requests with
+        the same canonical key share a single execution. Otherwise waits for
+        a slot in the planning pool, raising PlanningCapacityError straight
+        away if the pool's queue is already full (unless queue_when_full).
+
         Args:
             request_data: User request with destination, preferences, etc.
+            on_section: Optional callback invoked with (section name, response fields)
+                as soon as each agent finishes
+            read_cache: Serve from the plan cache if a matching plan exists
+            write_cache: Store the freshly generated plan in the cache
+            mode: "full" runs the agent crew; "lite" makes one consolidated
+                LLM call over the tool results and skips the planning pool
+            deadline: Optional seconds to answer within, counted from now.
+                Agents and tool calls are capped to the time left; sections
+                not finished in time are filled from cache or tool fallback
+                data and listed in degraded_sections. Degraded plans are
+                not cached. Identical requests only share an in-flight run
+                with requests of the same deadline; if that run outlasts
+                this request's deadline it answers from degraded sources.
+            queue_when_full: Wait for a planning slot even if the pool's queue
+                is full, for callers that bound their own concurrency (batches)
 
         Returns:
             Complete travel plan with all outputs
         """
         start_time = datetime.now()
+        request_deadline = Deadline(deadline) if deadline else None
+        cache_key = request_cache_key(request_data)
+        if mode == "lite":
+            cache_key = f"lite:{cache_key}"
+
+        if read_cache:
+            cached, status = self.plan_cache.get(cache_key)
+            if cached is not None:
+                print(f"⚡ Plan cache {status} for {request_data['destination']}")
+                if status == "stale":
+                    self._schedule_refresh(cache_key, request_data, mode)
+                self._replay_sections(cached, on_section)
+                cached["destination"] = request_data["destination"]
+                cached["origin"] = request_data.get("origin", "SIN")
+                cached["execution_time"] = (datetime.now() - start_time).total_seconds()
+                cached["cache_status"] = status
+                return cached
+
+            similar = self._find_similar_plan(request_data, mode)
+            if similar is not None and not similar["recompute"]:
+                cached, similarity = similar["plan"], similar["similarity"]
+                print(f"≈ Serving similar cached plan for {request_data['destination']} (similarity {similarity:.2f})")
+                self._replay_sections(cached, on_section)
+                cached["destination"] = request_data["destination"]
+                cached["origin"] = request_data.get("origin", "SIN")
+                cached["execution_time"] = (datetime.now() - start_time).total_seconds()
+                cached["cache_status"] = "similar"
+                cached["similarity"] = round(similarity, 3)
+                # The outputs were made for the matched request, so later patches diff against it
+                cached["plan_id"] = self.plan_store.fork(cached.get("plan_id"), similar["request"])
+                return cached
+            if similar is not None:
+                print(
+                    f"≈ Reusing similar cached plan for {request_data['destination']} "
+                    f"(similarity {similar['similarity']:.2f}), recomputing {', '.join(similar['recompute'])}"
+                )
+        else:
+            self.plan_cache.bypasses += 1
+            similar = None
+
+        async def run() -> Dict[str, Any]:
+            # A no-cache request should not get cached LLM completions either
+            with deadline_scope(request_deadline), completion_cache_bypass(not read_cache):
+                if mode == "lite":
+                    result = await self._run_lite_planning(request_data, on_section)
+                else:
+                    async with self.pool.admit(reject_when_full=not queue_when_full):
+                        result = await self._run_planning(
+                            request_data, on_section, reuse_outputs=similar["reuse"] if similar else None
+                        )
+            if write_cache and not result.get("degraded_sections"):
+                self.plan_cache.set(cache_key, result)
+                self.plan_similarity.add(cache_key, request_data, mode)
+            return result
+
+        # Only requests with the same deadline share a run: a run without one never comes
+        # back degraded, and a deadline-bound follower stops waiting when its time is up.
+        # A no-cache request only shares with other no-cache requests, whose runs skip cached
+        # LLM completions
+        flight_key = f"{cache_key}|deadline={deadline:g}" if deadline else cache_key
+        if not read_cache:
+            flight_key = f"{flight_key}|no-cache"
+        try:
+            result, shared = await self.singleflight.do(
+                flight_key, run, timeout=request_deadline.remaining() if request_deadline else None
+            )
+        except asyncio.TimeoutError:
+            print(f"⏰ Deadline reached waiting on in-flight plan for {request_data['destination']}")
+            with deadline_scope(request_deadline):
+                result = await self._degraded_plan(request_data, mode, on_section)
+            result["cache_status"] = "coalesced"
+            return result
+        if shared:
+            print(f"🔗 Joined in-flight plan for {request_data['destination']}")
+            result = copy.deepcopy(result)
+            self._replay_sections(result, on_section)
+            result["destination"] = request_data["destination"]
+            result["origin"] = request_data.get("origin", "SIN")
+            result["cache_status"] = "coalesced"
+            return result
+
+        if similar is not None:
+            # Only the agents invalidated by the differences from the matched request were rerun
+            result["cache_status"] = "similar"
+            result["similarity"] = round(similar["similarity"], 3)
+            result["recomputed_sections"] = similar["recompute"]
+            return result
+        result["cache_status"] = "miss" if read_cache else "bypass"
+        return result
+
+    async def execute_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        read_cache: bool = True,
+        write_cache: bool = True,
+        mode: str = "full"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Plan many requests, yielding each result as soon as it is ready
+
+        At most batch_concurrency plans run at once, each through
+        execute_planning (so the plan cache and singleflight still apply).
+        Code resolution and MCP tool calls are shared across the batch:
+        requests with the same origin/destination/dates reuse one call.
+
+        Yields:
+            {"index", "status": "completed", "result"} or
+            {"index", "status": "failed", "error"} per request in completion
+            order, then one {"batch": summary} with counts and tool dedup stats
+        """
+        memo = BatchToolMemo()
+        slots = asyncio.Semaphore(max(1, self.batch_concurrency))
+
+        async def run_one(index: int, request_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with slots:
+                try:
+                    # Already bounded by the batch's own concurrency, so wait for a slot instead of being rejected
+                    result = await self.execute_planning(
+                        request_data, read_cache=read_cache, write_cache=write_cache, mode=mode,
+                        queue_when_full=True
+                    )
+                    return {"index": index, "status": "completed", "result": result}
+                except Exception as e:
+                    print(f"❌ Batch request {index} ({request_data['destination']}) failed: {str(e)}")
+                    return {"index": index, "status": "failed", "error": str(e)}
+
+        print(f"📦 Planning batch of {len(requests)} requests, {self.batch_concurrency} at a time")
+        start_time = datetime.now()
+        # Tasks copy the context when created, so every plan sees the memo
+        with batch_tool_scope(memo):
+            tasks = [asyncio.create_task(run_one(index, request)) for index, request in enumerate(requests)]
+
+        completed = failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                if item["status"] == "completed":
+                    completed += 1
+                else:
+                    failed += 1
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        get_batch_stats().record(completed, failed, memo)
+        yield {
+            "batch": {
+                "total": len(requests),
+                "completed": completed,
+                "failed": failed,
+                "execution_time": (datetime.now() - start_time).total_seconds(),
+                "tool_calls": memo.stats()
+            }
+        }
+
+    def _find_similar_plan(self, request_data: Dict[str, Any], mode: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached plan of the most similar earlier request, if any
+
+        Returns:
+            {"plan", "similarity", "request" (the matched request),
+            "recompute" (agents whose inputs differ from the matched
+            request's, to be rerun) and "reuse" (stored outputs of the
+            other agents)}. Lite plans can't be partially rerun, so they
+            only match when nothing would be recomputed.
+        """
+        if not self.plan_similarity.enabled:
+            return None
+        match = self.plan_similarity.find(request_data, mode)
+        if match is None:
+            return None
+
+        similar_key, similarity, matched_request = match
+        plan, _ = self.plan_cache.get(similar_key, count=False)
+        if plan is None:
+            # Evicted or expired since it was indexed
+            self.plan_similarity.discard(similar_key)
+            return None
+
+        # Destination and origin matched as the same city/airport, and interests that only
+        # differ in case or order are the same; compare everything else as requested
+        current = {**request_data, "destination": matched_request["destination"], "origin": matched_request.get("origin")}
+        if canonicalize_request(request_data)["interests"] == canonicalize_request(matched_request)["interests"]:
+            current["interests"] = matched_request.get("interests")
+        reuse: Dict[str, str] = {}
+        if mode == "lite":
+            missing: List[str] = []
+        else:
+            try:
+                stored = self.plan_store.get(plan.get("plan_id"))
+            except PlanNotFoundError:
+                return None
+            missing = [name for name in PLAN_SECTIONS if name not in stored.outputs]
+            reuse = stored.outputs
+        recompute = invalidated_agents(matched_request, current, missing)
+        if recompute and mode == "lite":
+            return None
+
+        self.plan_similarity.record_hit(similarity)
+        return {
+            "plan": plan,
+            "similarity": similarity,
+            "request": matched_request,
+            "recompute": recompute,
+            "reuse": {name: output for name, output in reuse.items() if name not in recompute}
+        }
+
+    def _replay_sections(
+        self,
+        plan: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]]
+    ):
+        """Emit every section of an already finished plan to on_section"""
+        if on_section is None:
+            return
+        for name in PLAN_SECTIONS:
+            on_section(name, {field: plan[field] for field in SECTION_FIELDS[name]})
+
+    def _schedule_refresh(self, cache_key: str, request_data: Dict[str, Any], mode: str = "full"):
+        """Regenerate a stale plan in the background, at most once per key"""
+        if cache_key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                # Regenerate for real rather than replaying the cached completions
+                with completion_cache_bypass():
+                    if mode == "lite":
+                        result = await self._run_lite_planning(request_data)
+                    else:
+                        async with self.pool.admit():
+                            result = await self._run_planning(request_data)
+                self.plan_cache.set(cache_key, result)
+                self.plan_cache.refreshes += 1
+            except PlanningCapacityError:
+                print(f"⚠️  Skipping plan refresh for {request_data['destination']}: planner busy")
+            except Exception as e:
+                print(f"❌ Plan refresh failed for {request_data['destination']}: {str(e)}")
+            finally:
+                self._refreshing.pop(cache_key, None)
+
+        self._refreshing[cache_key] = asyncio.create_task(refresh())
+
+    async def replan(
+        self,
+        plan_id: str,
+        changes: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply changes to a stored plan's request, rerunning only the affected agents
+
+        Agents whose task inputs changed, whose output is missing (e.g. it
+        missed a deadline) or whose upstream agents rerun are recomputed;
+        every other agent's stored output is reused as-is. The updated plan
+        is stored under a new plan_id; the original stays unchanged, since
+        cached copies of it still refer to its id. Changing duration_days
+        without a new return_date drops the old return date.
+
+        Args:
+            plan_id: Id of a plan returned by execute_planning
+            changes: Request fields to change
+            on_section: Optional callback invoked with (section name, response fields)
+
+        Returns:
+            Complete travel plan, with the rerun agents in recomputed_sections
+
+        Raises:
+            PlanNotFoundError: If the plan is unknown or expired
+        """
+        stored = self.plan_store.get(plan_id)
+        request_data = {**stored.request_data, **changes}
+        if "duration_days" in changes and "return_date" not in changes:
+            request_data["return_date"] = None
 
-        destination = request_data["destination"]
-        origin = request_data.get("origin", "SIN")
-        departure_date = request_data.get("departure_date", "2026-06-01")
-        duration_days = request_data.get("duration_days", 7)
-        
-        # Infer travel month from departure date
-        dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
-        travel_month = dep_date.strftime("%B")
-        print(f"📅 Inferred travel month: {travel_month}")
-        
-        # Calculate return date if not provided
-        return_date = request_data.get("return_date")
-        if not return_date:
-            ret_date = dep_date + timedelta(days=duration_days)
-            return_date = ret_date.strftime("%Y-%m-%d")
-            print(f"📅 Calculated return date: {departure_date} + {duration_days} days = {return_date}")
+        missing = [name for name in PLAN_SECTIONS if name not in stored.outputs]
+        recompute = invalidated_agents(stored.request_data, request_data, missing)
+        reuse = {name: output for name, output in stored.outputs.items() if name not in recompute}
+        print(f"🔁 Re-planning {plan_id[:8]}: recomputing {', '.join(recompute) or 'nothing'}")
+
+        async with self.pool.admit():
+            result = await self._run_planning(request_data, on_section, reuse_outputs=reuse)
+        self.plan_store.replans += 1
+
+        if not result.get("degraded_sections"):
+            cache_key = request_cache_key(request_data)
+            self.plan_cache.set(cache_key, result)
+            self.plan_similarity.add(cache_key, request_data)
+        result["recomputed_sections"] = recompute
+        return result
+
+    async def _run_planning(
+        self,
+        request_data: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        reuse_outputs: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the planning workflow inside an admitted pool slot
+
+        Agents listed in reuse_outputs are not run; their stored outputs
+        are used instead. The finished plan is saved in the plan store
+        and its id returned as plan_id.
+        """
+        ctx = PlanningContext(request_data)
+        reuse_outputs = reuse_outputs or {}
+
+        print(f"📅 Inferred travel month: {ctx.travel_month}")
+        if ctx.return_date_calculated:
+            print(f"📅 Calculated return date: {ctx.departure_date} + {ctx.duration_days} days = {ctx.return_date}")
 
         print(f"\n{'='*60}")
-        print(f"🌍 Starting Travel Planning for {destination}")
+        print(f"🌍 Starting Travel Planning for {ctx.destination}")
         print(f"{'='*60}\n")
 
         # Resolve airport/city codes upfront for agents to use
-        print("🔍 Resolving location codes...")
-        try:
-            origin_code = resolve_airport_code(origin)
-            dest_airport_code = resolve_airport_code(destination)
-            dest_city_code = resolve_city_code(destination)
-            print(f"   ✅ Origin: {origin} → {origin_code}")
-            print(f"   ✅ Destination (airport): {destination} → {dest_airport_code}")
-            print(f"   ✅ Destination (city): {destination} → {dest_city_code}")
-            
-            # Add resolved codes to request for agents
-            request_data["origin_code"] = origin_code
-            request_data["dest_airport_code"] = dest_airport_code
-            request_data["dest_city_code"] = dest_city_code
-        except ValueError as e:
-            print(f"   ⚠️  {e}")
+        self._resolve_codes(ctx)
+
+        # Deterministic tool prefetch - all MCP calls run concurrently before any LLM call
+        if self.prefetch_tools:
+            prefetch_start = datetime.now()
+            tools = {tool for name, tool in TOOL_SECTIONS.items() if name not in reuse_outputs}
+            if self.flight_calendar_flex_days and "flights" in tools:
+                tools.add("flight_calendar")
+            ctx.tool_results = await self._prefetch_tool_results(ctx, tools)
+            ctx.prefetch_time = (datetime.now() - prefetch_start).total_seconds()
+            print(f"   ✅ Prefetched tool results in {ctx.prefetch_time:.1f}s")
 
-        # Run single Crew workflow - agents call MCP tools via their tools= parameter
+        # Run the agent dependency graph - agents call MCP tools via their tools= parameter
         print(f"\n{'='*60}")
-        print("🤖 Running Agent Crew Workflow...")
-        print("   (Agents will call flight_search_tool, hotel_search_tool, etc.)")
+        print("🤖 Running Agent Crew Workflow (dependency graph)...")
+        if ctx.tool_results is None:
+            print("   (Agents will call flight_search_tool, hotel_search_tool, etc.)")
+        else:
+            print("   (Agents summarize pre-fetched tool results)")
         print(f"{'='*60}\n")
-        
-        crew = create_travel_planning_crew(self.llm, request_data)
-        crew_result = crew.kickoff()
+
+        dag = create_travel_planning_crew(
+            self.llm, ctx.request_data, ctx.tool_results, self.agent_models, reuse_outputs,
+            itinerary_day_concurrency=self.itinerary_day_concurrency,
+            flight_flex_days=self.flight_calendar_flex_days
+        )
+        on_node_complete = None
+        if on_section is not None:
+            def on_node_complete(name: str, output: Any):
+                on_section(name, self._section_from_output(name, str(output)))
+
+        dag_result = await dag.execute(
+            executor=self.pool.executor,
+            on_node_complete=on_node_complete,
+            deadline=get_deadline()
+        )
 
         # Parse crew output
-        self.results["crew_output"] = self._parse_crew_output(crew_result)
+        self._parse_crew_output(ctx, dag_result)
+        if ctx.unfinished:
+            print(f"\n⏰ Deadline reached with {', '.join(ctx.unfinished)} unfinished")
+            await self._fill_degraded_sections(ctx, ctx.unfinished, on_section)
 
         # Assemble final response
-        execution_time = (datetime.now() - start_time).total_seconds()
+        execution_time = ctx.elapsed()
 
         print(f"\n{'='*60}")
         print(f"✅ Planning Complete! ({execution_time:.1f}s)")
+        print(f"   Critical path: {' → '.join(ctx.critical_path)}")
         print(f"{'='*60}\n")
 
-        return self._assemble_final_response(
-            destination=destination,
-            origin=origin,
-            execution_time=execution_time
+        response = self._assemble_final_response(ctx, execution_time)
+        response["plan_id"] = self.plan_store.save(request_data, ctx.outputs)
+        return response
+
+    async def _run_lite_planning(
+        self,
+        request_data: Dict[str, Any],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fast preview plan: concurrent MCP tools plus one LLM call, no crew
+
+        Flights, hotels, budget and attractions are taken straight from the
+        tool results; seasonality, tips and a compact itinerary come from a
+        single JSON-mode completion. Sections go through the same schema
+        validation as agent outputs, so the result is a TravelPlanResponse.
+        """
+        ctx = PlanningContext(request_data)
+        print(f"\n⚡ Lite planning for {ctx.destination}")
+        self._resolve_codes(ctx)
+
+        prefetch_start = datetime.now()
+        ctx.tool_results = await self._prefetch_tool_results(ctx)
+        ctx.prefetch_time = (datetime.now() - prefetch_start).total_seconds()
+        print(f"   ✅ Prefetched tool results in {ctx.prefetch_time:.1f}s")
+
+        tool_sections = self._lite_sections_from_tools(ctx.tool_results)
+        for name, data in tool_sections.items():
+            ctx.outputs[name] = json.dumps(data)
+
+        prompt = create_lite_plan_prompt(
+            ctx.destination,
+            ctx.duration_days,
+            ctx.travel_month,
+            getattr(ctx.request_data.get("budget_level"), "value", ctx.request_data.get("budget_level", "moderate")),
+            ctx.request_data.get("interests", []),
+            getattr(ctx.request_data.get("trip_type"), "value", ctx.request_data.get("trip_type", "solo")),
+            attractions=tool_sections["attractions"]["categories"],
+            hotel_areas=sorted({hotel["area"] for hotel in tool_sections["hotels"].get("hotels", [])})
         )
 
-    def _parse_crew_output(self, output: Any) -> Dict:
-        """Parse crew output"""
+        llm_start = ctx.elapsed()
         try:
-            # Crew returns task outputs
-            if hasattr(output, 'tasks_output'):
-                return {
-                    "tasks": [str(task_output) for task_output in output.tasks_output]
+            text = await get_llm_client().generate_text(
+                prompt,
+                system_prompt=LITE_PLAN_SYSTEM_PROMPT,
+                max_tokens=self.lite_max_tokens,
+                response_format={"type": "json_object"},
+                model=self.lite_model
+            )
+        except (DeadlineExceeded, httpx.TimeoutException) as e:
+            print(f"   ⏰ Lite plan call ran out of time: {str(e)}")
+            ctx.unfinished = ["seasonality", "itinerary", "tips"]
+        llm_end = ctx.elapsed()
+
+        if ctx.unfinished:
+            await self._fill_degraded_sections(ctx, ctx.unfinished)
+        else:
+            data, status = parse_agent_output("lite", text, schema=LitePlanOutput)
+            get_output_parse_stats().record("lite", status)
+            print(f"   ✅ Lite plan call finished in {llm_end - llm_start:.1f}s ({status})")
+
+            ctx.outputs["seasonality"] = json.dumps(data.get("seasonality", {}))
+            ctx.outputs["tips"] = json.dumps(data.get("tips", {}))
+            ctx.outputs["itinerary"] = data.get("itinerary")
+        ctx.timings = {"lite_plan": {"start": llm_start, "end": llm_end, "duration": llm_end - llm_start}}
+        ctx.critical_path = ["lite_plan"]
+
+        response = self._assemble_final_response(ctx, ctx.elapsed())
+        response["mode"] = "lite"
+        response["agent_timings"]["models"] = {"lite_plan": self.lite_model}
+        self._replay_sections(response, on_section)
+        return response
+
+    def _lite_sections_from_tools(self, tool_results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Shape raw tool results like the flight, hotel, budget and attractions agent outputs"""
+        places = {}
+        for result in tool_results["places"].values():
+            for place in result.get("attractions", []):
+                places.setdefault(place.get("name"), place)
+        categories = categorize_attractions(list(places.values()))
+
+        return {
+            "flights": {"flights": tool_results["flights"].get("flights", [])[:LITE_TOP_K]},
+            "hotels": {"hotels": tool_results["hotels"].get("hotels", [])[:LITE_TOP_K]},
+            "budget": {"budget_tiers": tool_results["budget"].get("budget_tiers", {})},
+            "attractions": {
+                "categories": {
+                    category: sorted(items, key=lambda item: item.get("rating") or 0, reverse=True)[:LITE_TOP_K]
+                    for category, items in categories.items()
                 }
-            return {"raw": str(output)}
+            }
+        }
+
+    def _resolve_codes(self, ctx: PlanningContext):
+        """Resolve airport/city codes into the context; unknown places keep their names"""
+        print("🔍 Resolving location codes...")
+        try:
+            origin_code = resolve_code(resolve_airport_code, ctx.origin)
+            dest_airport_code = resolve_code(resolve_airport_code, ctx.destination)
+            dest_city_code = resolve_code(resolve_city_code, ctx.destination)
+            print(f"   ✅ Origin: {ctx.origin} → {origin_code}")
+            print(f"   ✅ Destination (airport): {ctx.destination} → {dest_airport_code}")
+            print(f"   ✅ Destination (city): {ctx.destination} → {dest_city_code}")
+
+            # Add resolved codes to request for agents
+            ctx.set_resolved_codes(origin_code, dest_airport_code, dest_city_code)
+        except ValueError as e:
+            print(f"   ⚠️  {e}")
+
+    async def _prefetch_tool_results(self, ctx: PlanningContext, tools: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Call every MCP tool the agents would need, concurrently
+
+        Arguments are already known from the request and resolved codes,
+        so no LLM round trip is needed to decide them. Each tool returns
+        fallback data on failure, so the results are always usable. Within
+        a batch, calls identical to another request's are shared.
+
+        Args:
+            ctx: Planning context with resolved codes
+            tools: Optional subset of "flights", "hotels", "budget",
+                "places" and "flight_calendar" to call (default all but
+                "flight_calendar"); only those keys are returned
+        """
+        async def places() -> Dict[str, Any]:
+            results = await asyncio.gather(*[
+                call_tool("search_places", search_places, ctx.destination, category=category)
+                for category in ATTRACTION_CATEGORIES
+            ])
+            return dict(zip(ATTRACTION_CATEGORIES, results))
+
+        calls = {
+            "flights": lambda: call_tool(
+                "search_flights", search_flights,
+                ctx.origin_code, ctx.dest_airport_code, ctx.departure_date, ctx.return_date
+            ),
+            "hotels": lambda: call_tool(
+                "search_hotels", search_hotels, ctx.dest_city_code, ctx.departure_date, ctx.return_date
+            ),
+            "budget": lambda: call_tool("lookup_budget", lookup_budget, ctx.destination),
+            "places": places,
+            "flight_calendar": lambda: call_tool(
+                "search_flight_price_calendar", search_flight_price_calendar,
+                ctx.origin_code, ctx.dest_airport_code, ctx.departure_date, ctx.return_date,
+                flex_days=self.flight_calendar_flex_days
+            )
+        }
+        names = [name for name in calls if name in (tools if tools is not None else TOOL_SECTIONS.values())]
+        print(f"📡 Prefetching tool results ({', '.join(names) or 'none needed'})...")
+        results = await asyncio.gather(*[calls[name]() for name in names])
+        return dict(zip(names, results))
+
+    def _parse_crew_output(self, ctx: PlanningContext, output: Any):
+        """Parse crew output into the planning context"""
+        try:
+            # Dependency graph returns outputs keyed by node name
+            if isinstance(output, dict) and "outputs" in output:
+                ctx.outputs = {name: str(task_output) for name, task_output in output["outputs"].items()}
+                ctx.timings = output.get("timings", {})
+                ctx.critical_path = output.get("critical_path", [])
+                ctx.unfinished = output.get("unfinished", [])
         except Exception as e:
-            return {"error": str(e), "raw": str(output)}
+            print(f"⚠️  Could not parse crew output: {str(e)}")
+
+    def _section_from_output(self, name: str, output: Optional[str]) -> Dict[str, Any]:
+        """Transform one agent's raw output into its TravelPlanResponse fields"""
+        if name == "itinerary":
+            return {"itinerary": output or "# Itinerary\n\nNo itinerary generated."}
+
+        # Parse agent outputs against their task's output schema
+        data, _ = parse_agent_output(name, output)
 
-    def _assemble_final_response(
-        self, destination: str, origin: str, execution_time: float
+        if name == "seasonality":
+            return {
+                "best_dates": ", ".join(data.get("best_months", [])) if data.get("best_months") else "Year-round",
+                "weather_summary": data.get("weather_summary", "No weather information available.")
+            }
+        if name == "flights":
+            return {"flight_options": data.get("flights", []), "cheaper_dates": data.get("cheaper_dates") or None}
+        if name == "hotels":
+            return {"hotel_options": data.get("hotels", [])}
+        if name == "budget":
+            return {"budget_estimate": data.get("budget_tiers", {})}
+        if name == "attractions":
+            return {"attractions": data.get("categories", {})}
+        if name == "tips":
+            return {"tips": data}
+        raise ValueError(f"Unknown plan section: {name}")
+
+    async def _fill_degraded_sections(
+        self,
+        ctx: PlanningContext,
+        sections: List[str],
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ):
+        """
+        Fill sections that missed the deadline instead of failing the plan
+
+        Sources, in order: the last cached plan for this request (of any
+        age), the agent output cache for seasonality and tips (expired
+        entries allowed), the MCP tool results for flights, hotels, budget
+        and attractions (which carry the tools' own fallback data when an
+        API call failed or ran out of time), an outline itinerary built
+        from the attractions, and finally the empty section defaults.
+        """
+        previous = self.plan_cache.peek(request_cache_key(ctx.request_data))
+        for name in [name for name in PLAN_SECTIONS if name in sections]:
+            fields, source = None, "default"
+            if previous is not None:
+                fields, source = {field: previous[field] for field in SECTION_FIELDS[name]}, "plan_cache"
+            elif name in ("seasonality", "tips"):
+                cached = cached_agent_output(name, ctx.request_data, allow_expired=True)
+                if cached is not None:
+                    fields, source = self._section_from_output(name, cached), "agent_cache"
+            elif name in TOOL_SECTIONS:
+                missing_tools = set(TOOL_SECTIONS.values()) - set(ctx.tool_results or {})
+                if missing_tools:
+                    # Past the deadline the tools return their fallback data straight away
+                    fetched = await self._prefetch_tool_results(ctx, missing_tools)
+                    ctx.tool_results = {**(ctx.tool_results or {}), **fetched}
+                tool_result = ctx.tool_results[TOOL_SECTIONS[name]]
+                if name == "attractions":
+                    succeeded = any(result.get("success") for result in tool_result.values())
+                else:
+                    succeeded = tool_result.get("success")
+                data = self._lite_sections_from_tools(ctx.tool_results)[name]
+                fields = self._section_from_output(name, json.dumps(data))
+                source = "tool_results" if succeeded else "tool_fallback"
+            elif name == "itinerary":
+                attractions = self._section_fields(ctx, "attractions")["attractions"]
+                fields, source = {"itinerary": self._outline_itinerary(ctx, attractions)}, "outline"
+
+            if fields is None:
+                fields = self._section_from_output(name, None)
+            ctx.fallback_sections[name] = fields
+            ctx.degraded[name] = source
+            print(f"   ⏰ {name} served degraded from {source}")
+            if on_section is not None:
+                on_section(name, fields)
+
+    async def _degraded_plan(
+        self,
+        request_data: Dict[str, Any],
+        mode: str = "full",
+        on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
-        """Assemble final response from crew output"""
-        crew_output = self.results.get("crew_output", {})
-        tasks = crew_output.get("tasks", [])
-
-        # Parse agent outputs (they return JSON strings)
-        seasonality_data = self._parse_json_safe(tasks[0] if len(tasks) > 0 else "{}")
-        flights_data = self._parse_json_safe(tasks[1] if len(tasks) > 1 else "{}")
-        hotels_data = self._parse_json_safe(tasks[2] if len(tasks) > 2 else "{}")
-        budget_data = self._parse_json_safe(tasks[3] if len(tasks) > 3 else "{}")
-        attractions_data = self._parse_json_safe(tasks[4] if len(tasks) > 4 else "{}")
-        itinerary_str = tasks[5] if len(tasks) > 5 else "# Itinerary\n\nNo itinerary generated."
-        tips_data = self._parse_json_safe(tasks[6] if len(tasks) > 6 else "{}")
+        """Plan built only from degraded sources, for a request out of time before any agent ran for it"""
+        ctx = PlanningContext(request_data)
+        self._resolve_codes(ctx)
+        await self._fill_degraded_sections(ctx, PLAN_SECTIONS, on_section)
+        response = self._assemble_final_response(ctx, ctx.elapsed())
+        response["mode"] = mode
+        if mode == "full":
+            response["plan_id"] = self.plan_store.save(request_data, ctx.outputs)
+        return response
+
+    def _outline_itinerary(self, ctx: PlanningContext, attractions: Dict[str, List[Dict[str, Any]]]) -> str:
+        """Plain day-by-day outline over the top attractions, for when the itinerary agent missed the deadline"""
+        places = list(dict.fromkeys(
+            item["name"] for items in attractions.values() for item in items if item.get("name")
+        ))
+        lines = [f"# {ctx.duration_days}-Day {ctx.destination} Itinerary (outline)", ""]
+        for day in range(ctx.duration_days):
+            todays = places[day * OUTLINE_PLACES_PER_DAY:(day + 1) * OUTLINE_PLACES_PER_DAY]
+            lines.append(f"## Day {day + 1}")
+            lines.extend(f"- Visit {name}" for name in todays)
+            if not todays:
+                lines.append(f"- Free day to explore {ctx.destination} at your own pace")
+            lines.append("")
+        return "\n".join(lines).rstrip()
+
+    def _section_fields(self, ctx: PlanningContext, name: str) -> Dict[str, Any]:
+        """A section's response fields, from its fallback if it was degraded"""
+        if name in ctx.fallback_sections:
+            return ctx.fallback_sections[name]
+        return self._section_from_output(name, ctx.outputs.get(name))
 
+    def _assemble_final_response(self, ctx: PlanningContext, execution_time: float) -> Dict[str, Any]:
+        """Assemble final response from the context's crew output"""
         # Transform to match TravelPlanResponse model
-        return {
-            "destination": destination,
-            "origin": origin,
-            "best_dates": ", ".join(seasonality_data.get("best_months", [])) if seasonality_data.get("best_months") else "Year-round",
-            "weather_summary": seasonality_data.get("weather_summary", "No weather information available."),
-            "flight_options": flights_data.get("flights", []),
-            "hotel_options": hotels_data.get("hotels", []),
-            "budget_estimate": budget_data.get("budget_tiers", {}),
-            "attractions": attractions_data.get("categories", {}),
-            "itinerary": itinerary_str,
-            "tips": tips_data,
-            "execution_time": execution_time
+        response = {
+            "destination": ctx.destination,
+            "origin": ctx.origin
         }
+        for name in PLAN_SECTIONS:
+            response.update(self._section_fields(ctx, name))
 
-    def _parse_json_safe(self, text: str) -> Dict:
-        """Safely parse JSON, handling both JSON strings and plain text"""
-        try:
-            # Remove markdown code blocks if present
-            text = text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-
-            # Try to parse as JSON
-            return json.loads(text)
-        except (json.JSONDecodeError, ValueError):
-            # If not valid JSON, return empty dict
-            return {}
+        response["execution_time"] = execution_time
+        response["mode"] = "full"
+        response["degraded_sections"] = ctx.degraded
+        response["agent_timings"] = {
+            "nodes": ctx.timings,
+            "critical_path": ctx.critical_path,
+            "prefetch_time": ctx.prefetch_time,
+            "models": self.agent_models
+        }
+        return response
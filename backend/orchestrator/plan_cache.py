@@ -0,0 +1,159 @@
+"""
+Whole-plan response cache
+Keyed by a canonical form of the planning request, with TTL, LRU size
+limits and stale-while-revalidate
+"""
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from utils.airport_codes import resolve_airport_code, resolve_city_code
+from utils.env import get_optional_env
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+def _resolve_or_normalize(resolver, value: str) -> str:
+    try:
+        return resolver(value)
+    except ValueError:
+        return value.lower().strip()
+
+def canonicalize_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a planning request to the fields that determine the plan
+
+    Destination is lower-cased, origin/destination are resolved to IATA
+    codes, interests are sorted and de-duplicated, and the departure date
+    is bucketed by month with the trip length kept in days.
+    """
+    destination = " ".join(request_data["destination"].lower().split())
+    origin = request_data.get("origin") or "SIN"
+
+    departure_date = request_data.get("departure_date") or "2026-06-01"
+    dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
+    duration_days = request_data.get("duration_days") or 7
+    if request_data.get("return_date"):
+        ret_date = datetime.strptime(request_data["return_date"], "%Y-%m-%d")
+        duration_days = max((ret_date - dep_date).days, 1)
+
+    interests = sorted({i.lower().strip() for i in request_data.get("interests") or [] if i.strip()})
+
+    return {
+        "destination": destination,
+        "origin_code": _resolve_or_normalize(resolve_airport_code, origin),
+        "dest_airport_code": _resolve_or_normalize(resolve_airport_code, destination),
+        "dest_city_code": _resolve_or_normalize(resolve_city_code, destination),
+        "travel_month": dep_date.strftime("%Y-%m"),
+        "duration_days": int(duration_days),
+        "budget_level": _enum_value(request_data.get("budget_level", "moderate")),
+        "trip_type": _enum_value(request_data.get("trip_type", "solo")),
+        "interests": interests
+    }
+
+def request_cache_key(request_data: Dict[str, Any]) -> str:
+    """Stable hash of the canonical request"""
+    canonical = json.dumps(canonicalize_request(request_data), sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    LRU cache of final plan responses.
+
+    Entries younger than `ttl_seconds` are fresh. Entries up to
+    `stale_seconds` past their TTL are served as stale while the caller
+    refreshes them in the background; older entries are dropped.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 21600, stale_seconds: int = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def get(self, key: str, count: bool = True) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Look up a plan
+
+        Args:
+            key: Plan cache key
+            count: Count the lookup in the hit/miss stats (off for
+                secondary lookups such as near-duplicate matches)
+
+        Returns:
+            (plan, status) where status is "hit", "stale" or "miss"
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += count
+            return None, "miss"
+
+        stored_at, plan = entry
+        age = time.time() - stored_at
+        if age > self.ttl_seconds + self.stale_seconds:
+            del self._entries[key]
+            self.misses += count
+            return None, "miss"
+
+        self._entries.move_to_end(key)
+        if age > self.ttl_seconds:
+            self.stale_hits += count
+            return copy.deepcopy(plan), "stale"
+
+        self.hits += count
+        return copy.deepcopy(plan), "hit"
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a stored plan regardless of age, without touching LRU order or stats"""
+        entry = self._entries.get(key)
+        return copy.deepcopy(entry[1]) if entry is not None else None
+
+    def set(self, key: str, plan: Dict[str, Any]):
+        self._entries[key] = (time.time(), copy.deepcopy(plan))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+# Singleton instance
+_plan_cache: Optional[PlanCache] = None
+
+def get_plan_cache() -> PlanCache:
+    """Get or create the process-wide plan cache"""
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache(
+            max_entries=int(get_optional_env("PLAN_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=int(get_optional_env("PLAN_CACHE_TTL_SECONDS", "21600")),
+            stale_seconds=int(get_optional_env("PLAN_CACHE_STALE_SECONDS", "86400"))
+        )
+    return _plan_cache
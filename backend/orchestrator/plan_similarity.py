@@ -0,0 +1,185 @@
+"""
+Near-duplicate plan request matching
+MinHash signatures over normalized request fields, so "Tokyo" and
+"tokyo, japan" a few days apart can reuse the same stored plan
+"""
+import copy
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+
+from utils.env import get_optional_env
+from .plan_cache import canonicalize_request
+
+# Mersenne prime for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+# Departure dates fall into overlapping three-week windows, staggered by a
+# week; dates less than a week apart differ in at most one of them
+DATE_WINDOW_DAYS = 21
+DATE_WINDOW_OFFSETS = (0, 7, 14)
+
+
+def destination_tokens(destination: str) -> FrozenSet[str]:
+    """Lower-cased words of a destination, ignoring punctuation"""
+    return frozenset(re.findall(r"[a-z0-9]+", destination.lower()))
+
+def request_features(request_data: Dict[str, Any]) -> Set[str]:
+    """
+    Normalized feature set of a planning request
+
+    The origin is resolved to its code, interests are lower-cased and
+    de-duplicated, and the departure date is mapped to overlapping date
+    windows instead of an exact day. Destination and trip length are not
+    features: PlanSimilarityIndex requires them to match outright, as it
+    does origin, budget and trip type (which stay features so the
+    threshold means the same as when they were soft).
+    """
+    canonical = canonicalize_request(request_data)
+    departure = datetime.strptime(request_data.get("departure_date") or "2026-06-01", "%Y-%m-%d").toordinal()
+
+    features = {
+        f"origin:{canonical['origin_code']}",
+        f"budget:{canonical['budget_level']}",
+        f"trip:{canonical['trip_type']}"
+    }
+    features.update(f"interest:{interest}" for interest in canonical["interests"])
+    features.update(
+        f"window{offset}:{(departure + offset) // DATE_WINDOW_DAYS}" for offset in DATE_WINDOW_OFFSETS
+    )
+    return features
+
+
+class MinHasher:
+    """Fixed family of `num_perm` hash permutations for MinHash signatures"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, features: Set[str]) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            for feature in features
+        ]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._params)
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the feature sets behind two signatures"""
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class PlanSimilarityIndex:
+    """
+    Index of stored plans for near-duplicate lookup.
+
+    Candidates must share the mode, resolved destination city, trip
+    length, origin, budget level and trip type - the plan's flights and
+    budget depend on them - and one destination's words must contain the
+    other's (so "Kyoto, Japan" never matches "Tokyo"). Among those, the
+    plan whose MinHash signature is most similar is returned, with the
+    request it was made for, if it reaches `threshold`.
+    """
+
+    def __init__(self, enabled: bool = True, threshold: float = 0.75, num_perm: int = 128, max_entries: int = 256):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm)
+        # plan cache key -> (bucket, destination tokens, signature, request)
+        self._entries: "OrderedDict[str, Tuple[Tuple[Any, ...], FrozenSet[str], Tuple[int, ...], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self._hit_similarity_total = 0.0
+
+    @staticmethod
+    def _bucket(request_data: Dict[str, Any], mode: str) -> Tuple[Any, ...]:
+        canonical = canonicalize_request(request_data)
+        return (
+            mode, canonical["dest_city_code"], canonical["duration_days"],
+            canonical["origin_code"], canonical["budget_level"], canonical["trip_type"]
+        )
+
+    def add(self, cache_key: str, request_data: Dict[str, Any], mode: str = "full"):
+        """Index a stored plan under its plan cache key"""
+        entry = (
+            self._bucket(request_data, mode),
+            destination_tokens(request_data["destination"]),
+            self.hasher.signature(request_features(request_data)),
+            copy.deepcopy(request_data)
+        )
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, cache_key: str):
+        with self._lock:
+            self._entries.pop(cache_key, None)
+
+    def find(self, request_data: Dict[str, Any], mode: str = "full") -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Find the most similar stored plan
+
+        Returns:
+            (plan cache key, estimated similarity, request the plan was
+            made for), or None if no stored plan reaches the threshold
+        """
+        bucket = self._bucket(request_data, mode)
+        tokens = destination_tokens(request_data["destination"])
+        signature = self.hasher.signature(request_features(request_data))
+
+        best: Optional[Tuple[str, float, Dict[str, Any]]] = None
+        with self._lock:
+            self.lookups += 1
+            for cache_key, (entry_bucket, entry_tokens, entry_signature, entry_request) in self._entries.items():
+                if entry_bucket != bucket or not (tokens <= entry_tokens or entry_tokens <= tokens):
+                    continue
+                similarity = MinHasher.similarity(signature, entry_signature)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (cache_key, similarity, entry_request)
+        if best is None:
+            return None
+        return best[0], best[1], copy.deepcopy(best[2])
+
+    def record_hit(self, similarity: float):
+        """Count a lookup whose match was actually served"""
+        with self._lock:
+            self.hits += 1
+            self._hit_similarity_total += similarity
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+                "indexed": len(self._entries),
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "avg_hit_similarity": round(self._hit_similarity_total / self.hits, 3) if self.hits else 0.0
+            }
+
+
+# Singleton instance
+_plan_similarity: Optional[PlanSimilarityIndex] = None
+
+def get_plan_similarity() -> PlanSimilarityIndex:
+    """Get or create the process-wide near-duplicate plan index"""
+    global _plan_similarity
+    if _plan_similarity is None:
+        _plan_similarity = PlanSimilarityIndex(
+            enabled=get_optional_env("PLAN_SIMILARITY_ENABLED", "true").lower() == "true",
+            threshold=float(get_optional_env("PLAN_SIMILARITY_THRESHOLD", "0.75")),
+            num_perm=int(get_optional_env("PLAN_SIMILARITY_NUM_PERM", "128")),
+            max_entries=int(get_optional_env("PLAN_CACHE_MAX_ENTRIES", "256"))
+        )
+    return _plan_similarity
@@ -0,0 +1,104 @@
+"""
+Stored plans for incremental re-planning
+Keeps each full plan's request and raw agent outputs addressable by
+plan id, so PATCH /plan/{plan_id} can rerun only the invalidated agents
+"""
+import copy
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.env import get_optional_env
+
+
+class PlanNotFoundError(Exception):
+    """Raised when a plan id is unknown or its stored plan has expired"""
+    pass
+
+
+class StoredPlan:
+    """A plan's request and the raw output of every agent that finished"""
+
+    def __init__(self, plan_id: str, request_data: Dict[str, Any], outputs: Dict[str, str]):
+        self.plan_id = plan_id
+        self.request_data = request_data
+        self.outputs = outputs
+        self.created_at = time.time()
+
+
+class PlanStore:
+    """
+    LRU store of plans by id.
+
+    Plans expire `ttl_seconds` after they were stored and the least
+    recently used are evicted beyond `max_plans`. Stored plans are never
+    modified: re-planning saves the result under a new id.
+    """
+
+    def __init__(self, max_plans: int = 1000, ttl_seconds: int = 86400):
+        self.max_plans = max_plans
+        self.ttl_seconds = ttl_seconds
+        self._plans: "OrderedDict[str, StoredPlan]" = OrderedDict()
+        self.saves = 0
+        self.replans = 0
+        self.evictions = 0
+
+    def save(self, request_data: Dict[str, Any], outputs: Dict[str, str]) -> str:
+        """Store a plan and return its new id"""
+        plan_id = uuid.uuid4().hex
+        self._plans[plan_id] = StoredPlan(plan_id, copy.deepcopy(request_data), dict(outputs))
+        self._plans.move_to_end(plan_id)
+        self.saves += 1
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+            self.evictions += 1
+        return plan_id
+
+    def get(self, plan_id: str) -> StoredPlan:
+        """
+        Look up a stored plan
+
+        Raises:
+            PlanNotFoundError: If the plan is unknown or expired
+        """
+        plan = self._plans.get(plan_id)
+        if plan is not None and time.time() - plan.created_at > self.ttl_seconds:
+            del self._plans[plan_id]
+            plan = None
+        if plan is None:
+            raise PlanNotFoundError(f"Plan {plan_id} not found or expired")
+        self._plans.move_to_end(plan_id)
+        return plan
+
+    def fork(self, plan_id: Optional[str], request_data: Dict[str, Any]) -> Optional[str]:
+        """Store a stored plan's outputs under a new id for a different request (None if it is gone)"""
+        try:
+            source = self.get(plan_id) if plan_id else None
+        except PlanNotFoundError:
+            source = None
+        return self.save(request_data, source.outputs) if source is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stored": len(self._plans),
+            "max_plans": self.max_plans,
+            "ttl_seconds": self.ttl_seconds,
+            "saves": self.saves,
+            "replans": self.replans,
+            "evictions": self.evictions
+        }
+
+
+# Singleton instance
+_plan_store: Optional[PlanStore] = None
+
+def get_plan_store() -> PlanStore:
+    """Get or create the process-wide plan store"""
+    global _plan_store
+    if _plan_store is None:
+        _plan_store = PlanStore(
+            max_plans=int(get_optional_env("PLAN_STORE_MAX", "1000")),
+            ttl_seconds=int(get_optional_env("PLAN_STORE_TTL_SECONDS", "86400"))
+        )
+    return _plan_store
@@ -0,0 +1,113 @@
+"""
+Singleflight coalescing of identical in-flight work
+Concurrent callers with the same key await one shared execution
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """One shared execution and the number of callers still awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+
+    The first caller for a key (the leader) starts the work as a task of
+    its own; callers that arrive while it is still running await that task
+    instead of starting their own. No single caller owns the work: a caller
+    that is cancelled (a client disconnect, a cancelled job) just stops
+    waiting, and the work is cancelled only once the last waiter has left.
+    Results are shared, so callers that mutate them must copy first.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.follower_timeouts = 0
+        self.abandoned = 0
+
+    def _finished(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Nobody may be left to retrieve it; don't warn about an unretrieved exception
+        if not call.task.cancelled():
+            call.task.exception()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run `fn` once per key at a time
+
+        Args:
+            key: Callers with the same key share one execution
+            fn: The work, started by the leader (in the leader's context)
+            timeout: Longest a follower waits for the shared result
+
+        Returns:
+            (result, shared) where shared is True if this caller joined
+            another caller's in-flight execution
+
+        Raises:
+            asyncio.TimeoutError: If a follower's timeout passes first (the
+                shared execution carries on)
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda done: self._finished(key, call))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        call.waiters += 1
+        try:
+            # Shielded so this caller being cancelled or timing out leaves the work running
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout if shared else None), shared
+        except asyncio.TimeoutError:
+            if not call.task.done():
+                self.follower_timeouts += 1
+            raise
+        except asyncio.CancelledError:
+            if call.task.cancelled():
+                raise RuntimeError("Shared planning run was cancelled")
+            raise
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last waiter gone: nobody wants the result any more
+                self.abandoned += 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.followers,
+            "follower_timeouts": self.follower_timeouts,
+            "abandoned": self.abandoned
+        }
+
+
+# Singleton instance
+_plan_singleflight: Optional[SingleFlight] = None
+
+def get_plan_singleflight() -> SingleFlight:
+    """Get or create the process-wide singleflight group for plans"""
+    global _plan_singleflight
+    if _plan_singleflight is None:
+        _plan_singleflight = SingleFlight()
+    return _plan_singleflight
@@ -0,0 +1,138 @@
+"""
+Schema-validated agent output parsing
+Parses raw agent outputs against each task's Pydantic output schema,
+salvaging what validates and tracking parse success per agent
+"""
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from agents import AGENT_OUTPUT_SCHEMAS
+from utils.json_parser import parse_partial_json
+
+# Give up salvaging after this many validate/drop rounds
+MAX_SALVAGE_PASSES = 50
+
+
+def _drop_path(data: Any, loc: Tuple[Any, ...]) -> bool:
+    """Delete the value at `loc`; returns False if the path does not resolve"""
+    parent = data
+    for key in loc[:-1]:
+        try:
+            parent = parent[key]
+        except (KeyError, IndexError, TypeError):
+            return False
+    try:
+        del parent[loc[-1]]
+        return True
+    except (KeyError, IndexError, TypeError):
+        return False
+
+def validate_with_salvage(schema: Type[BaseModel], data: Any) -> Tuple[Dict[str, Any], bool]:
+    """
+    Validate data against a schema, dropping the parts that don't fit
+
+    An invalid value is removed; if its object then lacks a required field,
+    that object is removed on the next pass. A single bad flight or
+    attraction therefore costs that item, not the whole section.
+
+    Returns:
+        (validated data, salvaged) where salvaged is True if anything was dropped
+    """
+    if not isinstance(data, dict):
+        return {}, True
+
+    data = copy.deepcopy(data)
+    salvaged = False
+    for _ in range(MAX_SALVAGE_PASSES):
+        try:
+            return schema.model_validate(data).model_dump(exclude_unset=True), salvaged
+        except ValidationError as e:
+            # Fix one error per pass: dropping a list item shifts later locations
+            salvaged = True
+            error = e.errors()[0]
+            loc = tuple(error["loc"])
+            if error["type"] == "missing":
+                loc = loc[:-1]
+            if not loc or not _drop_path(data, loc):
+                data.pop(error["loc"][0], None)
+    return {}, True
+
+
+class OutputParseStats:
+    """Per-agent counts of clean, repaired and failed output parses"""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, status: str):
+        with self._lock:
+            counts = self._counts.setdefault(agent, {"clean": 0, "repaired": 0, "failed": 0})
+            counts[status] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            report = {}
+            for agent, counts in self._counts.items():
+                total = sum(counts.values())
+                report[agent] = {
+                    **counts,
+                    "total": total,
+                    "success_rate": round((counts["clean"] + counts["repaired"]) / total, 3) if total else 0.0
+                }
+            return report
+
+
+def parse_agent_output(
+    name: str,
+    output: Optional[str],
+    schema: Optional[Type[BaseModel]] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse one agent's raw output against its task's output schema
+
+    `schema` overrides the lookup in AGENT_OUTPUT_SCHEMAS for outputs that
+    don't come from a DAG node (e.g. the lite plan call).
+
+    Returns:
+        (data, status) where status is "clean" (valid as produced),
+        "repaired" (JSON repair or schema salvage was needed) or "failed"
+        (nothing usable; data is {})
+    """
+    schema = schema or AGENT_OUTPUT_SCHEMAS.get(name)
+    if schema is None:
+        raise ValueError(f"No output schema for agent: {name}")
+
+    try:
+        data, repaired = parse_partial_json(output or "")
+    except ValueError:
+        return {}, "failed"
+
+    data, salvaged = validate_with_salvage(schema, data)
+    if not data:
+        return {}, "failed"
+    return data, "repaired" if repaired or salvaged else "clean"
+
+
+def record_agent_output(name: str, output: Optional[str]) -> str:
+    """Record the parse outcome of a freshly generated agent output and return its status"""
+    if name in AGENT_OUTPUT_SCHEMAS:
+        _, status = parse_agent_output(name, output)
+    else:
+        status = "clean" if output and output.strip() else "failed"
+    get_output_parse_stats().record(name, status)
+    return status
+
+
+# Singleton instance
+_output_parse_stats: Optional[OutputParseStats] = None
+
+def get_output_parse_stats() -> OutputParseStats:
+    """Get or create the process-wide agent output parse stats"""
+    global _output_parse_stats
+    if _output_parse_stats is None:
+        _output_parse_stats = OutputParseStats()
+    return _output_parse_stats
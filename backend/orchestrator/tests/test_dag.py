@@ -0,0 +1,62 @@
+"""Deadline handling of the planning DAG"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import litellm
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from orchestrator.dag import DagNode, PlanningDag
+from utils.deadline import Deadline, DeadlineExceeded, deadline_scope, get_deadline
+
+
+def timeout_at_deadline(error_factory):
+    """Node that waits out the time left, then fails the way a capped client timeout does"""
+    def run(upstream):
+        time.sleep(get_deadline().timeout(30))
+        raise error_factory()
+    return run
+
+def execute(nodes, seconds):
+    async def main():
+        deadline = Deadline(seconds)
+        with deadline_scope(deadline):
+            return await PlanningDag(nodes).execute(deadline=deadline)
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("error_factory", [
+    lambda: httpx.ReadTimeout("read timed out"),
+    lambda: litellm.Timeout("request timed out", model="gpt-4o-mini", llm_provider="openai"),
+    lambda: TimeoutError("timed out"),
+    lambda: asyncio.TimeoutError(),
+    lambda: DeadlineExceeded("deadline exceeded")
+])
+def test_timeout_at_deadline_boundary_degrades_node(error_factory):
+    result = execute([
+        DagNode("fast", lambda upstream: "ok"),
+        DagNode("slow", timeout_at_deadline(error_factory)),
+        DagNode("after", lambda upstream: upstream["slow"], depends_on=["slow"])
+    ], seconds=0.3)
+
+    assert result["outputs"] == {"fast": "ok"}
+    assert result["unfinished"] == ["slow", "after"]
+
+def test_any_error_after_deadline_degrades_node():
+    def fails_late(upstream):
+        time.sleep(get_deadline().timeout(30) + 0.05)
+        raise RuntimeError("provider error")
+
+    result = execute([DagNode("late", fails_late)], seconds=0.2)
+    assert result["unfinished"] == ["late"]
+
+def test_error_before_deadline_still_fails_run():
+    def fails_early(upstream):
+        raise httpx.ReadTimeout("read timed out")
+
+    with pytest.raises(httpx.ReadTimeout):
+        execute([DagNode("early", fails_early)], seconds=5)
@@ -0,0 +1,55 @@
+"""Per-day itinerary fan-out"""
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import orchestrator.crew as crew
+from orchestrator.worker_pool import get_planning_pool
+
+LLM = "openrouter/openai/gpt-4o-mini"
+
+
+def write_itinerary(monkeypatch, duration_days, concurrency):
+    """Run run_itinerary_by_day with stubbed agents; returns (markdown, peak concurrent days)"""
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fake_run(agent, task, name):
+        if name == "itinerary_outline":
+            return json.dumps({"overview": "Trip", "days": []})
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.2)
+        with lock:
+            state["running"] -= 1
+        return "A day out"
+
+    monkeypatch.setattr(crew, "run_agent_task", fake_run)
+    markdown = crew.run_itinerary_by_day(
+        LLM, "Lisbon", duration_days, {}, {}, {}, "moderate", ["food"], "couple", concurrency
+    )
+    return markdown, state["peak"]
+
+
+def test_long_trip_fans_out_every_day(monkeypatch):
+    workers = get_planning_pool().itinerary_workers
+    assert workers >= 14
+
+    started = time.perf_counter()
+    markdown, peak = write_itinerary(monkeypatch, 14, workers)
+    elapsed = time.perf_counter() - started
+
+    assert peak == 14
+    assert markdown.count("A day out") == 14
+    # One wave of 0.2s days, not 14 serial ones
+    assert elapsed < 1.5
+
+def test_concurrency_caps_days_per_plan(monkeypatch):
+    _, peak = write_itinerary(monkeypatch, 10, 3)
+    assert peak == 3
@@ -0,0 +1,186 @@
+"""
+Bounded planning worker pool with admission control
+Keeps blocking crew work off the event loop and rejects requests fast when full
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from utils.env import get_optional_env
+
+
+class PlanningCapacityError(Exception):
+    """Raised when the planning pool and its queue are both full"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PlanningWorkerPool:
+    """
+    Dedicated executor for planning work plus an admission controller.
+
+    At most `max_concurrent` plans run at once and at most `max_queue`
+    more may wait for a slot. Anything beyond that is rejected immediately
+    with a PlanningCapacityError carrying a Retry-After estimate.
+
+    Itinerary days written in parallel run on a second, shared executor of
+    `itinerary_workers` threads: a separate one, because the itinerary
+    node that waits on them already holds a planning thread. One plan's
+    days fan out up to that size, so a trip that long is written in one
+    wave; when concurrent plans need more day threads than there are,
+    their days queue (itinerary_days_queued in the stats) and those
+    itineraries take more waves.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_queue: int = 8,
+        executor_workers: int = 14,
+        itinerary_workers: int = 14
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(
+            max_workers=executor_workers,
+            thread_name_prefix="planning"
+        )
+        self.executor_workers = executor_workers
+        self.itinerary_executor = ThreadPoolExecutor(
+            max_workers=itinerary_workers,
+            thread_name_prefix="itinerary-day"
+        )
+        self.itinerary_workers = itinerary_workers
+        self._day_lock = threading.Lock()
+        self.itinerary_days_queued = 0
+        self.itinerary_days_running = 0
+        self.itinerary_days_peak = 0
+
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._wait_times = deque(maxlen=100)
+        self._run_times = deque(maxlen=100)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running server loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        return self._slots
+
+    def submit_itinerary_day(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run one itinerary day on the shared itinerary executor, counting queued and running days"""
+        with self._day_lock:
+            self.itinerary_days_queued += 1
+
+        def run() -> Any:
+            with self._day_lock:
+                self.itinerary_days_queued -= 1
+                self.itinerary_days_running += 1
+                self.itinerary_days_peak = max(self.itinerary_days_peak, self.itinerary_days_running)
+            try:
+                return fn(*args)
+            finally:
+                with self._day_lock:
+                    self.itinerary_days_running -= 1
+
+        def forget_cancelled(future: Future):
+            if future.cancelled():
+                with self._day_lock:
+                    self.itinerary_days_queued -= 1
+
+        future = self.itinerary_executor.submit(run)
+        future.add_done_callback(forget_cancelled)
+        return future
+
+    def estimate_retry_after(self) -> int:
+        """Estimate seconds until a slot frees up, based on recent plan durations"""
+        if not self._run_times:
+            return 30
+        avg_run = sum(self._run_times) / len(self._run_times)
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(avg_run * backlog))
+
+    def ensure_capacity(self):
+        """Raise PlanningCapacityError if both running slots and queue are full"""
+        if self.active + self.waiting >= self.max_concurrent + self.max_queue:
+            self.rejected += 1
+            raise PlanningCapacityError(
+                f"Planning capacity exhausted ({self.active} running, {self.waiting} queued)",
+                retry_after=self.estimate_retry_after()
+            )
+
+    @asynccontextmanager
+    async def admit(self, reject_when_full: bool = True):
+        """
+        Wait for a planning slot, or raise PlanningCapacityError if the queue is full
+
+        With reject_when_full=False the caller queues regardless; for callers
+        that bound their own concurrency, such as batches.
+        """
+        if reject_when_full:
+            self.ensure_capacity()
+
+        slots = self._semaphore()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started = time.perf_counter()
+        self._wait_times.append(started - queued_at)
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._run_times.append(time.perf_counter() - started)
+            slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, utilization and wait-time statistics"""
+        waits = list(self._wait_times)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "executor_workers": self.executor_workers,
+            "itinerary_workers": self.itinerary_workers,
+            "itinerary_days_running": self.itinerary_days_running,
+            "itinerary_days_queued": self.itinerary_days_queued,
+            "itinerary_days_peak": self.itinerary_days_peak,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_time_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_time_max": round(max(waits), 3) if waits else 0.0,
+            "wait_time_last": round(waits[-1], 3) if waits else 0.0
+        }
+
+
+# Singleton instance
+_planning_pool: Optional[PlanningWorkerPool] = None
+
+def get_planning_pool() -> PlanningWorkerPool:
+    """Get or create the process-wide planning pool"""
+    global _planning_pool
+    if _planning_pool is None:
+        _planning_pool = PlanningWorkerPool(
+            max_concurrent=int(get_optional_env("PLANNING_MAX_CONCURRENT", "2")),
+            max_queue=int(get_optional_env("PLANNING_MAX_QUEUE", "8")),
+            executor_workers=int(get_optional_env("PLANNING_EXECUTOR_WORKERS", "14")),
+            itinerary_workers=int(get_optional_env("PLANNING_ITINERARY_WORKERS", "14"))
+        )
+    return _planning_pool
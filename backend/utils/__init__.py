@@ -7,7 +7,19 @@ from .formatter import (
     categorize_attractions,
     format_budget_summary,
     extract_city_from_destination,
-    normalize_month
+    normalize_month,
+    format_output_instructions
+)
+from .json_parser import IncrementalJsonParser, parse_partial_json
+from .deadline import Deadline, DeadlineExceeded, get_deadline, deadline_scope, request_timeout
+from .hedging import LLMHedger, get_llm_hedger
+from .http_client import HttpClientRegistry, get_http_clients, http_client, http_timeout
+from .completion_cache import (
+    CompletionCache,
+    CompletionCacheMiss,
+    completion_key,
+    completion_cache_bypass,
+    get_completion_cache
 )
 
 __all__ = [
@@ -21,5 +33,24 @@ __all__ = [
     "categorize_attractions",
     "format_budget_summary",
     "extract_city_from_destination",
-    "normalize_month"
+    "normalize_month",
+    "format_output_instructions",
+    "IncrementalJsonParser",
+    "parse_partial_json",
+    "Deadline",
+    "DeadlineExceeded",
+    "get_deadline",
+    "deadline_scope",
+    "request_timeout",
+    "LLMHedger",
+    "get_llm_hedger",
+    "HttpClientRegistry",
+    "get_http_clients",
+    "http_client",
+    "http_timeout",
+    "CompletionCache",
+    "CompletionCacheMiss",
+    "completion_key",
+    "completion_cache_bypass",
+    "get_completion_cache"
 ]
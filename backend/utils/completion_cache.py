@@ -0,0 +1,249 @@
+"""
+Content-addressed LLM completion cache
+SQLite store of completions keyed by a hash of the full request (model,
+messages and every sampling/output parameter), shared by OpenRouterClient
+and the agents' LiteLLM calls
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .env import get_optional_env
+
+# Cache modes: read and write, serve only from the cache (offline replay), or disabled
+CACHE_MODES = ("readwrite", "replay", "off")
+
+
+class CompletionCacheMiss(Exception):
+    """Raised in replay mode when a completion is not in the cache"""
+    pass
+
+
+# Request fields that don't affect the completion (transport and credentials)
+NON_KEY_PARAMS = ("timeout", "api_key", "api_base", "api_version", "stream")
+
+def completion_key(request: Dict[str, Any]) -> str:
+    """
+    Stable hash of everything that determines a completion
+
+    `request` is the parameter dict sent to the provider (model, messages,
+    temperature, max_tokens, stop, response_format, seed, tools, ...);
+    transport settings and credentials are left out, as are unset values.
+    """
+    canonical = json.dumps({
+        name: value for name, value in request.items()
+        if name not in NON_KEY_PARAMS and value is not None
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_bypass: ContextVar[bool] = ContextVar("completion_cache_bypass", default=False)
+
+@contextmanager
+def completion_cache_bypass(bypass: bool = True) -> Iterator[None]:
+    """Skip cache reads (fresh completions are still stored) for calls made inside the block"""
+    token = _bypass.set(bypass)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class CompletionCache:
+    """
+    On-disk cache of LLM completions keyed by completion_key.
+
+    Entries are evicted least recently used first once the stored
+    responses exceed `max_bytes`, and are served for at most `ttl_seconds`
+    after they were written (0 keeps them until evicted), so a stale or
+    bad completion is not replayed forever. Each entry keeps its request,
+    so the cache doubles as a corpus of real prompts: in "replay" mode
+    every call must be served from it, whatever its age, which makes plans
+    reproducible offline.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        mode: str = "readwrite",
+        ttl_seconds: int = 86400
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode '{mode}', expected one of {', '.join(CACHE_MODES)}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.bypasses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call keeps this safe across executor threads
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a completion
+
+        Returns None on a miss, or when the current context bypasses the
+        cache (except in replay mode, where there is nothing else to call)
+
+        Raises:
+            CompletionCacheMiss: In replay mode, if the key is not cached
+        """
+        if not self.enabled:
+            return None
+        if _bypass.get() and self.mode != "replay":
+            with self._lock:
+                self.bypasses += 1
+            return None
+
+        expired = False
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT response, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row is not None and self.mode != "replay" and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    row, expired = None, True
+                elif row is not None:
+                    conn.execute("UPDATE completions SET last_used_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache read failed: {str(e)}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                self.expired += expired
+            else:
+                self.hits += 1
+        if row is None:
+            if self.mode == "replay":
+                raise CompletionCacheMiss(f"Completion {key[:12]} not in cache (replay mode)")
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, model: str, request: Dict[str, Any], response: Any):
+        """Store a completion along with the request that produced it"""
+        if self.mode != "readwrite":
+            return
+        body = json.dumps(response, default=str)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions "
+                    "(key, model, request, response, size, created_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, json.dumps(request, default=str), body, len(body), now, now)
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache write failed: {str(e)}")
+            return
+        with self._lock:
+            self.writes += 1
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM completions ORDER BY last_used_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM completions WHERE key = ?", evicted)
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def entries(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stored requests and responses, oldest first (for offline replay)"""
+        query = "SELECT key, model, request, response, created_at FROM completions ORDER BY created_at"
+        with self._connect() as conn:
+            rows = conn.execute(query + (f" LIMIT {int(limit)}" if limit else "")).fetchall()
+        for key, model, request, response, created_at in rows:
+            yield {
+                "key": key,
+                "model": model,
+                "request": json.loads(request),
+                "response": json.loads(response),
+                "created_at": created_at
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "bypasses": self.bypasses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+# Singleton instance
+_completion_cache: Optional[CompletionCache] = None
+
+def get_completion_cache() -> CompletionCache:
+    """Get or create the process-wide LLM completion cache"""
+    global _completion_cache
+    if _completion_cache is None:
+        default_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            ".cache", "llm_completions.sqlite3"
+        )
+        _completion_cache = CompletionCache(
+            path=get_optional_env("LLM_CACHE_PATH", default_path),
+            max_bytes=int(get_optional_env("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024,
+            mode=get_optional_env("LLM_CACHE_MODE", "readwrite").lower(),
+            ttl_seconds=int(get_optional_env("LLM_CACHE_TTL_SECONDS", "86400"))
+        )
+    return _completion_cache
@@ -0,0 +1,67 @@
+"""
+Request deadlines
+Carries a plan's end-to-end deadline from the orchestrator into agent
+threads, LLM calls and MCP tool calls through a context variable
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work would start after the request deadline has passed"""
+    pass
+
+
+class Deadline:
+    """
+    Point in time by which a request must be answered.
+
+    Blocking calls made on behalf of the request cap their own timeouts
+    with `timeout()`, so nothing waits past the deadline.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: float) -> float:
+        """
+        Cap a timeout to the time left
+
+        Raises:
+            DeadlineExceeded: If the deadline has already passed
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Request deadline of {self.seconds:g}s exceeded")
+        return min(default, remaining)
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+def get_deadline() -> Optional[Deadline]:
+    """Deadline of the request being served in this context, if any"""
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make `deadline` the current deadline for everything run inside the block"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def request_timeout(default: float) -> float:
+    """Timeout for an outbound call: `default`, capped by the current deadline if one is set"""
+    deadline = get_deadline()
+    return default if deadline is None else deadline.timeout(default)
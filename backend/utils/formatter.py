@@ -1,9 +1,12 @@
 """
 Data formatting utilities
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Type
+import json
 import re
 
+from pydantic import BaseModel
+
 def format_duration(duration_str: str) -> str:
     """
     Format ISO 8601 duration to human-readable format
@@ -121,3 +124,11 @@ def normalize_month(month_input: str) -> str:
 
     month_lower = month_input.lower().strip()
     return months.get(month_lower, month_input)
+
+def format_output_instructions(schema: Type[BaseModel]) -> str:
+    """Render an agent task's output schema as prompt instructions"""
+    json_schema = json.dumps(schema.model_json_schema(), separators=(",", ":"))
+    return f"""Output Format:
+Your final answer must be a single JSON object, with no markdown fences or commentary,
+that validates against this JSON Schema:
+{json_schema}"""
@@ -0,0 +1,181 @@
+"""
+Hedged LLM requests
+Sends a duplicate request to a backup model when a call runs past the
+model's recent latency percentile; the first response wins
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Latencies kept per model for the percentile estimate
+LATENCY_WINDOW = 200
+
+# Below this many samples the initial delay is used instead of the percentile
+MIN_SAMPLES = 20
+
+OPENROUTER_PREFIX = "openrouter/"
+
+
+class LLMHedger:
+    """
+    Hedging policy shared by OpenRouterClient and the CrewAI LiteLLM path.
+
+    A call that hasn't returned after the model's `percentile` latency
+    (at least `min_delay`) is duplicated to `backup_model`, or to the same
+    model when none is set so OpenRouter can route it to another provider.
+    Whichever finishes first wins and the other request is cancelled.
+
+    Callers on threads without an event loop (the agents' executor
+    threads) use run_sync, which runs every hedged call on one long-lived
+    background loop: LiteLLM caches its async clients per loop, so a loop
+    per call would rebuild the client and redo the TLS handshake each time.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        backup_model: Optional[str] = None,
+        percentile: float = 95.0,
+        min_delay: float = 2.0,
+        initial_delay: float = 10.0
+    ):
+        self.enabled = enabled
+        # Stored as a bare OpenRouter model id; LiteLLM callers get the prefix back
+        if backup_model and backup_model.startswith(OPENROUTER_PREFIX):
+            backup_model = backup_model[len(OPENROUTER_PREFIX):]
+        self.backup_model = backup_model or None
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def backup_for(self, model: str) -> str:
+        """Backup model for `model`, in the same naming scheme (LiteLLM or OpenRouter)"""
+        if not self.backup_model:
+            return model
+        if model.startswith(OPENROUTER_PREFIX):
+            return OPENROUTER_PREFIX + self.backup_model
+        return self.backup_model
+
+    def delay(self, model: str) -> float:
+        """Seconds to wait for `model` before sending the hedge"""
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < MIN_SAMPLES:
+            return self.initial_delay
+        index = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return max(self.min_delay, samples[index])
+
+    def _record(self, model: str, outcome: str, latency: Optional[float] = None, hedged: bool = False):
+        with self._lock:
+            counts = self._counts.setdefault(model, {
+                "calls": 0, "hedged": 0, "primary_wins": 0, "backup_wins": 0, "failed": 0
+            })
+            counts["calls"] += 1
+            counts["hedged"] += hedged
+            if outcome != "unhedged":
+                counts[outcome] += 1
+            if latency is not None:
+                self._latencies.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    async def run(self, model: str, call: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run `call(model)`, hedging it with `call(backup)` if it is slow
+
+        Errors from the primary before the hedge fires are raised as-is;
+        after it fires, the call only fails if both requests fail.
+        """
+        if not self.enabled:
+            return await call(model)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call(model))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(model))
+            if done:
+                try:
+                    result = primary.result()
+                except Exception:
+                    self._record(model, "failed")
+                    raise
+                self._record(model, "unhedged", time.monotonic() - started)
+                return result
+
+            backup_model = self.backup_for(model)
+            print(f"   🪃 Hedging {model} after {time.monotonic() - started:.1f}s with {backup_model}")
+            hedge = asyncio.ensure_future(call(backup_model))
+            pending = {primary, hedge}
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        errors.append(future.exception())
+                        continue
+                    elapsed = time.monotonic() - started
+                    if future is primary:
+                        self._record(model, "primary_wins", elapsed, hedged=True)
+                    else:
+                        # The primary's true latency is unknown but at least this long
+                        self._record(model, "backup_wins", elapsed, hedged=True)
+                    return future.result()
+
+            self._record(model, "failed", hedged=True)
+            raise errors[0]
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-hedger", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def run_sync(self, model: str, call: Callable[[str], Awaitable[T]]) -> T:
+        """Blocking `run` on the shared background loop, for threads without an event loop"""
+        return asyncio.run_coroutine_threadsafe(self.run(model, call), self._background_loop()).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {model: dict(counts) for model, counts in self._counts.items()}
+        for model, counts in models.items():
+            counts["hedge_rate"] = round(counts["hedged"] / counts["calls"], 3) if counts["calls"] else 0.0
+            counts["backup_win_rate"] = round(counts["backup_wins"] / counts["hedged"], 3) if counts["hedged"] else 0.0
+            counts["hedge_delay"] = round(self.delay(model), 2)
+        return {
+            "enabled": self.enabled,
+            "backup_model": self.backup_model,
+            "percentile": self.percentile,
+            "models": models
+        }
+
+
+# Singleton instance
+_hedger: Optional[LLMHedger] = None
+
+def get_llm_hedger() -> LLMHedger:
+    """Get or create the process-wide LLM hedging policy"""
+    global _hedger
+    if _hedger is None:
+        _hedger = LLMHedger(
+            enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true",
+            backup_model=os.getenv("LLM_HEDGE_BACKUP_MODEL"),
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "2.0")),
+            initial_delay=float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "10.0"))
+        )
+    return _hedger
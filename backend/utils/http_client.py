@@ -0,0 +1,176 @@
+"""
+Pooled HTTP clients
+One long-lived httpx.AsyncClient per upstream service, so MCP tools and
+the OpenRouter client reuse keep-alive (HTTP/2 where available)
+connections instead of paying TCP and TLS handshakes on every call
+"""
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from .deadline import request_timeout
+from .env import get_optional_env
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - installed with httpx[http2]
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientRegistry:
+    """
+    Shared httpx clients keyed by service name ("amadeus", "google_maps", ...).
+
+    Clients belong to the event loop the registry was opened on (the app's,
+    from the FastAPI lifespan) and are closed when it shuts down. Each
+    service gets its own connection pool, limited to `max_connections`
+    (or HTTP_MAX_CONNECTIONS_<SERVICE>), since every service is one host.
+    httpx connections cannot be shared across event loops, so calls made
+    on any other loop - agent tools run with asyncio.run on crew threads,
+    or before the registry is opened - get a short-lived client with the
+    same settings, counted as transient in the stats.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        pool_timeout: float = 5.0
+    ):
+        if http2 and not HTTP2_AVAILABLE:
+            print("⚠️  HTTP/2 requested but the h2 package is missing - using HTTP/1.1")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.pool_timeout = pool_timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _service_limit(self, service: str) -> int:
+        return int(get_optional_env(f"HTTP_MAX_CONNECTIONS_{service.upper()}", str(self.max_connections)))
+
+    def _build(self, service: str) -> httpx.AsyncClient:
+        max_connections = self._service_limit(service)
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(self.max_keepalive, max_connections),
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=self.pool_timeout)
+        )
+
+    def request_timeout(self, default: float) -> httpx.Timeout:
+        """Timeout for one request: `default` capped by the current deadline, with the pool's connect/pool limits"""
+        total = request_timeout(default)
+        return httpx.Timeout(
+            total,
+            connect=min(self.connect_timeout, total),
+            pool=min(self.pool_timeout, total)
+        )
+
+    def _count(self, service: str, key: str, delta: int = 1):
+        with self._lock:
+            counts = self._counts.setdefault(
+                service, {"requests": 0, "transient": 0, "in_flight": 0, "peak_in_flight": 0}
+            )
+            counts[key] += delta
+            counts["peak_in_flight"] = max(counts["peak_in_flight"], counts["in_flight"])
+
+    async def open(self):
+        """Bind the registry to the running event loop (call from the app lifespan)"""
+        self._loop = asyncio.get_running_loop()
+        print(f"🌐 HTTP client pool ready (HTTP/2: {self.http2}, {self.max_connections} connections per host)")
+
+    async def close(self):
+        """Close every pooled client"""
+        clients, self._clients, self._loop = list(self._clients.values()), {}, None
+        await asyncio.gather(*[client.aclose() for client in clients], return_exceptions=True)
+
+    @asynccontextmanager
+    async def client(self, service: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Lease the pooled client for `service` (or a transient one off the registry's loop)"""
+        self._count(service, "requests")
+        if self._loop is None or asyncio.get_running_loop() is not self._loop:
+            self._count(service, "transient")
+            async with self._build(service) as client:
+                yield client
+            return
+
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._clients[service] = self._build(service)
+        self._count(service, "in_flight")
+        try:
+            yield client
+        finally:
+            self._count(service, "in_flight", -1)
+
+    def _pool_usage(self, client: httpx.AsyncClient) -> Dict[str, int]:
+        # httpcore's pool isn't public API; report nothing rather than fail if it changes
+        connections = getattr(getattr(client._transport, "_pool", None), "connections", None)
+        if connections is None:
+            return {}
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"connections": len(connections), "idle_connections": idle, "active_connections": len(connections) - idle}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {service: dict(values) for service, values in self._counts.items()}
+        services = {}
+        for service in set(counts) | set(self._clients):
+            limit = self._service_limit(service)
+            usage = self._pool_usage(self._clients[service]) if service in self._clients else {}
+            services[service] = {
+                **counts.get(service, {}),
+                "max_connections": limit,
+                **usage,
+                "utilization": round(usage.get("active_connections", 0) / limit, 3) if limit else 0.0
+            }
+        return {
+            "open": self._loop is not None,
+            "http2": self.http2,
+            "services": services
+        }
+
+
+# Singleton instance
+_http_clients: Optional[HttpClientRegistry] = None
+
+def get_http_clients() -> HttpClientRegistry:
+    """Get or create the process-wide HTTP client registry"""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HttpClientRegistry(
+            http2=get_optional_env("HTTP_HTTP2_ENABLED", "true").lower() == "true",
+            max_connections=int(get_optional_env("HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive=int(get_optional_env("HTTP_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(get_optional_env("HTTP_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(get_optional_env("HTTP_TIMEOUT", "30")),
+            connect_timeout=float(get_optional_env("HTTP_CONNECT_TIMEOUT", "5")),
+            pool_timeout=float(get_optional_env("HTTP_POOL_TIMEOUT", "5"))
+        )
+    return _http_clients
+
+def http_client(service: str):
+    """`async with http_client("amadeus") as client:` - lease the shared client for a service"""
+    return get_http_clients().client(service)
+
+def http_timeout(default: float) -> httpx.Timeout:
+    """Per-request timeout: `default` capped by the current deadline, plus the pool's connect/pool timeouts"""
+    return get_http_clients().request_timeout(default)
@@ -0,0 +1,163 @@
+"""
+Tolerant incremental JSON parser
+Recovers JSON from LLM output wrapped in prose or markdown fences, with
+trailing commas, or truncated mid-document
+"""
+import json
+from typing import Any, List, Optional, Tuple
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+class IncrementalJsonParser:
+    """
+    Streaming scanner for the first JSON object or array in a text.
+
+    Text before the first '{' or '[' is skipped and scanning stops once that
+    value is complete. Chunks can be fed as they arrive; `result()` returns
+    the document so far, closing an unterminated string value and any open
+    containers, or falling back to the last complete element.
+    """
+
+    def __init__(self):
+        self._out: List[str] = []
+        self._stack: List[str] = []  # pending closing brackets
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._last_token = ""  # last significant character outside strings
+        self._safe: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self.complete = False
+        self.repaired = False
+
+    def _mark_safe(self):
+        """Remember a point up to which the document is well-formed"""
+        self._safe = (len(self._out), tuple(self._stack))
+
+    def feed(self, chunk: str):
+        for ch in chunk:
+            if self.complete:
+                return
+            if not self._started:
+                if ch not in CLOSERS:
+                    continue
+                self._started = True
+
+            if self._in_string:
+                self._out.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_token = '"'
+                    if not self._string_is_key:
+                        self._mark_safe()
+                continue
+
+            if ch.isspace():
+                self._out.append(ch)
+            elif ch == '"':
+                self._in_string = True
+                self._string_is_key = bool(self._stack) and self._stack[-1] == "}" and self._last_token in "{,"
+                self._out.append(ch)
+            elif ch in CLOSERS:
+                self._out.append(ch)
+                self._stack.append(CLOSERS[ch])
+                self._last_token = ch
+                self._mark_safe()
+            elif ch in "}]":
+                if ch not in self._stack:
+                    self.repaired = True
+                    continue
+                if self._last_token == ",":
+                    self._drop_trailing_comma()
+                # Close any inner containers the model forgot
+                while self._stack[-1] != ch:
+                    self._out.append(self._stack.pop())
+                    self.repaired = True
+                self._out.append(self._stack.pop())
+                self._last_token = ch
+                if not self._stack:
+                    self.complete = True
+                else:
+                    self._mark_safe()
+            elif ch == ",":
+                self._mark_safe()
+                self._out.append(ch)
+                self._last_token = ch
+            else:
+                self._out.append(ch)
+                self._last_token = ch if ch == ":" else "v"
+
+    def _drop_trailing_comma(self):
+        while self._out and self._out[-1].isspace():
+            self._out.pop()
+        if self._out and self._out[-1] == ",":
+            self._out.pop()
+            self.repaired = True
+
+    def result(self) -> Tuple[Any, bool]:
+        """
+        Parse what has been fed so far
+
+        Returns:
+            (data, repaired) where repaired is True if the text had to be
+            fixed up or truncated to parse
+
+        Raises:
+            ValueError: If no JSON value could be recovered
+        """
+        if not self._started:
+            raise ValueError("No JSON object or array found")
+
+        text = "".join(self._out)
+        if self.complete:
+            return json.loads(text, strict=False), self.repaired
+
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            body = text[:-1] if self._escape else text
+            candidates.append(body + '"' + "".join(reversed(self._stack)))
+        if self._safe is not None:
+            length, stack = self._safe
+            candidates.append(text[:length].rstrip() + "".join(reversed(stack)))
+
+        for candidate in candidates:
+            try:
+                return json.loads(candidate, strict=False), True
+            except json.JSONDecodeError:
+                continue
+        raise ValueError("Could not recover JSON from truncated output")
+
+
+def parse_partial_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parse JSON from raw LLM output, repairing it if needed
+
+    Returns:
+        (data, repaired) where repaired is False if the text (minus any
+        markdown fences) was valid JSON as-is
+
+    Raises:
+        ValueError: If no JSON value could be recovered
+    """
+    stripped = text.strip()
+    if stripped.startswith("```json"):
+        stripped = stripped[7:]
+    if stripped.startswith("```"):
+        stripped = stripped[3:]
+    if stripped.endswith("```"):
+        stripped = stripped[:-3]
+
+    try:
+        return json.loads(stripped.strip()), False
+    except json.JSONDecodeError:
+        pass
+
+    parser = IncrementalJsonParser()
+    parser.feed(stripped)
+    data, _ = parser.result()
+    return data, True
@@ -2,8 +2,10 @@
 OpenRouter LLM Integration
 """
 import os
-import httpx
 from typing import Dict, List, Optional, Any
+from .http_client import http_client, http_timeout
+from .hedging import get_llm_hedger
+from .completion_cache import completion_key, get_completion_cache
 
 class OpenRouterClient:
     """Client for OpenRouter API using Claude 3.5 Sonnet"""
@@ -23,7 +25,10 @@ class OpenRouterClient:
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = 4000,
-        tools: Optional[List[Dict]] = None
+        tools: Optional[List[Dict]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Send a chat completion request to OpenRouter
@@ -33,6 +38,9 @@ class OpenRouterClient:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             tools: Optional list of tool definitions
+            response_format: Optional response format, e.g. {"type": "json_object"}
+            model: Optional model override (defaults to self.model)
+            use_cache: Serve identical requests from the completion cache
 
         Returns:
             Response dict with completion
@@ -45,7 +53,7 @@ class OpenRouterClient:
         }
 
         payload = {
-            "model": self.model,
+            "model": model or self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
@@ -53,22 +61,43 @@ class OpenRouterClient:
 
         if tools:
             payload["tools"] = tools
-
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        if response_format:
+            payload["response_format"] = response_format
+
+        async def send(model_name: str) -> Dict[str, Any]:
+            async with http_client("openrouter") as client:
+                response = await client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json={**payload, "model": model_name},
+                    timeout=http_timeout(120.0)
+                )
+                response.raise_for_status()
+                return response.json()
+
+        cache = get_completion_cache()
+        key = completion_key(payload)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                print(f"⚡ LLM cache hit for {payload['model']}")
+                return cached
+
+        # Slow calls are duplicated to a backup model when hedging is enabled
+        result = await get_llm_hedger().run(payload["model"], send)
+        if use_cache:
+            cache.set(key, payload["model"], payload, result)
+        return result
 
     async def generate_text(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Generate text from a prompt
@@ -78,6 +107,9 @@ class OpenRouterClient:
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            response_format: Optional response format, e.g. {"type": "json_object"}
+            model: Optional model override
+            use_cache: Serve identical requests from the completion cache
 
         Returns:
             Generated text content
@@ -98,7 +130,10 @@ class OpenRouterClient:
         response = await self.chat_completion(
             messages=messages,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            response_format=response_format,
+            model=model,
+            use_cache=use_cache
         )
 
         return response["choices"][0]["message"]["content"]